@@ -1,25 +1,196 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-from tos import generate_summative_assessment
+from tos import (GENERATION_MODES, MAX_SEED, generate_summative_assessment, get_question_bank_cache,
+                 seeded_assessment_cache)
+from collections import deque
 import json
+import math
+import os
+import threading
+import time
 import traceback
 import sys
-import yt_dlp
+from video_recommendations import create_recommender
+from pc_recommendations import PART_FIELDS, create_build_recommender
+
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    _dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
 app = Flask(__name__)
 CORS(app)  
 
+# Load the question bank once at startup so requests never wait on disk
+get_question_bank_cache().get()
+
+class AssessmentPool:
+    """Pre-generated, rule-validated assessments handed out in O(1) and refilled in the background"""
+    def __init__(self, high_water: int = 50, low_water: int = None):
+        self.high_water = max(1, high_water)
+        self.low_water = low_water if low_water is not None else self.high_water // 2
+        self._entries = deque()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._below_low_water_since = None
+        self.metrics = {
+            'hits': 0,
+            'misses': 0,
+            'stale_discarded': 0,
+            'generated': 0,
+            'errors': 0,
+            'invalid': 0,
+            'generation_ms_total': 0.0,
+            'last_refill_lag_ms': None,
+            'max_refill_lag_ms': 0.0
+        }
+
+    def start(self):
+        """Start the refill worker once per process"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._below_low_water_since = time.monotonic()
+                self._thread = threading.Thread(target=self._run, name='assessment-pool', daemon=True)
+                self._thread.start()
+
+    def take(self) -> dict:
+        """Hand out a pooled assessment, generating one synchronously on a miss"""
+        self.start()
+        version = get_question_bank_cache().version
+        assessment = None
+        while True:
+            try:
+                entry_version, entry = self._entries.popleft()
+            except IndexError:
+                break
+            if entry_version == version:
+                assessment = entry
+                break
+            self.metrics['stale_discarded'] += 1
+
+        if len(self._entries) < self.low_water:
+            if self._below_low_water_since is None:
+                self._below_low_water_since = time.monotonic()
+            self._wakeup.set()
+
+        if assessment is not None:
+            self.metrics['hits'] += 1
+            return assessment
+        self.metrics['misses'] += 1
+        return generate_summative_assessment()
+
+    def stats(self) -> dict:
+        generated = self.metrics['generated']
+        lookups = self.metrics['hits'] + self.metrics['misses']
+        return {
+            'size': len(self._entries),
+            'high_water': self.high_water,
+            'low_water': self.low_water,
+            'worker_alive': self._thread is not None and self._thread.is_alive(),
+            'hit_ratio': round(self.metrics['hits'] / lookups, 4) if lookups else None,
+            'avg_generation_ms': round(self.metrics['generation_ms_total'] / generated, 3) if generated else None,
+            **self.metrics
+        }
+
+    @staticmethod
+    def satisfies_rules(assessment: dict) -> bool:
+        """True when every assessment rule passed and no chapter fell back to a violating selection"""
+        if not all(assessment.get('statistics', {}).get('rule_checks', {}).values()):
+            return False
+        for chapter in assessment.get('chapter_breakdown', {}).values():
+            selection = chapter.get('selection')
+            if selection is not None and (not selection.get('feasible') or selection.get('violations')):
+                return False
+        return True
+
+    def _run(self):
+        invalid_streak = 0
+        while True:
+            while len(self._entries) < self.high_water:
+                get_question_bank_cache().get()
+                version = get_question_bank_cache().version
+                started = time.perf_counter()
+                assessment = generate_summative_assessment()
+                self.metrics['generation_ms_total'] += (time.perf_counter() - started) * 1000
+                if 'error' in assessment:
+                    self.metrics['errors'] += 1
+                    time.sleep(1.0)
+                    continue
+                if not self.satisfies_rules(assessment):
+                    # Best-effort exams are never pooled; back off while the bank can't satisfy the rules
+                    self.metrics['invalid'] += 1
+                    invalid_streak += 1
+                    time.sleep(min(30.0, 0.05 * 2 ** min(invalid_streak, 10)))
+                    continue
+                invalid_streak = 0
+                self._entries.append((version, assessment))
+                self.metrics['generated'] += 1
+
+            if self._below_low_water_since is not None:
+                lag = (time.monotonic() - self._below_low_water_since) * 1000
+                self.metrics['last_refill_lag_ms'] = round(lag, 3)
+                self.metrics['max_refill_lag_ms'] = round(max(self.metrics['max_refill_lag_ms'], lag), 3)
+                self._below_low_water_since = None
+
+            self._wakeup.wait()
+            self._wakeup.clear()
+
+def stream_assessment_json(assessment: dict):
+    """Serialize an assessment incrementally: metadata first, then one question per chunk"""
+    yield '{"metadata":' + _dumps(assessment.get('metadata', {})) + ',"questions":['
+    for i, question in enumerate(assessment.get('questions', [])):
+        yield (',' if i else '') + _dumps(question)
+    yield ']'
+    for key, value in assessment.items():
+        if key not in ('metadata', 'questions'):
+            yield ',' + _dumps(key) + ':' + _dumps(value)
+    yield '}'
+
+video_recommender = create_recommender()
+build_recommender = create_build_recommender()
+
+assessment_pool = AssessmentPool(
+    high_water=int(os.environ.get('ASSESSMENT_POOL_SIZE', 50)),
+    low_water=int(os.environ['ASSESSMENT_POOL_LOW_WATER']) if 'ASSESSMENT_POOL_LOW_WATER' in os.environ else None
+)
+
 @app.route('/api/generate-summative-assessment', methods=['GET'])
 def get_summative_assessment():
     """Generate and return summative assessment"""
     try:
         print("Starting assessment generation...", file=sys.stderr)
-        assessment = generate_summative_assessment()
+        mode = request.args.get('mode', 'rules')
+        if mode not in GENERATION_MODES:
+            return jsonify({'error': f"mode must be one of {', '.join(GENERATION_MODES)}"}), 400
+        seed = request.args.get('seed')
+        key = request.args.get('key')
+        if seed is not None or key is not None:
+            if seed is not None:
+                try:
+                    seed = int(seed)
+                except ValueError:
+                    return jsonify({'error': 'seed must be an integer'}), 400
+                if abs(seed) > MAX_SEED:
+                    return jsonify({'error': f'seed must be between -{MAX_SEED} and {MAX_SEED}'}), 400
+            assessment = generate_summative_assessment(mode, seed=seed, key=key)
+        elif mode == 'rules':
+            assessment = assessment_pool.take()
+        else:
+            assessment = generate_summative_assessment(mode)
         print(f"Assessment generated with {len(assessment.get('questions', []))} questions", file=sys.stderr)
         
         if 'error' in assessment:
             print(f"Error in assessment: {assessment['error']}", file=sys.stderr)
             return jsonify(assessment), 500
         
+        if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+            return Response(stream_assessment_json(assessment), status=200, mimetype='application/json')
         return jsonify(assessment), 200
     except Exception as e:
         error_msg = traceback.format_exc()
@@ -31,6 +202,26 @@ def get_summative_assessment():
             'traceback': error_msg
         }), 500
 
+@app.route('/api/question-bank/stats', methods=['GET'])
+def get_question_bank_stats():
+    """Return question bank cache load and validation statistics"""
+    return jsonify(get_question_bank_cache().stats()), 200
+
+@app.route('/api/assessment-pool/stats', methods=['GET'])
+def get_assessment_pool_stats():
+    """Return pre-generation pool hit/miss and refill metrics"""
+    return jsonify(assessment_pool.stats()), 200
+
+@app.route('/api/assessment-cache/stats', methods=['GET'])
+def get_assessment_cache_stats():
+    """Return hit/miss statistics of the seeded assessment cache"""
+    return jsonify(seeded_assessment_cache.stats()), 200
+
+@app.route('/api/recommendations/stats', methods=['GET'])
+def get_recommendation_stats():
+    """Return video recommendation cache and coalescing statistics"""
+    return jsonify(video_recommender.stats()), 200
+
 @app.route('/api/recommendations', methods=['POST'])
 def get_recommendations():
     try:
@@ -40,25 +231,7 @@ def get_recommendations():
         query = data.get("query", "Computer")
         limit = int(data.get("limit", 10))
 
-        ydl_opts = {
-            "quiet": True,
-            "extract_flat": True,
-        }
-
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            result = ydl.extract_info(
-                f"ytsearch{limit}:{query}",
-                download=False
-            )
-
-        videos = []
-        for v in result.get("entries", []):
-            videos.append({
-                "id": v.get("id"),
-                "title": v.get("title"),
-                "url": f"https://www.youtube.com/watch?v={v.get('id')}",
-                "channel": v.get("uploader"),
-            })
+        videos = video_recommender.recommend(query, limit)
 
         return jsonify({ "videos": videos }), 200
 
@@ -70,5 +243,68 @@ def get_recommendations():
             "traceback": error_msg
         }), 500
 
+def parse_amount(value) -> float:
+    """A finite, non-negative money amount; raises ValueError otherwise"""
+    amount = float(value)
+    if not math.isfinite(amount) or amount < 0:
+        raise ValueError(f'{value!r} is not a finite, non-negative amount')
+    return amount
+
+@app.route('/api/recommend-build', methods=['POST'])
+def get_recommended_build():
+    """Return a build for a budget and use case.
+
+    mode 'greedy' (default) matches recommendBuild; 'optimal' maximizes the
+    weighted build score under the budget and compatibility constraints.
+    """
+    data = request.get_json(force=True, silent=True) or {}
+    try:
+        budget = parse_amount(data.get('budget'))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'budget must be a finite, non-negative number'}), 400
+    use_case = data.get('use_case', data.get('useCase', ''))
+    mode = data.get('mode', 'greedy')
+    if mode not in ('greedy', 'optimal'):
+        return jsonify({'error': "mode must be 'greedy' or 'optimal'"}), 400
+
+    try:
+        if mode == 'optimal':
+            result = build_recommender.optimize(budget, use_case)
+            if result is None:
+                return jsonify({'error': 'No compatible build fits the budget'}), 422
+            return jsonify(result), 200
+        build = build_recommender.recommend(budget, use_case)
+        return jsonify({'build': build}), 200
+    except Exception as e:
+        error_msg = traceback.format_exc()
+        print(error_msg, file=sys.stderr)
+        return jsonify({
+            'error': str(e),
+            'traceback': error_msg
+        }), 500
+
+@app.route('/api/parts/best-under', methods=['GET'])
+def get_best_part_under():
+    """Return the highest-scoring part of a category at or under a price (?category=GPU&price=500[&socket=AM5]).
+
+    Only CPUs, GPUs, RAM and storage are scored. PSUs rank by wattage; boards,
+    cases and coolers only need to fit, so the cheapest one is returned.
+    """
+    category = request.args.get('category', '').upper()
+    try:
+        price = parse_amount(request.args.get('price'))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'price must be a finite, non-negative number'}), 400
+    part = build_recommender.best_under(category, price, request.args.get('socket'))
+    if part is None:
+        return jsonify({'error': f'No {category or "part"} at or under {price}'}), 404
+    return jsonify({'part': dict({'label': category}, **{field: part[field] for field in PART_FIELDS})}), 200
+
+@app.route('/api/recommend-build/stats', methods=['GET'])
+def get_recommend_build_stats():
+    """Return parts catalog load and build query timing statistics"""
+    return jsonify(build_recommender.stats()), 200
+
 if __name__ == '__main__':
+    assessment_pool.start()
     app.run(debug=True, port=5000)
@@ -0,0 +1,63 @@
+import argparse
+import statistics
+import sys
+import time
+from tos import generate_summative_assessment, get_question_bank_cache
+
+def run_benchmark(iterations: int, mode: str):
+    """Time end-to-end exam generation and collect rule failures"""
+    get_question_bank_cache().get()  # warm the cache like the service does at startup
+
+    timings = []
+    failures = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        assessment = generate_summative_assessment(mode)
+        timings.append((time.perf_counter() - started) * 1000)
+
+        if 'error' in assessment:
+            failures += 1
+            continue
+        checks = assessment['statistics'].get('rule_checks', {})
+        chapter_ok = all(
+            c.get('selection', {}).get('feasible', True) and c.get('selection', {}).get('violations', 0) == 0
+            for c in assessment['chapter_breakdown'].values()
+        )
+        if not all(checks.values()) or not chapter_ok:
+            failures += 1
+
+    timings.sort()
+    return {
+        'iterations': iterations,
+        'mean_ms': statistics.mean(timings),
+        'p50_ms': timings[len(timings) // 2],
+        'p95_ms': timings[int(len(timings) * 0.95) - 1],
+        'p99_ms': timings[int(len(timings) * 0.99) - 1],
+        'max_ms': timings[-1],
+        'rule_failures': failures
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark summative assessment generation latency')
+    parser.add_argument('--iterations', type=int, default=1000)
+    parser.add_argument('--mode', choices=['rules', 'shuffle'], default='rules')
+    parser.add_argument('--budget-ms', type=float, default=20.0,
+                        help='fail if the p99 latency exceeds this budget')
+    args = parser.parse_args()
+
+    result = run_benchmark(args.iterations, args.mode)
+    print(f"mode={args.mode} iterations={result['iterations']}")
+    for key in ['mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms']:
+        print(f"  {key:8s} {result[key]:8.3f}")
+    print(f"  rule failures: {result['rule_failures']}")
+
+    if result['p99_ms'] > args.budget_ms:
+        print(f"FAIL: p99 {result['p99_ms']:.3f}ms exceeds {args.budget_ms}ms budget", file=sys.stderr)
+        sys.exit(1)
+    if args.mode == 'rules' and result['rule_failures']:
+        print("FAIL: generated assessments violate rules", file=sys.stderr)
+        sys.exit(1)
+    print(f"OK: within {args.budget_ms}ms budget")
+
+if __name__ == '__main__':
+    main()
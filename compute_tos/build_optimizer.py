@@ -0,0 +1,289 @@
+"""Budget-optimal PC builds over the parts catalog.
+
+recommendBuild splits the budget by fixed percentages and upgrades greedily,
+which leaves money unused and misses better combinations. BuildOptimizer
+maximizes a weighted score under the budget as a multiple-choice knapsack.
+Each group contributes a Pareto front of (price, score) options, and fronts
+are merged pairwise, keeping the best combination per price bucket
+(budget / buckets wide).
+
+Compatibility comes from the catalog's precomputed index (CompatibilityIndex)
+and is folded into the groups, so only compatible candidates are enumerated:
+
+- platform: CPU + the cheapest board for its socket + the cheapest case for
+  that board's form factor + the cheapest cooler for the socket
+- power: GPU + the cheapest PSU that is big enough for the GPU and the CPU
+- RAM and STORAGE (SSD or HDD) on their own
+
+The case has to take the PSU's form factor, and the PSU size depends on the
+CPU. So the search runs once per (PSU form factor, CPU power class). Each run
+uses the CPUs at or below that class and PSUs sized for it. Everything
+independent of the budget is precomputed, so a query only merges fronts of at
+most `buckets` points each, whatever the catalog size.
+
+Scores are normalized per category (best part = 1) and weighted by the
+use-case allocation. GPUs use their PassMark score. The catalog has no CPU,
+RAM or drive benchmarks, so those use estimates: cores x boost clock for CPUs,
+size and speed for RAM, capacity for drives. Boards, coolers, PSUs and cases
+only need to fit, so they score 0 and the cheapest fitting one is taken.
+GPUs with no power draw in the catalog can't be given a PSU and are skipped.
+"""
+import bisect
+import math
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from pc_recommendations import (LABEL_CATEGORIES, OUTPUT_ORDER, PART_FIELDS, CompatibilityIndex, ParetoFrontier,
+                                allocation_for)
+
+DEFAULT_BUCKETS = 400
+CPU_WATT_CLASS = 25
+SOCKETED = [('CPU', 'cpu'), ('MOTHERBOARD', 'motherboard'), ('FAN', 'fan')]
+CATEGORY_LABELS = {category: label for label, categories in LABEL_CATEGORIES.items() for category in categories}
+
+# (cost, score, choice); choice nests the parts of merged groups
+Point = Tuple[float, float, Any]
+
+def to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def part_score(label: str, part: Dict[str, Any]) -> float:
+    spec = part.get('specs', {})
+    if label == 'GPU':
+        return part['benchmark'] or 0.0
+    if label == 'CPU':
+        cores = to_float(spec.get('cores')) or 1
+        clock = to_float(spec.get('boost_clock')) or to_float(spec.get('core_clock')) or 1
+        return clock * math.sqrt(cores)
+    if label == 'RAM':
+        size = to_float(spec.get('size')) or 0
+        speed = re.search(r'(\d+)$', spec.get('speed') or '')
+        return math.sqrt(size) * (int(speed.group(1)) if speed else 1)
+    if label == 'STORAGE':
+        capacity = (to_float(spec.get('capacity')) or 0) * (1000 if spec.get('unit') == 'TB' else 1)
+        return math.sqrt(capacity) * (2 if spec.get('type') == 'SSD' else 1)
+    return 0.0
+
+def rank_key(label: str) -> Callable[[Dict[str, Any]], Tuple[float, float]]:
+    """Score, then PSU wattage: the unscored categories otherwise rank every part equal"""
+    return lambda part: (part_score(label, part), (part['wattage'] or 0) if label == 'PSU' else 0)
+
+def pareto(points: List[Point], width: float = None) -> List[Point]:
+    """Points sorted by cost with strictly increasing score; with `width`, one per cost bucket"""
+    if width:
+        buckets: Dict[int, Point] = {}
+        for point in points:
+            key = int(point[0] // width)
+            kept = buckets.get(key)
+            if kept is None or point[1] > kept[1] or (point[1] == kept[1] and point[0] < kept[0]):
+                buckets[key] = point
+        points = list(buckets.values())
+    front = []
+    for point in sorted(points, key=lambda p: (p[0], -p[1])):
+        if not front or point[1] > front[-1][1]:
+            front.append(point)
+    return front
+
+def combine(a: List[Point], b: List[Point], budget: float, width: float) -> List[Point]:
+    """Front of one option from each of two fronts, within budget"""
+    points = []
+    for cost_a, score_a, choice_a in a:
+        if cost_a > budget:
+            break
+        for cost_b, score_b, choice_b in b:
+            cost = cost_a + cost_b
+            if cost > budget:
+                break
+            points.append((cost, score_a + score_b, (choice_a, choice_b)))
+    return pareto(points, width)
+
+def scaled(front: List[Point], weight: float) -> List[Point]:
+    if weight <= 0:
+        return front[:1]
+    return [(cost, score * weight, choice) for cost, score, choice in front]
+
+def flatten(choice: Any) -> List[Dict[str, Any]]:
+    if isinstance(choice, dict):
+        return [choice]
+    return [part for item in choice for part in flatten(item)]
+
+class BuildOptimizer:
+    def __init__(self, parts: Dict[str, List[Dict[str, Any]]], compatibility: CompatibilityIndex,
+                 buckets: int = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.compatibility = compatibility
+        by_id = {part['part_id']: part for options in parts.values() for part in options}
+
+        def priced(ids: Iterable[str]) -> List[Dict[str, Any]]:
+            return [by_id[i] for i in ids if i in by_id]
+
+        def cheapest(options: Iterable[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            return min(options, key=lambda p: (p['price'], p['order']), default=None)
+
+        norm = {}
+        for label, options in parts.items():
+            best = max((part_score(label, part) for part in options), default=0)
+            norm[label] = best or 1.0
+
+        def scorer(label: str) -> Callable[[Dict[str, Any]], float]:
+            return lambda part: part_score(label, part)
+
+        def front(label: str, frontier: ParetoFrontier) -> List[Point]:
+            return [(p['price'], part_score(label, p) / norm[label], p) for p in frontier.parts]
+
+        # Price vs score frontiers per category, and per socket for socketed parts
+        self.frontiers = {label: ParetoFrontier(options, rank_key(label)) for label, options in parts.items()}
+        # Coolers without a socket list fit any CPU, as in fanCpuCompatible
+        universal = [fan for fan in parts.get('FAN', []) if not fan['supported_socket']]
+        self.socket_frontiers: Dict[Tuple[str, str], ParetoFrontier] = {}
+        for label, category in SOCKETED:
+            for (indexed, socket), ids in compatibility.by_socket.items():
+                if indexed == category:
+                    options = priced(ids) + (universal if label == 'FAN' else [])
+                    self.socket_frontiers[(label, socket)] = ParetoFrontier(options, rank_key(label))
+
+        self.ram = front('RAM', self.frontiers['RAM'])
+        self.storage = front('STORAGE', self.frontiers['STORAGE'])
+
+        cpu_sockets = {socket for cpu in parts.get('CPU', []) for socket in compatibility.sockets.get(cpu['part_id'], ())}
+        coolers = {socket: cheapest(priced(compatibility.compatible('fan', socket)) + universal)
+                   for socket in cpu_sockets}
+        self.candidates = {'CPU': [0, 0], 'GPU': [0, 0]}
+
+        # CPUs grouped by power class (rounded up to CPU_WATT_CLASS)
+        cpus: Dict[int, List[Dict[str, Any]]] = {}
+        for cpu in parts.get('CPU', []):
+            watts = compatibility.watts.get(cpu['part_id'])
+            if watts is not None:
+                cpus.setdefault(-(-watts // CPU_WATT_CLASS) * CPU_WATT_CLASS, []).append(cpu)
+
+        psu_form_factors = sorted({form_factor for psu in parts.get('PSU', [])
+                                   for form_factor in compatibility.form_factors.get((psu['part_id'], 'psu'), ())})
+        # (PSU form factor, CPU power class, platform front, power front)
+        self.classes: List[Tuple[str, int, List[Point], List[Point]]] = []
+        for psu_form_factor in psu_form_factors:
+            cases = compatibility.fitting('case', 'psu', psu_form_factor)
+            case_for = {board_form_factor: cheapest(priced(compatibility.fitting('case', 'board', board_form_factor)
+                                                           & cases))
+                        for (_, kind, board_form_factor) in compatibility.by_form_factor if kind == 'board'}
+            # Cheapest board + case + cooler per socket
+            platform_for: Dict[str, Tuple[float, Tuple[Dict[str, Any], ...]]] = {}
+            for socket in cpu_sockets:
+                if coolers[socket] is None:
+                    continue
+                for board in priced(compatibility.compatible('motherboard', socket)):
+                    board_form_factor = next(iter(compatibility.form_factors.get((board['part_id'], 'board'), ())), None)
+                    case = case_for.get(board_form_factor)
+                    if case is None:
+                        continue
+                    cost = board['price'] + case['price'] + coolers[socket]['price']
+                    if socket not in platform_for or cost < platform_for[socket][0]:
+                        platform_for[socket] = (cost, (board, case, coolers[socket]))
+
+            # PSUs of this form factor by wattage, with the cheapest one at or above each wattage
+            psus = sorted((psu for psu in parts.get('PSU', []) if psu['wattage'] and psu_form_factor in
+                           compatibility.form_factors.get((psu['part_id'], 'psu'), ())), key=lambda p: p['wattage'])
+            psu_watts = [psu['wattage'] for psu in psus]
+            psu_cheapest: List[Dict[str, Any]] = []
+            for psu in reversed(psus):
+                kept = psu_cheapest[-1] if psu_cheapest else None
+                psu_cheapest.append(psu if kept is None or psu['price'] < kept['price'] else kept)
+            psu_cheapest.reverse()
+
+            # The rest of a platform costs the same for every CPU of a socket, and the PSU the
+            # same for every GPU needing it, so only those groups' frontiers can be optimal
+            eligible: Dict[str, List[Dict[str, Any]]] = {}
+            for watt_class in sorted(cpus):
+                for cpu in cpus[watt_class]:
+                    for socket in compatibility.sockets.get(cpu['part_id'], ()):
+                        eligible.setdefault(socket, []).append(cpu)
+                platform = []
+                for socket, group in eligible.items():
+                    if socket not in platform_for:
+                        continue
+                    cost, choice = platform_for[socket]
+                    frontier = ParetoFrontier(group, scorer('CPU'))
+                    self.candidates['CPU'][0] += len(group)
+                    self.candidates['CPU'][1] += len(frontier)
+                    platform.extend((cpu['price'] + cost, part_score('CPU', cpu) / norm['CPU'], (cpu, choice))
+                                    for cpu in frontier.parts)
+
+                by_psu: Dict[int, List[Dict[str, Any]]] = {}
+                for gpu in parts.get('GPU', []):
+                    gpu_watts = compatibility.watts.get(gpu['part_id'])
+                    if gpu_watts is None:
+                        continue
+                    required = compatibility.minimum_psu_wattage(watt_class, gpu_watts)
+                    i = bisect.bisect_left(psu_watts, required)
+                    if i < len(psu_cheapest):
+                        by_psu.setdefault(i, []).append(gpu)
+                power = []
+                for i, group in by_psu.items():
+                    psu = psu_cheapest[i]
+                    frontier = ParetoFrontier(group, scorer('GPU'))
+                    self.candidates['GPU'][0] += len(group)
+                    self.candidates['GPU'][1] += len(frontier)
+                    power.extend((gpu['price'] + psu['price'], part_score('GPU', gpu) / norm['GPU'], (gpu, psu))
+                                 for gpu in frontier.parts)
+                if platform and power:
+                    self.classes.append((psu_form_factor, watt_class, pareto(platform), pareto(power)))
+
+    def best_under(self, label: str, price: float, socket: str = None) -> Optional[Dict[str, Any]]:
+        """Highest-scoring part of a category at or under `price`, optionally for a CPU socket.
+
+        PSUs with equal scores rank by wattage. Boards, cases and coolers have
+        no score, so this returns the cheapest one (that fits the socket).
+        """
+        if socket is None:
+            frontier = self.frontiers.get(label)
+        else:
+            frontier = self.socket_frontiers.get((label, socket.strip().upper()))
+        return frontier.best_under(price) if frontier else None
+
+    def frontier_stats(self) -> Dict[str, Any]:
+        return {
+            'frontiers': {label: len(frontier) for label, frontier in self.frontiers.items()},
+            # (candidates seen, candidates on a frontier) summed over all search classes
+            'candidates': {label: {'considered': seen, 'kept': kept} for label, (seen, kept) in self.candidates.items()},
+        }
+
+    def optimize(self, budget: float, use_case: str = '') -> Optional[Dict[str, Any]]:
+        """Highest-scoring compatible build within budget, or None if nothing fits"""
+        if not math.isfinite(budget) or budget < 0:
+            raise ValueError(f'budget must be finite and non-negative, got {budget!r}')
+        weights = allocation_for(use_case)
+        width = budget / self.buckets if budget > 0 else None
+        if not (self.ram and self.storage):
+            return None
+
+        rest = combine(scaled(self.ram, weights['RAM']), scaled(self.storage, weights['STORAGE']), budget, width)
+        rest_costs = [point[0] for point in rest]
+
+        best: Optional[Point] = None
+        for _, _, platform, power in self.classes:
+            core = combine(scaled(platform, weights['CPU']), scaled(power, weights['GPU']), budget, width)
+            for cost, score, choice in core:
+                # `rest` is a front, so the last affordable point scores highest
+                i = bisect.bisect_right(rest_costs, budget - cost) - 1
+                if i < 0:
+                    break
+                total = (cost + rest[i][0], score + rest[i][1], (choice, rest[i][2]))
+                if best is None or total[1] > best[1] or (total[1] == best[1] and total[0] < best[0]):
+                    best = total
+        if best is None:
+            return None
+
+        chosen = {CATEGORY_LABELS[part['category']]: part for part in flatten(best[2])}
+        cpu_watts = self.compatibility.watts.get(chosen['CPU']['part_id'])
+        gpu_watts = self.compatibility.watts.get(chosen['GPU']['part_id'])
+        return {
+            'build': [dict({'label': label}, **{field: chosen[label][field] for field in PART_FIELDS})
+                      for label in OUTPUT_ORDER],
+            'total': round(best[0], 2),
+            'score': round(best[1], 4),
+            'psu_min_wattage': self.compatibility.minimum_psu_wattage(cpu_watts, gpu_watts),
+            'cpu_watts_estimate': cpu_watts,
+        }
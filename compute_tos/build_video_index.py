@@ -0,0 +1,194 @@
+"""Batch job that pre-fetches video recommendations for every known lesson topic.
+
+    python build_video_index.py --limit 10 --workers 8
+
+Topics are the chapter and section (lesson) titles from the dashboard
+chapter data and the app's default query. Every question in the question bank
+is assigned to the lesson of its chapter whose text it shares the most
+distinctive words with, so the app's recommendation query (the wrong answers'
+question texts joined together) is answered from its lessons' entry. The
+service loads the resulting file (VIDEO_INDEX_PATH, default video_index.json
+next to this script) and only searches live for queries it does not cover.
+Entries fetched within --max-age-hours are carried over from the previous
+build instead of being searched again.
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+from tos import DEFAULT_QUESTION_BANK_PATH
+from video_recommendations import BACKENDS, DEFAULT_VIDEO_INDEX_PATH, normalize_query
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+CHAPTER_DATA_DIR = REPO_ROOT / 'screens' / 'dashboard' / 'CHAPTER'
+DEFAULT_QUERY = 'pc assembly components'
+TITLE_PATTERN = re.compile(r"title:\s*'((?:[^'\\]|\\.)*)'")
+CHAPTER_FILE_PATTERN = re.compile(r'chapter(\d+)Data\.js$')
+WORD_PATTERN = re.compile(r'[a-z0-9]{4,}')
+
+def words(text: str) -> Set[str]:
+    return set(WORD_PATTERN.findall(text.lower()))
+
+def chapter_lessons(chapter_data_dir: Path = CHAPTER_DATA_DIR) -> Dict[str, List[Tuple[str, str]]]:
+    """chapter id -> [(title, text)], the chapter's own title first and then each section.
+
+    A section's text is everything from its title to the next one.
+    """
+    chapters = {}
+    for path in sorted(Path(chapter_data_dir).glob('chapter*Data.js')):
+        match = CHAPTER_FILE_PATTERN.search(path.name)
+        if not match:
+            continue
+        source = path.read_text(encoding='utf-8')
+        titles = list(TITLE_PATTERN.finditer(source))
+        lessons = []
+        for i, title in enumerate(titles):
+            end = titles[i + 1].start() if i + 1 < len(titles) else len(source)
+            name = title.group(1).replace("\\'", "'").strip()
+            if name:
+                lessons.append((name, source[title.start():end]))
+        chapters[f'chapter{match.group(1)}'] = lessons
+    return chapters
+
+def load_questions(question_bank_path: Path = DEFAULT_QUESTION_BANK_PATH) -> List[Dict]:
+    questions = []
+    for path in sorted(Path(question_bank_path).glob('chapter_*.json')):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                questions.extend(json.load(f))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Skipping {path.name}: {e}", file=sys.stderr)
+    return questions
+
+def collect_topics(chapter_data_dir: Path = CHAPTER_DATA_DIR) -> List[str]:
+    """Distinct topics keyed by their normalized form, in a stable order"""
+    topics: Dict[str, str] = {normalize_query(DEFAULT_QUERY): DEFAULT_QUERY}
+    for lessons in chapter_lessons(chapter_data_dir).values():
+        for title, _ in lessons:
+            topics.setdefault(normalize_query(title), title)
+    return list(topics.values())
+
+def question_topics(question_bank_path: Path = DEFAULT_QUESTION_BANK_PATH,
+                    chapter_data_dir: Path = CHAPTER_DATA_DIR) -> Dict[str, str]:
+    """Normalized question text -> normalized topic of the lesson it belongs to.
+
+    A question goes to the section of its chapter it shares the most words
+    with, each word weighted by how few of the chapter's sections use it; with
+    nothing in common it goes to the chapter title.
+    """
+    lesson_words = {
+        chapter: [(normalize_query(title), words(text)) for title, text in lessons]
+        for chapter, lessons in chapter_lessons(chapter_data_dir).items() if lessons
+    }
+    rarity = {}
+    for chapter, lessons in lesson_words.items():
+        counts: Dict[str, int] = {}
+        for _, vocabulary in lessons[1:]:
+            for word in vocabulary:
+                counts[word] = counts.get(word, 0) + 1
+        rarity[chapter] = {word: 1.0 / n for word, n in counts.items()}
+
+    mapping = {}
+    for q in load_questions(question_bank_path):
+        text, lessons = normalize_query(q.get('question', '')), lesson_words.get(q.get('chapter'))
+        if not text or not lessons:
+            continue
+        question_words = words(text)
+        best, best_score = lessons[0][0], 0.0
+        for topic, vocabulary in lessons[1:]:
+            score = sum(rarity[q['chapter']][word] for word in question_words & vocabulary)
+            if score > best_score:
+                best, best_score = topic, score
+        mapping.setdefault(text, best)
+    return mapping
+
+def load_index(path: Path) -> Dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {'entries': {}}
+
+def build_index(output: Path, backend_name: str = 'youtube', limit: int = 10, workers: int = 8,
+                max_age_hours: float = None, topics: List[str] = None,
+                questions: Dict[str, str] = None) -> Dict:
+    """Fetch every topic that is missing or stale and write the merged index to `output`"""
+    backend = BACKENDS[backend_name]
+    topics = topics if topics is not None else collect_topics()
+    questions = questions if questions is not None else question_topics()
+    previous = load_index(output)
+    entries: Dict[str, Dict] = {}
+
+    now = time.time()
+    to_fetch = []
+    for topic in topics:
+        key = normalize_query(topic)
+        old = previous['entries'].get(key)
+        fresh = (old is not None and max_age_hours is not None and old.get('limit', 0) >= limit
+                 and now - old.get('fetched_at', 0) < max_age_hours * 3600
+                 and previous.get('backend') == backend_name)
+        if fresh:
+            entries[key] = old
+        else:
+            to_fetch.append(topic)
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(backend, topic, limit): topic for topic in to_fetch}
+        for future in as_completed(futures):
+            topic = futures[future]
+            key = normalize_query(topic)
+            try:
+                entries[key] = {'limit': limit, 'fetched_at': time.time(), 'videos': future.result()}
+            except Exception as e:
+                failed += 1
+                print(f"Search failed for {topic!r}: {e}", file=sys.stderr)
+                # Keep serving the previous result rather than dropping the topic
+                if key in previous['entries']:
+                    entries[key] = previous['entries'][key]
+
+    index = {
+        'built_at': time.time(),
+        'backend': backend_name,
+        'entries': dict(sorted(entries.items())),
+        # Only questions whose topic has an entry are worth matching at lookup time
+        'questions': dict(sorted((text, topic) for text, topic in questions.items() if topic in entries))
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_suffix(output.suffix + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+    tmp.replace(output)
+
+    return {
+        'output': str(output),
+        'topics': len(topics),
+        'fetched': len(to_fetch) - failed,
+        'reused': len(topics) - len(to_fetch),
+        'failed': failed,
+        'entries': len(entries),
+        'questions': len(index['questions'])
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Pre-fetch video recommendations for known topics')
+    parser.add_argument('--output', default=str(DEFAULT_VIDEO_INDEX_PATH))
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='youtube')
+    parser.add_argument('--limit', type=int, default=10,
+                        help='videos stored per topic; lookups for up to this many are served from the index')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--max-age-hours', type=float, default=None,
+                        help='reuse entries from the existing index fetched within this many hours')
+    args = parser.parse_args()
+
+    result = build_index(Path(args.output), args.backend, args.limit, args.workers, args.max_age_hours)
+    print(json.dumps(result, indent=2))
+    if result['failed']:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
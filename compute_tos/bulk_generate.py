@@ -0,0 +1,176 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Set
+from tos import SummativeAssessmentGenerator, get_question_bank_cache
+
+_bank_path = None
+
+def _init_worker(question_bank_path: str):
+    """Load the question bank once per worker process"""
+    global _bank_path
+    _bank_path = question_bank_path
+    get_question_bank_cache(question_bank_path).get()
+
+def _generate_batch(batch_no: int, batch_size: int, base_seed: int) -> List[Dict[str, Any]]:
+    """Generate one batch of exams; each exam's seed depends only on its position, not on the worker"""
+    exams = []
+    for i in range(batch_size):
+        generator = SummativeAssessmentGenerator(_bank_path, seed=f"{base_seed}:{batch_no}:{i}")
+        exams.append(generator.generate_unified_assessment())
+    return exams
+
+class OverlapGuard:
+    """Rejects repeated exams, and exams sharing more than `max_shared` questions with any accepted exam"""
+    def __init__(self, max_shared: int = None):
+        self.max_shared = max_shared
+        self.duplicates = 0
+        self._bits: Dict[str, int] = {}
+        self._accepted: List[int] = []
+        self._seen: Set[int] = set()
+
+    def mask(self, exam: Dict) -> int:
+        mask = 0
+        for q in exam['questions']:
+            bit = self._bits.setdefault(q.get('question', ''), len(self._bits))
+            mask |= 1 << bit
+        return mask
+
+    def try_accept(self, exam: Dict) -> bool:
+        mask = self.mask(exam)
+        if mask in self._seen:
+            self.duplicates += 1
+            return False
+        if self.max_shared is not None:
+            limit = self.max_shared
+            for other in self._accepted:
+                if (mask & other).bit_count() > limit:
+                    return False
+        self._accepted.append(mask)
+        self._seen.add(mask)
+        return True
+
+class ExamWriter:
+    """Streams exams to a single JSON Lines file or to a directory of shards"""
+    def __init__(self, output: str, shard_size: int):
+        self.output = Path(output)
+        self.shard_size = shard_size
+        self.sharded = self.output.suffix != '.jsonl'
+        self.written = 0
+        self._file = None
+        if self.sharded:
+            self.output.mkdir(parents=True, exist_ok=True)
+        else:
+            self.output.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.output, 'w', encoding='utf-8')
+
+    def write(self, exam: Dict):
+        if self.sharded and self.written % self.shard_size == 0:
+            if self._file:
+                self._file.close()
+            shard = self.output / f"exams-{self.written // self.shard_size:05d}.jsonl"
+            self._file = open(shard, 'w', encoding='utf-8')
+        self._file.write(json.dumps(exam, ensure_ascii=False))
+        self._file.write('\n')
+        self.written += 1
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+def bulk_generate(count: int, output: str, workers: int = None, seed: int = None,
+                  max_overlap: float = None, batch_size: int = 25, shard_size: int = 500,
+                  max_batches: int = None, question_bank_path: str = None) -> Dict[str, Any]:
+    """Generate `count` distinct exams across a process pool, streaming them to `output`"""
+    workers = workers or os.cpu_count() or 1
+    seed = seed if seed is not None else random.randrange(2**32)
+    max_batches = max_batches or max(1, (count // batch_size + 1) * 20)
+    bank_path = question_bank_path or str(get_question_bank_cache().base_path)
+
+    questions_per_exam = sum(c.question_count for c in SummativeAssessmentGenerator.SUMMATIVE_CONFIG.values())
+    max_shared = None if max_overlap is None else int(max_overlap * questions_per_exam)
+    guard = OverlapGuard(max_shared)
+    writer = ExamWriter(output, shard_size)
+
+    created_at = datetime.now().isoformat()
+    started = time.perf_counter()
+    rejected = 0
+    batches_submitted = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(bank_path,)) as executor:
+            in_flight: Dict[Any, int] = {}
+            # Batches finish in any order; they are accepted strictly by batch number so
+            # the same seed always yields the same exams in the same order
+            pending: Dict[int, List[Dict[str, Any]]] = {}
+            next_batch = 0
+            while writer.written < count:
+                while (len(in_flight) < workers * 2 and batches_submitted < max_batches
+                       and writer.written + (len(in_flight) + len(pending)) * batch_size < count * 2):
+                    future = executor.submit(_generate_batch, batches_submitted, batch_size, seed)
+                    in_flight[future] = batches_submitted
+                    batches_submitted += 1
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending[in_flight.pop(future)] = future.result()
+                while next_batch in pending and writer.written < count:
+                    for exam in pending.pop(next_batch):
+                        if writer.written >= count:
+                            break
+                        if not guard.try_accept(exam):
+                            rejected += 1
+                            continue
+                        # The run's timestamp goes in the summary so a seed reproduces the file byte for byte
+                        exam['metadata'].pop('created_at', None)
+                        exam['metadata']['id'] = f"summative_assessment_bulk_{seed}_{writer.written:05d}"
+                        writer.write(exam)
+                    next_batch += 1
+            for future in in_flight:
+                future.cancel()
+    finally:
+        writer.close()
+
+    return {
+        'requested': count,
+        'written': writer.written,
+        'rejected_for_overlap': rejected - guard.duplicates,
+        'rejected_duplicates': guard.duplicates,
+        'batches': batches_submitted,
+        'seed': seed,
+        'max_shared_questions': max_shared,
+        'workers': workers,
+        'created_at': created_at,
+        'seconds': round(time.perf_counter() - started, 3)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate many distinct summative assessments in parallel')
+    parser.add_argument('--count', type=int, default=2000)
+    parser.add_argument('--output', default='bulk_exams',
+                        help='a .jsonl file, or a directory for sharded output')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None, help='base seed; exam i of batch N uses "seed:N:i"')
+    parser.add_argument('--max-overlap', type=float, default=None,
+                        help='max fraction of questions any two exams may share (e.g. 0.5)')
+    parser.add_argument('--batch-size', type=int, default=25)
+    parser.add_argument('--shard-size', type=int, default=500)
+    parser.add_argument('--question-bank', default=None)
+    args = parser.parse_args()
+
+    result = bulk_generate(args.count, args.output, args.workers, args.seed, args.max_overlap,
+                           args.batch_size, args.shard_size, question_bank_path=args.question_bank)
+    print(json.dumps(result, indent=2))
+    if result['written'] < args.count:
+        print("Could not reach the requested count within the overlap limit", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,16 @@
+import sys
+
+import pytest
+
+from pc_recommendations import SCRAPER_DIR
+
+@pytest.fixture(scope='session')
+def catalog_path(tmp_path_factory):
+    """A parts catalog built from the scraped CSVs, shared by the recommender tests"""
+    if str(SCRAPER_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRAPER_DIR))
+    from build_catalog import build_catalog
+    directory = tmp_path_factory.mktemp('catalog')
+    path = directory / 'catalog.db'
+    build_catalog(path, SCRAPER_DIR, match_cache=directory / 'name_matches.json')
+    return path
@@ -0,0 +1,160 @@
+"""Load-test harness for the assessment service.
+
+Hit a running server:
+    python load_test.py --url http://localhost:5000 --concurrency 32 --duration 10
+
+Measure how throughput scales with worker processes (starts serve.py per count):
+    python load_test.py --sweep-workers 1,2,4,8 --duration 10
+
+Set RECOMMENDATION_BACKEND=stub to measure the recommendation endpoint
+without calling YouTube; spawned servers inherit the environment.
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any
+from urllib.parse import urlsplit
+
+ENDPOINTS = {
+    'summative': ('GET', '/api/generate-summative-assessment', None),
+    'recommendations': ('POST', '/api/recommendations',
+                        json.dumps({'query': 'pc assembly components', 'limit': 5})),
+}
+
+def _client_worker(url: str, endpoint: str, threads: int, duration: float) -> Dict[str, Any]:
+    """One client process: `threads` keep-alive connections hammering one endpoint"""
+    method, path, body = ENDPOINTS[endpoint]
+    parts = urlsplit(url)
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def run():
+        conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        local = []
+        local_errors = 0
+        headers = {'Content-Type': 'application/json'} if body else {}
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 400:
+                    local_errors += 1
+                else:
+                    local.append(time.perf_counter() - started)
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    pool = [threading.Thread(target=run) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return {'latencies': latencies, 'errors': errors[0]}
+
+def run_load(url: str, endpoint: str, concurrency: int, duration: float, client_processes: int) -> Dict[str, Any]:
+    """Drive `concurrency` connections from several processes so the client isn't GIL-bound"""
+    client_processes = max(1, min(client_processes, concurrency))
+    per_process = [concurrency // client_processes + (1 if i < concurrency % client_processes else 0)
+                   for i in range(client_processes)]
+    with ProcessPoolExecutor(max_workers=client_processes) as executor:
+        results = list(executor.map(_client_worker, [url] * client_processes, [endpoint] * client_processes,
+                                    per_process, [duration] * client_processes))
+
+    latencies = sorted(l for r in results for l in r['latencies'])
+    errors = sum(r['errors'] for r in results)
+    if not latencies:
+        return {'endpoint': endpoint, 'requests': 0, 'errors': errors, 'rps': 0.0}
+    return {
+        'endpoint': endpoint,
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / duration, 1),
+        'p50_ms': round(statistics.median(latencies) * 1000, 2),
+        'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+        'max_ms': round(latencies[-1] * 1000, 2),
+    }
+
+def _wait_until_ready(url: str, timeout: float = 30.0):
+    parts = urlsplit(url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=2)
+            conn.request('GET', '/api/question-bank/stats')
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not become ready")
+
+def sweep(worker_counts: List[int], endpoints: List[str], concurrency: int, duration: float,
+          client_processes: int, port: int, threads: int) -> List[Dict[str, Any]]:
+    """Start serve.py once per worker count and measure each endpoint"""
+    url = f"http://127.0.0.1:{port}"
+    here = os.path.dirname(os.path.abspath(__file__))
+    rows = []
+    for workers in worker_counts:
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(here, 'serve.py'), '--host', '127.0.0.1', '--port', str(port),
+             '--workers', str(workers), '--threads', str(threads)],
+            cwd=here, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            _wait_until_ready(url)
+            for endpoint in endpoints:
+                result = run_load(url, endpoint, concurrency, duration, client_processes)
+                result['workers'] = workers
+                rows.append(result)
+                print(json.dumps(result), file=sys.stderr)
+        finally:
+            server.terminate()
+            server.wait()
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the assessment service')
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--endpoints', default='summative,recommendations',
+                        help=f"comma-separated subset of {','.join(ENDPOINTS)}")
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--client-processes', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--sweep-workers', default=None, help='e.g. 1,2,4,8 to start serve.py per count')
+    parser.add_argument('--port', type=int, default=5055, help='port used by --sweep-workers')
+    parser.add_argument('--threads', type=int, default=4, help='threads per worker for --sweep-workers')
+    args = parser.parse_args()
+
+    endpoints = [e.strip() for e in args.endpoints.split(',') if e.strip()]
+    if args.sweep_workers:
+        counts = [int(c) for c in args.sweep_workers.split(',')]
+        rows = sweep(counts, endpoints, args.concurrency, args.duration, args.client_processes,
+                     args.port, args.threads)
+        print(f"{'workers':>8} {'endpoint':>16} {'rps':>10} {'p50_ms':>8} {'p95_ms':>8} {'errors':>7}")
+        for row in rows:
+            print(f"{row['workers']:>8} {row['endpoint']:>16} {row['rps']:>10} "
+                  f"{row.get('p50_ms', '-'):>8} {row.get('p95_ms', '-'):>8} {row['errors']:>7}")
+    else:
+        for endpoint in endpoints:
+            print(json.dumps(run_load(args.url, endpoint, args.concurrency, args.duration,
+                                      args.client_processes)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,396 @@
+"""Server-side port of `recommendBuild` (services/pcRecommendationAlgorithm.js).
+
+The parts catalog built by scraper/build_catalog.py is loaded once into one
+price-sorted PartIndex per category; motherboards are partitioned by socket
+and coolers by every socket they support. "Best benchmark at or under a
+price" and "best upgrade in (current, current + remaining]" are then a
+bisect on a per-index Pareto frontier and a bisect plus an O(1) sparse-table
+range maximum, so a query never scans a part list.
+
+The semantics follow the JS exactly: the same allocation, selection order,
+socket checks, cheapest-compatible fallback, round-robin upgrade loop and
+output order. Ties go to the part listed first in the catalog, like the JS
+`reduce`. Unpriced parts are left out.
+"""
+import bisect
+import json
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+SCRAPER_DIR = Path(__file__).resolve().parent.parent / 'scraper'
+DEFAULT_CATALOG_PATH = SCRAPER_DIR / 'catalog.db'
+
+SELECTION_ORDER = ['CPU', 'MOTHERBOARD', 'GPU', 'RAM', 'PSU', 'STORAGE', 'CASE', 'FAN']
+OUTPUT_ORDER = ['MOTHERBOARD', 'GPU', 'CPU', 'FAN', 'RAM', 'PSU', 'STORAGE', 'CASE']
+ALLOCATION = {
+    'CPU': 0.25,
+    'GPU': 0.25,
+    'RAM': 0.1,
+    'MOTHERBOARD': 0.1,
+    'PSU': 0.1,
+    'STORAGE': 0.1,
+    'CASE': 0.05,
+    'FAN': 0.05,
+}
+USE_CASE_SHIFT = {
+    'gaming': {'GPU': 0.1, 'CPU': -0.1},
+    'productivity': {'CPU': 0.1, 'GPU': -0.1},
+}
+# Build label -> catalog categories, in listing order
+LABEL_CATEGORIES = {
+    'CPU': ['cpu'],
+    'MOTHERBOARD': ['motherboard'],
+    'GPU': ['gpu'],
+    'RAM': ['ram'],
+    'PSU': ['psu'],
+    'STORAGE': ['ssd', 'hdd'],
+    'CASE': ['case'],
+    'FAN': ['fan'],
+}
+PART_FIELDS = ['value', 'price', 'benchmark', 'wattage', 'socket', 'microarchitecture', 'supported_socket', 'tdp']
+
+def allocation_for(use_case: str) -> Dict[str, float]:
+    allocation = dict(ALLOCATION)
+    for label, shift in USE_CASE_SHIFT.get(use_case, {}).items():
+        allocation[label] += shift
+    return allocation
+
+def fan_sockets(part: Dict[str, Any]) -> List[str]:
+    return [s.strip() for s in (part.get('supported_socket') or '').split(',')]
+
+def listing_key(part: Dict[str, Any]) -> Tuple[float, int]:
+    """Higher benchmark wins, then the part listed first, like the JS `reduce`"""
+    return part['benchmark'] or 0, -part['order']
+
+class ParetoFrontier:
+    """Parts not beaten on score by any part at the same or a lower price, sorted by price.
+
+    Scores strictly increase along the frontier, so the best part at or under a
+    price is the last frontier entry at or under it: a binary search.
+    """
+    def __init__(self, parts: Iterable[Dict[str, Any]], key: Callable[[Dict[str, Any]], Any] = listing_key):
+        ranked = sorted(parts, key=key, reverse=True)
+        ranked.sort(key=lambda p: p['price'])
+        self.parts: List[Dict[str, Any]] = []
+        best = None
+        for part in ranked:
+            score = key(part)
+            if best is None or score > best:
+                self.parts.append(part)
+                best = score
+        self.prices = [p['price'] for p in self.parts]
+
+    def __len__(self) -> int:
+        return len(self.parts)
+
+    def best_under(self, price: float) -> Optional[Dict[str, Any]]:
+        """Best part priced at or under `price`"""
+        i = bisect.bisect_right(self.prices, price)
+        return self.parts[i - 1] if i else None
+
+class PartIndex:
+    """Parts sorted by price with best-benchmark queries over any price range.
+
+    "Best at or under a price" is a bisect on the Pareto frontier; "best
+    upgrade in a price range" uses an O(1) sparse-table range maximum over all
+    parts, since the best part in a range need not be on the frontier.
+    """
+    def __init__(self, parts: List[Dict[str, Any]]):
+        self.parts = sorted(parts, key=lambda p: (p['price'], p['order']))
+        self.prices = [p['price'] for p in self.parts]
+        self.frontier = ParetoFrontier(self.parts)
+        self._keys = [listing_key(p) for p in self.parts]
+        level = list(range(len(self.parts)))
+        self._table = [level]
+        width = 1
+        while width * 2 <= len(level):
+            prev = self._table[-1]
+            self._table.append([self._better(prev[i], prev[i + width]) for i in range(len(prev) - width)])
+            width *= 2
+
+    def __len__(self) -> int:
+        return len(self.parts)
+
+    def _better(self, a: int, b: int) -> int:
+        return a if self._keys[a] >= self._keys[b] else b
+
+    def _best(self, lo: int, hi: int) -> Optional[Dict[str, Any]]:
+        """Best part among positions [lo, hi)"""
+        if lo >= hi:
+            return None
+        level = (hi - lo).bit_length() - 1
+        row = self._table[level]
+        return self.parts[self._better(row[lo], row[hi - (1 << level)])]
+
+    def best_at_most(self, price: float) -> Optional[Dict[str, Any]]:
+        return self.frontier.best_under(price)
+
+    def best_between(self, above: float, at_most: float) -> Optional[Dict[str, Any]]:
+        """Best part priced in (above, at_most]"""
+        return self._best(bisect.bisect_right(self.prices, above), bisect.bisect_right(self.prices, at_most))
+
+    def cheapest(self) -> Optional[Dict[str, Any]]:
+        return self.parts[0] if self.parts else None
+
+EMPTY_INDEX = PartIndex([])
+
+def load_parts(catalog_path: Path) -> Dict[str, List[Dict[str, Any]]]:
+    """Priced parts per build label, in catalog order"""
+    db = sqlite3.connect(f"file:{catalog_path}?mode=ro", uri=True)
+    try:
+        parts: Dict[str, List[Dict[str, Any]]] = {}
+        for label, categories in LABEL_CATEGORIES.items():
+            options = parts.setdefault(label, [])
+            for category in categories:
+                rows = db.execute('SELECT part_id, name, price, benchmark, wattage, tdp, specs FROM parts '
+                                  'WHERE category = ? AND price IS NOT NULL ORDER BY rowid', (category,))
+                for part_id, name, price, benchmark, wattage, tdp, specs in rows:
+                    spec = json.loads(specs)
+                    options.append({
+                        'part_id': part_id,
+                        'category': category,
+                        'order': len(options),
+                        'value': name,
+                        'price': price,
+                        'benchmark': benchmark,
+                        'wattage': wattage,
+                        'socket': spec.get('socket'),
+                        'microarchitecture': spec.get('microarchitecture'),
+                        'supported_socket': spec.get('supported_socket'),
+                        'tdp': tdp,
+                        'specs': spec,
+                    })
+        return parts
+    finally:
+        db.close()
+
+class CompatibilityIndex:
+    """The catalog's precomputed compatibility tables as in-memory sets"""
+    def __init__(self, sockets: List[Tuple[str, str, str]], form_factors: List[Tuple[str, str, str, str]],
+                 power: List[Tuple[str, int]], psu_formula: Dict[str, float]):
+        self.sockets: Dict[str, Set[str]] = {}
+        self.by_socket: Dict[Tuple[str, str], Set[str]] = {}
+        for part_id, category, socket in sockets:
+            self.sockets.setdefault(part_id, set()).add(socket)
+            self.by_socket.setdefault((category, socket), set()).add(part_id)
+        self.form_factors: Dict[Tuple[str, str], Set[str]] = {}
+        self.by_form_factor: Dict[Tuple[str, str, str], Set[str]] = {}
+        for part_id, category, kind, form_factor in form_factors:
+            self.form_factors.setdefault((part_id, kind), set()).add(form_factor)
+            self.by_form_factor.setdefault((category, kind, form_factor), set()).add(part_id)
+        self.watts: Dict[str, int] = dict(power)
+        self.psu_formula = psu_formula
+
+    def compatible(self, category: str, socket: str) -> Set[str]:
+        """IDs of `category` parts (boards, coolers, CPUs) for a socket"""
+        return self.by_socket.get((category, socket), set())
+
+    def fitting(self, category: str, kind: str, form_factor: str) -> Set[str]:
+        """IDs of `category` parts matching a board or PSU form factor"""
+        return self.by_form_factor.get((category, kind, form_factor), set())
+
+    def minimum_psu_wattage(self, cpu_watts: float, gpu_watts: float) -> int:
+        base = self.psu_formula['base_watts']
+        return int(math.ceil(((cpu_watts or 0) + (gpu_watts or 0) + base) * self.psu_formula['headroom']))
+
+def load_compatibility(catalog_path: Path) -> CompatibilityIndex:
+    db = sqlite3.connect(f"file:{catalog_path}?mode=ro", uri=True)
+    try:
+        formula = db.execute("SELECT value FROM meta WHERE key = 'psu_formula'").fetchone()
+        if formula is None:
+            raise RuntimeError(f"{catalog_path} has no compatibility index; rebuild it with scraper/build_catalog.py")
+        return CompatibilityIndex(
+            db.execute('SELECT part_id, category, socket FROM part_sockets').fetchall(),
+            db.execute('SELECT part_id, category, kind, form_factor FROM part_form_factors').fetchall(),
+            db.execute('SELECT part_id, watts FROM part_power').fetchall(),
+            json.loads(formula[0])
+        )
+    finally:
+        db.close()
+
+class BuildIndex:
+    """Per-label price indexes, with motherboards and coolers partitioned by socket"""
+    def __init__(self, parts: Dict[str, List[Dict[str, Any]]]):
+        self.by_label = {label: PartIndex(options) for label, options in parts.items()}
+        self.counts = {label: len(options) for label, options in parts.items()}
+
+        boards: Dict[str, List[Dict[str, Any]]] = {}
+        for board in parts.get('MOTHERBOARD', []):
+            boards.setdefault(board['socket'], []).append(board)
+        self.boards_by_socket = {socket: PartIndex(group) for socket, group in boards.items()}
+
+        # A cooler without a socket list fits any CPU, as in fanCpuCompatible
+        universal, coolers = [], {}
+        for fan in parts.get('FAN', []):
+            if not fan['supported_socket']:
+                universal.append(fan)
+                continue
+            for socket in set(fan_sockets(fan)):
+                coolers.setdefault(socket, []).append(fan)
+        self.coolers_by_socket = {socket: PartIndex(group + universal) for socket, group in coolers.items()}
+        self.universal_coolers = PartIndex(universal)
+
+    def options(self, label: str, cpu: Optional[Dict[str, Any]]) -> PartIndex:
+        """Index of the options compatible with the chosen CPU"""
+        if label == 'MOTHERBOARD':
+            if cpu is None:
+                return EMPTY_INDEX
+            return self.boards_by_socket.get(cpu.get('microarchitecture'), EMPTY_INDEX)
+        if label == 'FAN' and cpu is not None:
+            return self.coolers_by_socket.get(cpu.get('microarchitecture'), self.universal_coolers)
+        return self.by_label.get(label, EMPTY_INDEX)
+
+def recommend_build(index: BuildIndex, budget: float, use_case: str) -> List[Dict[str, Any]]:
+    allocation = allocation_for(use_case)
+    build: Dict[str, Dict[str, Any]] = {}
+
+    for label in SELECTION_ORDER:
+        if not index.counts.get(label):
+            build[label] = {'label': label, 'value': '', 'price': 0}
+            continue
+        options = index.options(label, build.get('CPU'))
+        slice_budget = math.floor(budget * allocation[label])
+        selected = options.best_at_most(slice_budget) or options.cheapest()
+        entry = {'label': label}
+        if selected is None:
+            entry.update(value='', price=0)
+        else:
+            entry.update({field: selected[field] for field in PART_FIELDS})
+        build[label] = entry
+
+    remaining = budget - sum(part['price'] for part in build.values())
+    while remaining > 0:
+        upgraded = False
+        for label in SELECTION_ORDER:
+            if remaining <= 0:
+                break
+            if not index.counts.get(label):
+                continue
+            current = build[label]
+            upgrade = index.options(label, build.get('CPU')).best_between(current['price'],
+                                                                           current['price'] + remaining)
+            if upgrade is None:
+                continue
+            remaining -= upgrade['price'] - current['price']
+            current.update({field: upgrade[field] for field in PART_FIELDS})
+            upgraded = True
+        if not upgraded:
+            break
+
+    return [build[label] for label in OUTPUT_ORDER]
+
+class BuildRecommender:
+    """Loads the catalog once (and again when the file changes) and answers build queries"""
+    def __init__(self, catalog_path: str = None, check_interval: float = 5.0):
+        self.catalog_path = Path(catalog_path) if catalog_path else DEFAULT_CATALOG_PATH
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._index: Optional[BuildIndex] = None
+        self._parts: Dict[str, List[Dict[str, Any]]] = {}
+        self._compatibility: Optional[CompatibilityIndex] = None
+        self._optimizer = None
+        self._mtime = None
+        self._last_check = None
+        self.counters = {
+            'requests': 0,
+            'loads': 0,
+            'load_ms': 0.0,
+            'query_ms_total': 0.0,
+            'query_ms_max': 0.0,
+            'optimize_requests': 0,
+            'optimize_ms_total': 0.0,
+            'optimize_ms_max': 0.0
+        }
+
+    def index(self) -> BuildIndex:
+        now = time.monotonic()
+        if self._index is None or now - self._last_check >= self.check_interval:
+            with self._lock:
+                if self._index is None or now - self._last_check >= self.check_interval:
+                    self._refresh()
+                    self._last_check = time.monotonic()
+        return self._index
+
+    def _refresh(self):
+        if not self.catalog_path.exists():
+            self._build_catalog()
+        mtime = self.catalog_path.stat().st_mtime
+        if self._index is not None and mtime == self._mtime:
+            return
+        started = time.perf_counter()
+        self._parts = load_parts(self.catalog_path)
+        self._compatibility = load_compatibility(self.catalog_path)
+        self._index = BuildIndex(self._parts)
+        self._optimizer = None
+        self._mtime = mtime
+        self.counters['loads'] += 1
+        self.counters['load_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        print(f"Loaded parts catalog {self.catalog_path} in {self.counters['load_ms']} ms", file=sys.stderr)
+
+    def _build_catalog(self):
+        """Build a missing catalog from the scraped CSVs"""
+        if str(SCRAPER_DIR) not in sys.path:
+            sys.path.insert(0, str(SCRAPER_DIR))
+        from build_catalog import build_catalog
+        print(f"No parts catalog at {self.catalog_path}, building it from {SCRAPER_DIR}", file=sys.stderr)
+        build_catalog(self.catalog_path, SCRAPER_DIR)
+
+    def recommend(self, budget: float, use_case: str = '') -> List[Dict[str, Any]]:
+        index = self.index()
+        started = time.perf_counter()
+        build = recommend_build(index, budget, use_case)
+        elapsed = (time.perf_counter() - started) * 1000
+        self.counters['requests'] += 1
+        self.counters['query_ms_total'] += elapsed
+        self.counters['query_ms_max'] = max(self.counters['query_ms_max'], elapsed)
+        return build
+
+    def optimizer(self):
+        """BuildOptimizer over the current catalog, built on first use"""
+        self.index()
+        optimizer = self._optimizer
+        if optimizer is None:
+            from build_optimizer import BuildOptimizer
+            with self._lock:
+                if self._optimizer is None:
+                    started = time.perf_counter()
+                    self._optimizer = BuildOptimizer(self._parts, self._compatibility)
+                    self.counters['optimizer_load_ms'] = round((time.perf_counter() - started) * 1000, 2)
+                optimizer = self._optimizer
+        return optimizer
+
+    def best_under(self, label: str, price: float, socket: str = None) -> Optional[Dict[str, Any]]:
+        return self.optimizer().best_under(label, price, socket)
+
+    def optimize(self, budget: float, use_case: str = '') -> Optional[Dict[str, Any]]:
+        optimizer = self.optimizer()
+        started = time.perf_counter()
+        result = optimizer.optimize(budget, use_case)
+        elapsed = (time.perf_counter() - started) * 1000
+        self.counters['optimize_requests'] += 1
+        self.counters['optimize_ms_total'] += elapsed
+        self.counters['optimize_ms_max'] = max(self.counters['optimize_ms_max'], elapsed)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        requests = self.counters['requests']
+        index, optimizer = self._index, self._optimizer
+        return {
+            'catalog_path': str(self.catalog_path),
+            'parts': dict(index.counts) if index else {},
+            'listing_frontiers': {label: len(part_index.frontier) for label, part_index in index.by_label.items()}
+                                 if index else {},
+            'optimizer': optimizer.frontier_stats() if optimizer else None,
+            'counters': dict(self.counters),
+            'query_ms_avg': round(self.counters['query_ms_total'] / requests, 3) if requests else None
+        }
+
+def create_build_recommender() -> BuildRecommender:
+    """Build the recommender from the CATALOG_PATH environment setting"""
+    return BuildRecommender(os.environ.get('CATALOG_PATH'))
@@ -0,0 +1,91 @@
+"""Production entry point for the assessment service.
+
+    python serve.py --workers 4 --threads 4 --port 5000
+
+Uses gunicorn (Linux/macOS) with the app preloaded in the master process, so
+the question bank and the parts catalog's build tables are loaded once and
+shared copy-on-write by every forked worker. Falls back to waitress (threads in
+one process) where gunicorn is unavailable, e.g. on Windows. Both servers are
+listed in requirements.txt:
+
+    pip install -r requirements.txt
+"""
+import argparse
+import gc
+import os
+import sys
+
+def _preload():
+    """Import the app and warm everything that is safe to share across a fork"""
+    import assessment_service
+    from tos import get_question_bank_cache
+    get_question_bank_cache().get()
+    try:
+        # Builds the BuildIndex and the optimizer's frontiers, not just the parts list
+        assessment_service.build_recommender.optimizer()
+    except Exception as e:
+        print(f"Parts catalog not preloaded: {e}", file=sys.stderr)
+    return assessment_service.app
+
+def run_gunicorn(host: str, port: int, workers: int, threads: int, timeout: int):
+    from gunicorn.app.base import BaseApplication
+
+    class ServiceApplication(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return _preload()
+
+    def pre_fork(server, worker):
+        # Move the preloaded bank out of the GC's reach so collections in the
+        # workers don't touch (and un-share) its pages
+        gc.freeze()
+
+    options = {
+        'bind': f"{host}:{port}",
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'preload_app': True,
+        'timeout': timeout,
+        'pre_fork': pre_fork,
+        'accesslog': '-',
+    }
+    ServiceApplication(options).run()
+
+def run_waitress(host: str, port: int, workers: int, threads: int):
+    from waitress import serve
+    print("gunicorn unavailable, serving with waitress in a single process", file=sys.stderr)
+    serve(_preload(), host=host, port=port, threads=max(1, workers * threads))
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the assessment service with a production server')
+    parser.add_argument('--host', default=os.environ.get('HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 5000)))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1)))
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('WEB_THREADS', 4)))
+    parser.add_argument('--timeout', type=int, default=60)
+    parser.add_argument('--server', choices=['auto', 'gunicorn', 'waitress'], default='auto')
+    args = parser.parse_args()
+
+    server = args.server
+    if server == 'auto':
+        try:
+            import gunicorn  # noqa: F401
+            server = 'gunicorn'
+        except ImportError:
+            server = 'waitress'
+
+    if server == 'gunicorn':
+        run_gunicorn(args.host, args.port, args.workers, args.threads, args.timeout)
+    else:
+        run_waitress(args.host, args.port, args.workers, args.threads)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+import json
+import time
+
+import pytest
+
+import assessment_service
+from assessment_service import AssessmentPool, app
+from tos import MAX_SEED
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+@pytest.mark.parametrize('query', ['mode=random', f'seed={MAX_SEED + 1}', 'seed=abc'])
+def test_bad_parameters_are_rejected(client, query):
+    response = client.get(f'/api/generate-summative-assessment?{query}')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+def test_streamed_json_equals_the_plain_response(client):
+    plain = client.get('/api/generate-summative-assessment?seed=11')
+    streamed = client.get('/api/generate-summative-assessment?seed=11&stream=1')
+    assert plain.status_code == streamed.status_code == 200
+    assert streamed.mimetype == 'application/json'
+    assert json.loads(streamed.get_data(as_text=True)) == plain.get_json()
+
+def test_pool_only_keeps_exams_that_pass_the_rules(monkeypatch):
+    valid = assessment_service.generate_summative_assessment(seed=3)
+    invalid = json.loads(json.dumps(valid))
+    invalid['statistics']['rule_checks'] = dict.fromkeys(invalid['statistics']['rule_checks'], False)
+    generated = iter([invalid, valid, invalid, valid] + [valid] * 10)
+    monkeypatch.setattr(assessment_service, 'generate_summative_assessment', lambda *args, **kwargs: next(generated))
+
+    pool = AssessmentPool(high_water=2)
+    pool.start()
+    deadline = time.monotonic() + 10
+    while pool.metrics['generated'] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.metrics['generated'] == 2
+    assert pool.metrics['invalid'] == 2
+    assert AssessmentPool.satisfies_rules(pool.take())
+    assert AssessmentPool.satisfies_rules(pool.take())
@@ -0,0 +1,61 @@
+import math
+
+import pytest
+
+from build_optimizer import BuildOptimizer
+from pc_recommendations import load_compatibility, load_parts
+
+@pytest.fixture(scope='module')
+def catalog(catalog_path):
+    parts = load_parts(catalog_path)
+    compatibility = load_compatibility(catalog_path)
+    return parts, compatibility, BuildOptimizer(parts, compatibility)
+
+def chosen_parts(parts, build):
+    """The catalog parts behind an optimized build's entries"""
+    chosen = {}
+    for entry in build:
+        matches = [part for part in parts[entry['label']]
+                   if (part['value'], part['price']) == (entry['value'], entry['price'])]
+        assert matches, entry
+        chosen[entry['label']] = matches[0]
+    return chosen
+
+@pytest.mark.parametrize('budget', [600, 900, 1500, 3000, 10000])
+@pytest.mark.parametrize('use_case', ['', 'gaming', 'productivity'])
+def test_optimal_build_satisfies_the_constraints(catalog, budget, use_case):
+    parts, compatibility, optimizer = catalog
+    result = optimizer.optimize(budget, use_case)
+    assert result is not None
+    chosen = chosen_parts(parts, result['build'])
+
+    assert result['total'] <= budget
+    assert result['total'] == pytest.approx(sum(part['price'] for part in chosen.values()))
+
+    def ids(label):
+        return chosen[label]['part_id']
+    cpu_sockets = compatibility.sockets[ids('CPU')]
+    assert cpu_sockets & compatibility.sockets[ids('MOTHERBOARD')]
+    assert not chosen['FAN']['supported_socket'] or cpu_sockets & compatibility.sockets[ids('FAN')]
+
+    assert chosen['PSU']['wattage'] >= result['psu_min_wattage']
+    assert result['psu_min_wattage'] == compatibility.minimum_psu_wattage(
+        compatibility.watts[ids('CPU')], compatibility.watts[ids('GPU')])
+
+    case_boards = compatibility.form_factors[(ids('CASE'), 'board')]
+    case_psus = compatibility.form_factors[(ids('CASE'), 'psu')]
+    assert compatibility.form_factors[(ids('MOTHERBOARD'), 'board')] & case_boards
+    assert compatibility.form_factors[(ids('PSU'), 'psu')] & case_psus
+
+def test_larger_budgets_never_score_lower(catalog):
+    _, _, optimizer = catalog
+    scores = [optimizer.optimize(budget)['score'] for budget in (800, 1600, 3200)]
+    assert scores == sorted(scores)
+
+def test_too_small_a_budget_has_no_build(catalog):
+    assert catalog[2].optimize(50) is None
+
+@pytest.mark.parametrize('budget', [math.nan, math.inf, -1])
+def test_invalid_budgets_are_rejected(catalog, budget):
+    with pytest.raises(ValueError):
+        catalog[2].optimize(budget)
@@ -0,0 +1,46 @@
+import json
+import re
+import shutil
+import subprocess
+
+import pytest
+
+from pc_recommendations import PART_FIELDS, SCRAPER_DIR, BuildIndex, load_parts, recommend_build
+
+JS_ALGORITHM = SCRAPER_DIR.parent / 'services' / 'pcRecommendationAlgorithm.js'
+
+DRIVER = '''
+let input = '';
+process.stdin.on('data', chunk => { input += chunk; });
+process.stdin.on('end', () => {
+  const { partOptions, cases } = JSON.parse(input);
+  const builds = cases.map(([budget, useCase]) => recommendBuild(partOptions, budget, useCase));
+  process.stdout.write(JSON.stringify(builds));
+});
+'''
+BUDGETS = [0, 300, 550, 800, 1234.5, 2000, 5000]
+USE_CASES = ['', 'gaming', 'productivity']
+
+def js_builds(tmp_path, part_options, cases):
+    # The app imports part images from a React Native module; the algorithm only passes them through
+    source = re.sub(r'^import .*$', 'const partImages = {};', JS_ALGORITHM.read_text(encoding='utf-8'),
+                    count=1, flags=re.MULTILINE)
+    script = tmp_path / 'pcRecommendationAlgorithm.mjs'
+    script.write_text(source + DRIVER, encoding='utf-8')
+    result = subprocess.run(['node', str(script)], input=json.dumps({'partOptions': part_options, 'cases': cases}),
+                            capture_output=True, text=True, check=True, timeout=60)
+    return json.loads(result.stdout)
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='needs node to run the JS algorithm')
+def test_greedy_port_matches_the_app(tmp_path, catalog_path):
+    parts = load_parts(catalog_path)
+    part_options = {label: [{field: part[field] for field in PART_FIELDS} for part in options]
+                    for label, options in parts.items()}
+    cases = [[budget, use_case] for budget in BUDGETS for use_case in USE_CASES]
+    expected = js_builds(tmp_path, part_options, cases)
+
+    index = BuildIndex(parts)
+    for (budget, use_case), want in zip(cases, expected):
+        got = recommend_build(index, budget, use_case)
+        assert [(p['label'], p['value'], p['price']) for p in got] == \
+               [(p['label'], p['value'], p['price']) for p in want], (budget, use_case)
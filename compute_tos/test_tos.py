@@ -0,0 +1,225 @@
+import json
+import os
+import random
+
+import pytest
+
+import tos
+from tos import (BLOOM_ORDER, BloomDistributionRule, ChapterConfig, ChapterIndex, DifficultyProgressionRule,
+                 IndexedSelection, InfeasibleSelectionError, LocalSearchRefiner, MAX_SEED, NoDuplicateRule,
+                 QuestionBankCache, QuestionTypeBalanceRule, QuotaSelector, SummativeAssessmentGenerator,
+                 TimeFrameRule, generate_summative_assessment, seed_from_key)
+
+DISTRIBUTION = {'Knowledge': 0.30, 'Comprehension': 0.25, 'Application': 0.20,
+                'Analysis': 0.15, 'Synthesis': 0.05, 'Evaluation': 0.05}
+TYPES = ['multiple', 'identification', 'truefalse']
+
+def make_questions(per_cell: int = 4, blooms=BLOOM_ORDER, types=TYPES):
+    return [{'question': f'{bloom} {q_type} {i}', 'bloom': bloom, 'type': q_type, 'answer': 'a'}
+            for bloom in blooms for q_type in types for i in range(per_cell)]
+
+def chapter_rules(hours: int = 50):
+    return [BloomDistributionRule(DISTRIBUTION), QuestionTypeBalanceRule(), NoDuplicateRule(),
+            TimeFrameRule(hours), DifficultyProgressionRule()]
+
+def chapter_config(count: int = 20):
+    return ChapterConfig('chapter1', count, 50, 25.0, DISTRIBUTION)
+
+def test_quota_selection_satisfies_every_rule():
+    index = ChapterIndex('chapter1', make_questions())
+    rules = chapter_rules()
+    for seed in range(20):
+        selector = QuotaSelector(index, rules, rng=random.Random(seed))
+        ids = selector.select(20, DISTRIBUTION)
+        selected = index.resolve(ids)
+        assert len(set(ids)) == 20
+        assert index.statistics(ids)['bloom_distribution'] == {
+            'Knowledge': 6, 'Comprehension': 5, 'Application': 4, 'Analysis': 3, 'Synthesis': 1, 'Evaluation': 1}
+        for rule in rules:
+            assert rule.evaluate(selected, {'hours': 50})[0], rule.name
+
+def test_quota_selection_skips_excluded_texts():
+    questions = make_questions()
+    index = ChapterIndex('chapter1', questions)
+    excluded = {q['question'] for q in questions[::2]}
+    ids = QuotaSelector(index, chapter_rules(), excluded, random.Random(1)).select(20, DISTRIBUTION)
+    assert not excluded & {q['question'] for q in index.resolve(ids)}
+
+def test_too_few_questions_is_reported_infeasible():
+    index = ChapterIndex('chapter1', make_questions(per_cell=1)[:10])
+    with pytest.raises(InfeasibleSelectionError):
+        QuotaSelector(index, chapter_rules(), rng=random.Random(0)).select(20, DISTRIBUTION)
+
+    generator = SummativeAssessmentGenerator(seed=0)
+    generator.question_index = {'chapter1': index}
+    ids, info = generator._select_chapter_ids('chapter1', chapter_config())
+    assert ids == []
+    assert info['feasible'] is False
+    assert '10 distinct questions' in info['reason']
+
+def test_chapter_without_unused_questions_is_left_out():
+    questions = make_questions()
+    generator = SummativeAssessmentGenerator(seed=0)
+    generator.question_index = {'chapter1': ChapterIndex('chapter1', questions),
+                                'chapter2': ChapterIndex('chapter2', questions)}
+    # chapter2 shares chapter1's bank and needs more than the 52 texts chapter1 leaves over
+    generator.SUMMATIVE_CONFIG = {'chapter1': chapter_config(),
+                                  'chapter2': ChapterConfig('chapter2', 60, 50, 25.0, DISTRIBUTION)}
+    assessment = generator.generate_unified_assessment()
+    texts = [q['question'] for q in assessment['questions']]
+    assert len(texts) == len(set(texts)) == 20
+    assert assessment['chapter_breakdown']['chapter2']['count'] == 0
+    assert assessment['chapter_breakdown']['chapter2']['selection']['feasible'] is False
+
+def test_unbalanceable_types_fall_back_to_a_bounded_local_search():
+    # One question type only: the type balance rule can never pass
+    index = ChapterIndex('chapter1', make_questions(per_cell=6, types=['multiple']))
+    generator = SummativeAssessmentGenerator(seed=0)
+    generator.question_index = {'chapter1': index}
+    ids, info = generator._select_chapter_ids('chapter1', chapter_config())
+    assert len(ids) == 20
+    assert info['feasible'] is False
+    assert info['method'] == 'local_search'
+    assert 'QuestionTypeBalance' in info['failed_rules']
+    assert info['reason']
+    assert info['search']['swap_budget'] <= 100 * 20
+    assert info['search']['swaps_tried'] <= info['search']['swap_budget']
+
+def test_local_search_leaves_ordering_to_the_final_sort(monkeypatch):
+    searched = []
+    class RecordingRefiner(tos.LocalSearchRefiner):
+        def __init__(self, rules, *args, **kwargs):
+            searched.extend(rule.name for rule in rules)
+            super().__init__(rules, *args, **kwargs)
+    monkeypatch.setattr(tos, 'LocalSearchRefiner', RecordingRefiner)
+
+    index = ChapterIndex('chapter1', make_questions(per_cell=6, types=['multiple']))
+    generator = SummativeAssessmentGenerator(seed=0)
+    generator.question_index = {'chapter1': index}
+    ids, info = generator._select_chapter_ids('chapter1', chapter_config())
+    assert info['method'] == 'local_search'
+    assert 'DifficultyProgression' not in searched
+    assert 'DifficultyProgression' not in info['failed_rules']
+
+def test_refiner_stops_at_its_time_budget():
+    questions = make_questions(per_cell=6, types=['multiple'])
+    refiner = LocalSearchRefiner(chapter_rules(), {'hours': 50}, rng=random.Random(0),
+                                 swaps_per_question=10**6, time_budget=0.0)
+    _, search = refiner.refine(questions[:20], questions)
+    assert search['timed_out'] is True
+    assert search['swaps_tried'] < search['swap_budget']
+
+RULES = [
+    lambda: BloomDistributionRule(DISTRIBUTION),
+    QuestionTypeBalanceRule,
+    NoDuplicateRule,
+    lambda: TimeFrameRule(1),
+    DifficultyProgressionRule,
+]
+
+@pytest.mark.parametrize('make_rule', RULES)
+def test_index_array_checks_match_evaluate(make_rule):
+    rng = random.Random(3)
+    # Two chapters sharing some texts, so duplicates span indexes
+    repeated = [dict(q, question=f"q{i % 30}") for i, q in enumerate(make_questions(per_cell=3))]
+    first = ChapterIndex('chapter1', repeated)
+    second = ChapterIndex('chapter2', make_questions(per_cell=2))
+    for _ in range(50):
+        parts = [(first, rng.sample(first.all_ids, 10)), (second, rng.sample(second.all_ids, 8))]
+        selection = IndexedSelection(parts)
+        questions = [q for index, ids in parts for q in index.resolve(ids)]
+        if rng.random() < 0.5:
+            selection.sort_by_difficulty()
+            questions.sort(key=lambda q: BLOOM_ORDER.index(q['bloom']))
+        assert selection.questions() == questions
+        rule, reference = make_rule(), make_rule()
+        assert rule.evaluate_selection(selection, {'hours': 1}) == reference.evaluate(questions, {'hours': 1})
+        assert rule.penalty() == pytest.approx(reference.penalty())
+
+@pytest.mark.parametrize('make_rule', RULES)
+def test_incremental_updates_match_evaluate(make_rule):
+    rng = random.Random(7)
+    # Repeated texts so NoDuplicateRule sees duplicates come and go
+    pool = [dict(q, question=f"q{i % 25}") for i, q in enumerate(make_questions(per_cell=3))]
+    rule, reference = make_rule(), make_rule()
+    current = rng.sample(pool, 12)
+    rule.reset(current, {'hours': 1})
+
+    for _ in range(500):
+        action = rng.choice(['add', 'remove', 'swap', 'swap_at'])
+        if action == 'add' or len(current) < 2:
+            question = rng.choice(pool)
+            rule.add(question)
+            current.append(question)
+        elif action == 'remove':
+            question = rng.choice(current)
+            rule.remove(question)
+            current.remove(question)
+        else:
+            position = rng.randrange(len(current))
+            old, new = current[position], rng.choice(pool)
+            if action == 'swap_at':
+                rule.swap(old, new, position)
+            else:
+                rule.swap(old, new)
+                position = current.index(old)
+            current[position] = new
+
+        assert rule.check() == reference.evaluate(current, {'hours': 1})
+        assert rule.penalty() == pytest.approx(reference.penalty())
+
+def write_bank(directory, questions):
+    for file_name in tos.QUESTION_BANK_FILES:
+        (directory / file_name).write_text(json.dumps(questions), encoding='utf-8')
+
+def test_bank_stays_cached_until_a_file_changes(tmp_path):
+    write_bank(tmp_path, make_questions(per_cell=1))
+    cache = QuestionBankCache(tmp_path, check_interval=0)
+    bank = cache.get()
+    assert cache.counters['loads'] == 3
+
+    assert cache.get() is bank
+    path = tmp_path / 'chapter_1_Bloom.json'
+    stat = path.stat()
+    # Touched without a content change: the parsed questions are kept
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.get() is bank
+    assert cache.counters['unchanged_content'] == 1
+    assert cache.counters['reloads'] == 0
+
+    version = cache.version
+    path.write_text(json.dumps(make_questions(per_cell=2)), encoding='utf-8')
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert len(cache.get()['chapter1']) == 36
+    assert cache.counters['reloads'] == 1
+    assert cache.version != version
+
+def test_bank_is_rechecked_at_most_once_per_interval(tmp_path):
+    write_bank(tmp_path, make_questions(per_cell=1))
+    cache = QuestionBankCache(tmp_path, check_interval=3600)
+    cache.get()
+    (tmp_path / 'chapter_1_Bloom.json').write_text('[]', encoding='utf-8')
+    assert len(cache.get()['chapter1']) == 18
+    assert cache.counters['checks'] == 1
+    cache.invalidate()
+    assert cache.get()['chapter1'] == []
+
+def test_seeded_generation_is_reproducible():
+    first = SummativeAssessmentGenerator(seed=42).generate_unified_assessment()
+    second = SummativeAssessmentGenerator(seed=42).generate_unified_assessment()
+    other = SummativeAssessmentGenerator(seed=43).generate_unified_assessment()
+    assert first['questions'] == second['questions']
+    assert first['metadata']['id'] == second['metadata']['id']
+    assert first['questions'] != other['questions']
+
+    assert generate_summative_assessment(key='student-7') is generate_summative_assessment(key='student-7')
+    assert 0 <= seed_from_key('student-7') <= MAX_SEED
+
+@pytest.mark.parametrize('mode', ['random', '', 'RULES'])
+def test_unknown_modes_are_rejected(mode):
+    with pytest.raises(ValueError, match='mode must be one of'):
+        generate_summative_assessment(mode)
+    with pytest.raises(ValueError):
+        generate_summative_assessment(mode, seed=1)
+    with pytest.raises(ValueError):
+        SummativeAssessmentGenerator(seed=1).generate_unified_assessment(mode)
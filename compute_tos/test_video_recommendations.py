@@ -0,0 +1,65 @@
+import json
+import threading
+
+import pytest
+
+from build_video_index import build_index, load_questions, question_topics
+from video_recommendations import VideoIndex, VideoRecommender, normalize_query
+
+def failing_backend(query, limit):
+    raise AssertionError(f"live search for {query!r}")
+
+@pytest.fixture(scope='module')
+def index_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp('videos') / 'video_index.json'
+    build_index(path, 'stub', limit=5, workers=4)
+    return path
+
+def test_wrong_answers_query_is_served_from_the_index(index_path):
+    questions = [q for q in load_questions() if q['chapter'] == 'chapter1'][:4]
+    # QuizAnswering.js joins the questions answered wrong with spaces
+    query = ' '.join(q['question'] for q in questions)
+    recommender = VideoRecommender(backend=failing_backend, index=VideoIndex(index_path))
+
+    videos = recommender.recommend(query, limit=5)
+
+    topics = question_topics()
+    assert len(videos) == 5
+    assert any(topic in videos[0]['title'].lower()
+               for topic in {topics[normalize_query(q['question'])] for q in questions})
+    assert recommender.index.counters['topic_hits'] == 1
+    assert recommender.counters['backend_calls'] == 0
+
+def test_index_keys_are_lesson_topics(index_path):
+    data = json.loads(index_path.read_text(encoding='utf-8'))
+    assert 'pc assembly components' in data['entries']
+    assert 'identifying rams' in data['entries']
+    assert set(data['questions'].values()) <= set(data['entries'])
+
+def test_unknown_query_goes_live(index_path):
+    recommender = VideoRecommender(backend=lambda query, limit: [{'id': query}] * limit,
+                                   index=VideoIndex(index_path))
+    assert recommender.recommend('how to overclock a gpu', limit=2) == [{'id': 'how to overclock a gpu'}] * 2
+    assert recommender.counters['backend_calls'] == 1
+
+def test_identical_live_queries_share_one_search():
+    release, calls = threading.Event(), []
+    def blocked_backend(query, limit):
+        calls.append(query)
+        release.wait(5)
+        return [{'id': query}]
+    recommender = VideoRecommender(backend=blocked_backend)
+
+    first = recommender.recommend_async('Install a PSU')
+    second = recommender.recommend_async('  install a psu ')
+    other = recommender.recommend_async('install a psu', limit=3)
+    release.set()
+
+    assert second is first
+    assert first.result(5) == [{'id': 'Install a PSU'}]
+    other.result(5)
+    assert sorted(calls) == ['Install a PSU', 'install a psu']
+    assert recommender.counters['coalesced'] == 1
+    # Finished searches are answered from the cache
+    assert recommender.recommend('install a psu') == [{'id': 'Install a PSU'}]
+    assert len(calls) == 2
@@ -1,10 +1,48 @@
 import json
 import random
+import sys
+import hashlib
+import threading
+import time
+from array import array
 from datetime import datetime
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Iterable, Sequence, Tuple
 from enum import Enum
 from pathlib import Path
 from dataclasses import dataclass
+from ttl_cache import TTLCache
+
+DEFAULT_QUESTION_BANK_PATH = Path(__file__).resolve().parent.parent / 'assets' / 'question_bank'
+
+# Map file names to chapter IDs
+QUESTION_BANK_FILES = {
+    'chapter_1_Bloom.json': 'chapter1',
+    'chapter_2_Bloom.json': 'chapter2',
+    'chapter_3_Bloom.json': 'chapter3'
+}
+
+REQUIRED_QUESTION_FIELDS = ['question', 'type', 'bloom', 'answer']
+
+# 'rules' fills Bloom quotas under the chapter rules; 'shuffle' is the legacy random slice
+GENERATION_MODES = ('rules', 'shuffle')
+
+BLOOM_ORDER = ['Knowledge', 'Comprehension', 'Application', 'Analysis', 'Synthesis', 'Evaluation']
+
+# Estimated minutes per question type, scaled by Bloom level
+BASE_TIME_MINUTES = {
+    'multiple': 2.0,
+    'fill': 2.5,
+    'truefalse': 1.0
+}
+
+BLOOM_TIME_MULTIPLIER = {
+    'Knowledge': 1.0,
+    'Comprehension': 1.2,
+    'Application': 1.5,
+    'Analysis': 2.0,
+    'Synthesis': 2.5,
+    'Evaluation': 3.0
+}
 
 class BloomLevel(Enum):
     """Bloom's taxonomy levels"""
@@ -31,34 +69,101 @@ class ChapterConfig:
     bloom_distribution: Dict[str, float]
 
 class AssessmentRule:
-    """Base rule for assessment generation"""
+    """Base rule for assessment generation.
+
+    Besides the one-shot `evaluate`, rules support incremental evaluation:
+    `reset` loads a selection, `add`/`remove`/`swap` update it and `check`/
+    `penalty` report on the current state. The base implementation simply
+    re-evaluates; the built-in rules keep running counters so each update is O(1).
+    `load` sets the same counters from an IndexedSelection's arrays, for a
+    one-off `check` that never touches the question dicts.
+    """
     def __init__(self, name: str):
         self.name = name
+        self._questions: List[Dict] = []
+        self._context: Dict = {}
     
     def evaluate(self, questions: List[Dict], context: Dict) -> Tuple[bool, str]:
         raise NotImplementedError
 
+    def reset(self, questions: List[Dict], context: Dict):
+        """Start incremental evaluation from `questions`"""
+        self._questions = list(questions)
+        self._context = context
+
+    def load(self, selection: 'IndexedSelection', context: Dict):
+        """State for `check`/`penalty` from the index arrays; `reset` before any incremental update"""
+        self.reset(selection.questions(), context)
+
+    def evaluate_selection(self, selection: 'IndexedSelection', context: Dict) -> Tuple[bool, str]:
+        self.load(selection, context)
+        return self.check()
+
+    def add(self, question: Dict):
+        self._questions.append(question)
+
+    def remove(self, question: Dict):
+        self._questions.remove(question)
+
+    def swap(self, old: Dict, new: Dict, position: int = None):
+        """Replace `old` (at `position`, if known) with `new`"""
+        if position is None:
+            position = self._questions.index(old)
+        self._questions[position] = new
+
+    def check(self) -> Tuple[bool, str]:
+        """Evaluate the current incremental state"""
+        return self.evaluate(self._questions, self._context)
+
+    def penalty(self) -> float:
+        """How far the current state is from passing; 0 when it passes"""
+        return 0.0 if self.check()[0] else 1.0
+
 class BloomDistributionRule(AssessmentRule):
     """Ensures proper distribution of Bloom's levels with tolerance"""
     def __init__(self, target_distribution: Dict[str, float], tolerance: float = 0.12):
         super().__init__("BloomDistribution")
         self.target_distribution = target_distribution
         self.tolerance = tolerance
+        self._bloom_counts: Dict[str, int] = {}
+        self._total = 0
     
     def evaluate(self, questions: List[Dict], context: Dict) -> Tuple[bool, str]:
-        if not questions:
-            return False, "No questions provided"
-        
-        bloom_counts = {}
+        self.reset(questions, context)
+        return self.check()
+
+    def reset(self, questions: List[Dict], context: Dict):
+        self._bloom_counts = {}
+        self._total = 0
         for q in questions:
-            bloom = q.get('bloom', 'Unknown')
-            bloom_counts[bloom] = bloom_counts.get(bloom, 0) + 1
+            self.add(q)
+
+    def load(self, selection: 'IndexedSelection', context: Dict):
+        self._bloom_counts = dict(selection.bloom_counts)
+        self._total = len(selection)
+
+    def add(self, question: Dict):
+        bloom = question.get('bloom', 'Unknown')
+        self._bloom_counts[bloom] = self._bloom_counts.get(bloom, 0) + 1
+        self._total += 1
+
+    def remove(self, question: Dict):
+        self._bloom_counts[question.get('bloom', 'Unknown')] -= 1
+        self._total -= 1
+
+    def swap(self, old: Dict, new: Dict, position: int = None):
+        self.remove(old)
+        self.add(new)
+
+    def check(self) -> Tuple[bool, str]:
+        if not self._total:
+            return False, "No questions provided"
         
-        total = len(questions)
+        total = self._total
         violations = []
         
         for bloom, target_ratio in self.target_distribution.items():
-            actual_count = bloom_counts.get(bloom, 0)
+            actual_count = self._bloom_counts.get(bloom, 0)
             actual_ratio = actual_count / total if total > 0 else 0
             
             if abs(actual_ratio - target_ratio) > self.tolerance:
@@ -70,100 +175,826 @@ class BloomDistributionRule(AssessmentRule):
             return False, f"Bloom distribution mismatch: {'; '.join(violations)}"
         return True, "Bloom distribution valid"
 
+    def penalty(self) -> float:
+        if not self._total:
+            return 1.0
+        excess = 0.0
+        for bloom, target_ratio in self.target_distribution.items():
+            deviation = abs(self._bloom_counts.get(bloom, 0) / self._total - target_ratio)
+            excess += max(0.0, deviation - self.tolerance)
+        return excess * self._total
+
 class QuestionTypeBalanceRule(AssessmentRule):
     """Ensures variety in question types"""
     def __init__(self, min_variety: float = 0.15):
         super().__init__("QuestionTypeBalance")
         self.min_variety = min_variety
+        self._type_counts: Dict[str, int] = {}
+        self._total = 0
     
     def evaluate(self, questions: List[Dict], context: Dict) -> Tuple[bool, str]:
-        if not questions:
-            return False, "No questions provided"
-        
-        type_counts = {}
+        self.reset(questions, context)
+        return self.check()
+
+    def reset(self, questions: List[Dict], context: Dict):
+        self._type_counts = {}
+        self._total = 0
         for q in questions:
-            q_type = q.get('type', 'unknown')
-            type_counts[q_type] = type_counts.get(q_type, 0) + 1
+            self.add(q)
+
+    def load(self, selection: 'IndexedSelection', context: Dict):
+        self._type_counts = dict(selection.type_counts)
+        self._total = len(selection)
+
+    def add(self, question: Dict):
+        q_type = question.get('type', 'unknown')
+        self._type_counts[q_type] = self._type_counts.get(q_type, 0) + 1
+        self._total += 1
+
+    def remove(self, question: Dict):
+        self._type_counts[question.get('type', 'unknown')] -= 1
+        self._total -= 1
+
+    def swap(self, old: Dict, new: Dict, position: int = None):
+        self.remove(old)
+        self.add(new)
+
+    def check(self) -> Tuple[bool, str]:
+        if not self._total:
+            return False, "No questions provided"
         
-        total = len(questions)
-        max_single_type = max(type_counts.values()) if type_counts else 0
+        total = self._total
+        max_single_type = max(self._type_counts.values()) if self._type_counts else 0
         max_ratio = max_single_type / total if total > 0 else 0
         
         if max_ratio > (1 - self.min_variety):
             return False, f"Question type imbalance: {max_ratio*100:.1f}% of single type"
         return True, "Question type balance valid"
 
+    def penalty(self) -> float:
+        if not self._total:
+            return 1.0
+        max_single_type = max(self._type_counts.values())
+        return max(0.0, max_single_type - (1 - self.min_variety) * self._total)
+
 class NoDuplicateRule(AssessmentRule):
     """Ensures no duplicate questions"""
     def __init__(self):
         super().__init__("NoDuplicate")
+        self._text_counts: Dict[str, int] = {}
+        self._duplicates = 0
     
     def evaluate(self, questions: List[Dict], context: Dict) -> Tuple[bool, str]:
-        question_texts = [q.get('question', '') for q in questions]
-        if len(question_texts) != len(set(question_texts)):
+        self.reset(questions, context)
+        return self.check()
+
+    def reset(self, questions: List[Dict], context: Dict):
+        self._text_counts = {}
+        self._duplicates = 0
+        for q in questions:
+            self.add(q)
+
+    def load(self, selection: 'IndexedSelection', context: Dict):
+        self._text_counts = dict(selection.text_counts)
+        self._duplicates = len(selection) - len(self._text_counts)
+
+    def add(self, question: Dict):
+        text = question.get('question', '')
+        count = self._text_counts.get(text, 0)
+        if count:
+            self._duplicates += 1
+        self._text_counts[text] = count + 1
+
+    def remove(self, question: Dict):
+        text = question.get('question', '')
+        count = self._text_counts[text] - 1
+        if count:
+            self._duplicates -= 1
+            self._text_counts[text] = count
+        else:
+            del self._text_counts[text]
+
+    def swap(self, old: Dict, new: Dict, position: int = None):
+        self.remove(old)
+        self.add(new)
+
+    def check(self) -> Tuple[bool, str]:
+        if self._duplicates:
             return False, "Duplicate questions found"
         return True, "No duplicates found"
 
+    def penalty(self) -> float:
+        return float(self._duplicates)
+
 class TimeFrameRule(AssessmentRule):
     """Validates assessment difficulty matches time frame"""
     def __init__(self, hours: int, margin: float = 0.85):
         super().__init__("TimeFrame")
         self.hours = hours
         self.margin = margin
+        # Running total in hundredths of a minute so incremental updates never drift
+        self._time_units = 0
     
     def evaluate(self, questions: List[Dict], context: Dict) -> Tuple[bool, str]:
-        estimated_time = self._calculate_time(questions)
+        self.reset(questions, context)
+        return self.check()
+
+    def reset(self, questions: List[Dict], context: Dict):
+        self._time_units = sum(self._units(q) for q in questions)
+
+    def load(self, selection: 'IndexedSelection', context: Dict):
+        self._time_units = selection.time_units
+
+    def add(self, question: Dict):
+        self._time_units += self._units(question)
+
+    def remove(self, question: Dict):
+        self._time_units -= self._units(question)
+
+    def swap(self, old: Dict, new: Dict, position: int = None):
+        self._time_units += self._units(new) - self._units(old)
+
+    def _units(self, question: Dict) -> int:
+        return round(self.question_time(question) * 100)
+
+    def check(self) -> Tuple[bool, str]:
+        estimated_time = self._time_units / 100
         max_allowed_minutes = self.hours * 60 * self.margin
         
         if estimated_time > max_allowed_minutes:
             return False, f"Time estimate {estimated_time:.0f}min exceeds {max_allowed_minutes:.0f}min"
         return True, f"Time estimate {estimated_time:.0f}min within limit"
-    
-    def _calculate_time(self, questions: List[Dict]) -> float:
-        """Calculate estimated time in minutes"""
-        estimated_time = 0
-        for q in questions:
-            bloom = q.get('bloom', 'Knowledge')
-            q_type = q.get('type', 'multiple')
-            
-            base_time = {
-                'multiple': 2.0,
-                'fill': 2.5,
-                'truefalse': 1.0
-            }.get(q_type, 2.0)
-            
-            bloom_multiplier = {
-                'Knowledge': 1.0,
-                'Comprehension': 1.2,
-                'Application': 1.5,
-                'Analysis': 2.0,
-                'Synthesis': 2.5,
-                'Evaluation': 3.0
-            }.get(bloom, 1.0)
-            
-            estimated_time += base_time * bloom_multiplier
-        
-        return estimated_time
+
+    def penalty(self) -> float:
+        return max(0.0, self._time_units / 100 - self.hours * 60 * self.margin)
+
+    @staticmethod
+    def question_time(question: Dict) -> float:
+        """Estimated minutes for a single question"""
+        base_time = BASE_TIME_MINUTES.get(question.get('type', 'multiple'), 2.0)
+        bloom_multiplier = BLOOM_TIME_MULTIPLIER.get(question.get('bloom', 'Knowledge'), 1.0)
+        return base_time * bloom_multiplier
 
 class DifficultyProgressionRule(AssessmentRule):
-    """Ensures questions progress from easy to difficult"""
+    """Ensures questions progress from easy to difficult.
+
+    Order matters here: `add` and `swap` with a position are O(1), while
+    `remove` and position-less swaps have to locate the question and are O(n).
+    """
     def __init__(self):
         super().__init__("DifficultyProgression")
+        self._values: List[int] = []
+        self._increasing = 0
     
     def evaluate(self, questions: List[Dict], context: Dict) -> Tuple[bool, str]:
-        if not questions:
+        self.reset(questions, context)
+        return self.check()
+
+    def reset(self, questions: List[Dict], context: Dict):
+        self._questions = list(questions)
+        self._values = [BLOOM_ORDER.index(q.get('bloom', 'Knowledge')) for q in questions]
+        self._count_increasing()
+
+    def load(self, selection: 'IndexedSelection', context: Dict):
+        self._values = list(selection.difficulty)
+        self._count_increasing()
+
+    def _count_increasing(self):
+        values = self._values
+        self._increasing = sum(1 for i in range(len(values)-1) if values[i] <= values[i+1])
+
+    def add(self, question: Dict):
+        value = BLOOM_ORDER.index(question.get('bloom', 'Knowledge'))
+        if self._values and self._values[-1] <= value:
+            self._increasing += 1
+        self._questions.append(question)
+        self._values.append(value)
+
+    def remove(self, question: Dict):
+        position = self._questions.index(question)
+        values = self._values
+        self._increasing -= self._pairs_at(position)
+        del self._questions[position]
+        del values[position]
+        if 0 < position < len(values) and values[position - 1] <= values[position]:
+            self._increasing += 1
+
+    def swap(self, old: Dict, new: Dict, position: int = None):
+        if position is None:
+            position = self._questions.index(old)
+        self._increasing -= self._pairs_at(position)
+        self._questions[position] = new
+        self._values[position] = BLOOM_ORDER.index(new.get('bloom', 'Knowledge'))
+        self._increasing += self._pairs_at(position)
+
+    def _pairs_at(self, position: int) -> int:
+        """Non-decreasing adjacent pairs touching `position`"""
+        values = self._values
+        count = 0
+        if position > 0 and values[position - 1] <= values[position]:
+            count += 1
+        if position + 1 < len(values) and values[position] <= values[position + 1]:
+            count += 1
+        return count
+
+    def _ratio(self) -> float:
+        pairs = len(self._values) - 1
+        return self._increasing / pairs if pairs > 0 else 1
+
+    def check(self) -> Tuple[bool, str]:
+        if not self._values:
             return False, "No questions provided"
         
-        bloom_order = ['Knowledge', 'Comprehension', 'Application', 'Analysis', 'Synthesis', 'Evaluation']
-        bloom_values = [bloom_order.index(q.get('bloom', 'Knowledge')) for q in questions]
-        
-        increasing_count = sum(1 for i in range(len(bloom_values)-1) if bloom_values[i] <= bloom_values[i+1])
-        increasing_ratio = increasing_count / (len(bloom_values) - 1) if len(bloom_values) > 1 else 1
+        increasing_ratio = self._ratio()
         
         if increasing_ratio >= 0.6:
             return True, f"Difficulty progression valid ({increasing_ratio*100:.0f}% non-decreasing)"
         return False, f"Insufficient difficulty progression ({increasing_ratio*100:.0f}%)"
 
+    def penalty(self) -> float:
+        if not self._values:
+            return 1.0
+        return max(0.0, 0.6 * (len(self._values) - 1) - self._increasing)
+
+class ChapterIndex:
+    """Integer-ID index of one chapter's questions, bucketed by Bloom level and type.
+
+    Per-question arrays hold the difficulty (position in BLOOM_ORDER), Bloom
+    and type codes (into `blooms` and `types`), estimated minutes and text,
+    so selections are checked and summarized without the question dicts.
+    """
+    def __init__(self, chapter_id: str, questions: List[Dict]):
+        self.chapter_id = chapter_id
+        self.questions = questions
+        self.all_ids = array('I', range(len(questions)))
+        self.difficulty = array('B')
+        self.time_cost = array('d')
+        self.blooms: List[str] = []
+        self.bloom_code = array('B')
+        self.types: List[str] = []
+        self.type_code = array('B')
+        self.texts: List[str] = []
+        bloom_codes: Dict[str, int] = {}
+        type_codes: Dict[str, int] = {}
+        self.by_bloom: Dict[str, array] = {}
+        self.by_type: Dict[str, array] = {}
+        self.by_bloom_type: Dict[Tuple[str, str], array] = {}
+        # Same buckets, keeping only the first occurrence of each question text
+        self.unique_by_bloom_type: Dict[Tuple[str, str], array] = {}
+        seen_texts = set()
+
+        for qid, q in enumerate(questions):
+            bloom = q.get('bloom', 'Knowledge')
+            q_type = q.get('type', 'multiple')
+            text = q.get('question', '')
+            self.difficulty.append(BLOOM_ORDER.index(bloom) if bloom in BLOOM_ORDER else 0)
+            self.time_cost.append(TimeFrameRule.question_time(q))
+            if bloom not in bloom_codes:
+                bloom_codes[bloom] = len(self.blooms)
+                self.blooms.append(bloom)
+            if q_type not in type_codes:
+                type_codes[q_type] = len(self.types)
+                self.types.append(q_type)
+            self.bloom_code.append(bloom_codes[bloom])
+            self.type_code.append(type_codes[q_type])
+            self.texts.append(text)
+            self.by_bloom.setdefault(bloom, array('I')).append(qid)
+            self.by_type.setdefault(q_type, array('I')).append(qid)
+            self.by_bloom_type.setdefault((bloom, q_type), array('I')).append(qid)
+            if text not in seen_texts:
+                seen_texts.add(text)
+                self.unique_by_bloom_type.setdefault((bloom, q_type), array('I')).append(qid)
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def resolve(self, ids) -> List[Dict]:
+        """Map question IDs back to question dicts"""
+        questions = self.questions
+        return [questions[i] for i in ids]
+
+    def sort_by_difficulty(self, ids) -> List[int]:
+        """Order IDs from easiest to hardest Bloom level (stable)"""
+        return sorted(ids, key=self.difficulty.__getitem__)
+
+    def estimated_time(self, ids) -> float:
+        time_cost = self.time_cost
+        return sum(time_cost[i] for i in ids)
+
+    def statistics(self, ids) -> Dict[str, Dict[str, int]]:
+        """Bloom and type counts for a selection"""
+        selection = IndexedSelection([(self, ids)])
+        return {
+            'bloom_distribution': selection.bloom_counts,
+            'type_distribution': selection.type_counts
+        }
+
+class IndexedSelection:
+    """Questions picked from one or more ChapterIndexes, summarized from the index arrays.
+
+    Rules `load` the counts directly, and the question dicts are only resolved
+    for the final output.
+    """
+    def __init__(self, parts: Iterable[Tuple[ChapterIndex, Sequence[int]]] = ()):
+        self.entries: List[Tuple[ChapterIndex, int]] = []
+        self.difficulty = array('B')
+        self.bloom_counts: Dict[str, int] = {}
+        self.type_counts: Dict[str, int] = {}
+        self.text_counts: Dict[str, int] = {}
+        # Estimated time in hundredths of a minute, as TimeFrameRule counts it
+        self.time_units = 0
+        for index, ids in parts:
+            self.extend(index, ids)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def extend(self, index: ChapterIndex, ids: Sequence[int]):
+        difficulty, bloom_code, type_code = index.difficulty, index.bloom_code, index.type_code
+        texts, time_cost = index.texts, index.time_cost
+        blooms = [0] * len(index.blooms)
+        types = [0] * len(index.types)
+        text_counts = self.text_counts
+        for i in ids:
+            self.entries.append((index, i))
+            self.difficulty.append(difficulty[i])
+            blooms[bloom_code[i]] += 1
+            types[type_code[i]] += 1
+            text_counts[texts[i]] = text_counts.get(texts[i], 0) + 1
+            self.time_units += round(time_cost[i] * 100)
+        for code, count in enumerate(blooms):
+            if count:
+                bloom = index.blooms[code]
+                self.bloom_counts[bloom] = self.bloom_counts.get(bloom, 0) + count
+        for code, count in enumerate(types):
+            if count:
+                q_type = index.types[code]
+                self.type_counts[q_type] = self.type_counts.get(q_type, 0) + count
+
+    def sort_by_difficulty(self):
+        """Order from easiest to hardest Bloom level, keeping the current order within a level"""
+        order = sorted(range(len(self.entries)), key=self.difficulty.__getitem__)
+        self.entries = [self.entries[k] for k in order]
+        self.difficulty = array('B', (self.difficulty[k] for k in order))
+
+    def questions(self) -> List[Dict]:
+        return [index.questions[i] for index, i in self.entries]
+
+    def statistics(self) -> Dict[str, Any]:
+        total = len(self.entries)
+        minutes = self.time_units / 100
+        return {
+            'bloom_distribution': dict(self.bloom_counts),
+            'bloom_percentage': {k: round((v/total)*100, 2) for k, v in self.bloom_counts.items()},
+            'type_distribution': dict(self.type_counts),
+            'type_percentage': {k: round((v/total)*100, 2) for k, v in self.type_counts.items()},
+            'total_questions': total,
+            'estimated_duration_minutes': round(minutes, 2),
+            'estimated_duration_hours': round(minutes / 60, 2)
+        }
+
+class InfeasibleSelectionError(Exception):
+    """Raised when no selection can satisfy every assessment rule"""
+
+class QuotaSelector:
+    """Builds a rule-satisfying selection directly instead of retrying random samples.
+
+    A question's estimated time depends only on its (Bloom, type) cell, so the
+    Bloom quotas, type balance and time budget reduce to a small transportation
+    problem over at most 6 x 3 cells. Duplicates are excluded up front and the
+    final ordering satisfies the difficulty progression by construction.
+    """
+    def __init__(self, index: ChapterIndex, rules: List[AssessmentRule], exclude_texts: set = None,
+                 rng: random.Random = None):
+        self.index = index
+        self.rng = rng or random.Random()
+        self.rules = rules
+        self.min_variety = None
+        self.time_budget = None
+        for rule in rules:
+            if isinstance(rule, QuestionTypeBalanceRule):
+                self.min_variety = rule.min_variety
+            elif isinstance(rule, TimeFrameRule):
+                budget = rule.hours * 60 * rule.margin
+                self.time_budget = budget if self.time_budget is None else min(self.time_budget, budget)
+
+        # Candidate IDs per (bloom, type) cell
+        self.cells: Dict[Tuple[str, str], List[int]] = {}
+        for cell, ids in index.unique_by_bloom_type.items():
+            if exclude_texts:
+                ids = [i for i in ids if index.texts[i] not in exclude_texts]
+            if ids:
+                self.cells[cell] = ids
+
+    def select(self, count: int, bloom_distribution: Dict[str, float]) -> List[int]:
+        """Return `count` question IDs ordered by difficulty, or raise InfeasibleSelectionError"""
+        available = sum(len(ids) for ids in self.cells.values())
+        if available < count:
+            raise InfeasibleSelectionError(
+                f"Only {available} distinct questions available, {count} required"
+            )
+
+        quotas = self._bloom_quotas(count, bloom_distribution)
+        type_cap = self._type_cap(count)
+        allocation = self._random_allocation(quotas, type_cap)
+
+        if self.time_budget is not None and self._allocation_time(allocation) > self.time_budget:
+            allocation = self._min_time_allocation(quotas, type_cap)
+            minimum = self._allocation_time(allocation)
+            if minimum > self.time_budget:
+                raise InfeasibleSelectionError(
+                    f"Fastest valid selection needs {minimum:.0f}min, budget is {self.time_budget:.0f}min"
+                )
+
+        selected = []
+        for cell, cell_count in allocation.items():
+            if cell_count:
+                selected.extend(self.rng.sample(self.cells[cell], cell_count))
+        return self.index.sort_by_difficulty(selected)
+
+    def candidate_ids(self) -> List[int]:
+        """Every ID the selector may use"""
+        return [i for ids in self.cells.values() for i in ids]
+
+    def _bloom_quotas(self, count: int, bloom_distribution: Dict[str, float]) -> Dict[str, int]:
+        """Largest-remainder quotas per Bloom level, capped by what the bank holds"""
+        capacity = {}
+        for (bloom, _), ids in self.cells.items():
+            capacity[bloom] = capacity.get(bloom, 0) + len(ids)
+
+        total_ratio = sum(bloom_distribution.values()) or 1.0
+        targets = {bloom: count * ratio / total_ratio for bloom, ratio in bloom_distribution.items()}
+        for bloom in capacity:
+            targets.setdefault(bloom, 0.0)
+
+        quotas = {bloom: min(int(target), capacity.get(bloom, 0)) for bloom, target in targets.items()}
+        # Hand out the remaining slots to the levels furthest below their target
+        while sum(quotas.values()) < count:
+            candidates = [b for b in targets if quotas[b] < capacity.get(b, 0)]
+            if not candidates:
+                raise InfeasibleSelectionError("Not enough questions to fill the Bloom quotas")
+            bloom = max(candidates, key=lambda b: targets[b] - quotas[b])
+            quotas[bloom] += 1
+        return quotas
+
+    def _type_cap(self, count: int) -> int:
+        """Largest per-type count QuestionTypeBalanceRule still accepts"""
+        if self.min_variety is None:
+            return count
+        limit = 1 - self.min_variety
+        cap = int(count * limit)
+        while cap > 0 and cap / count > limit:
+            cap -= 1
+        while cap < count and (cap + 1) / count <= limit:
+            cap += 1
+        return cap
+
+    def _random_allocation(self, quotas: Dict[str, int], type_cap: int) -> Dict[Tuple[str, str], int]:
+        """Place each Bloom slot in a random type, rerouting through augmenting paths when a type is full"""
+        allocation = {cell: 0 for cell in self.cells}
+        type_used: Dict[str, int] = {}
+
+        for bloom, quota in quotas.items():
+            for _ in range(quota):
+                open_cells = [
+                    (b, t) for (b, t) in self.cells
+                    if b == bloom and allocation[(b, t)] < len(self.cells[(b, t)])
+                    and type_used.get(t, 0) < type_cap
+                ]
+                if open_cells:
+                    weights = [len(self.cells[c]) - allocation[c] for c in open_cells]
+                    cell = self.rng.choices(open_cells, weights=weights)[0]
+                    allocation[cell] += 1
+                    type_used[cell[1]] = type_used.get(cell[1], 0) + 1
+                elif not self._augment(bloom, allocation, type_used, type_cap, set()):
+                    raise InfeasibleSelectionError(
+                        f"Cannot balance question types: at most {type_cap} of one type allowed"
+                    )
+        return allocation
+
+    def _augment(self, bloom: str, allocation: Dict[Tuple[str, str], int],
+                 type_used: Dict[str, int], type_cap: int, visited: set) -> bool:
+        """Place one `bloom` slot, moving other levels' questions to different types if needed"""
+        cells = [(b, t) for (b, t) in self.cells
+                 if b == bloom and t not in visited and allocation[(b, t)] < len(self.cells[(b, t)])]
+        for (b, t) in cells:
+            if type_used.get(t, 0) < type_cap:
+                allocation[(b, t)] += 1
+                type_used[t] = type_used.get(t, 0) + 1
+                return True
+        for (b, t) in cells:
+            if t in visited:
+                continue
+            visited.add(t)
+            for (other, other_type), placed in list(allocation.items()):
+                if other_type != t or placed == 0 or other == bloom:
+                    continue
+                allocation[(other, t)] -= 1
+                type_used[t] -= 1
+                if self._augment(other, allocation, type_used, type_cap, visited):
+                    allocation[(b, t)] += 1
+                    type_used[t] += 1
+                    return True
+                allocation[(other, t)] += 1
+                type_used[t] += 1
+        return False
+
+    def _min_time_allocation(self, quotas: Dict[str, int], type_cap: int) -> Dict[Tuple[str, str], int]:
+        """Minimum-time allocation via successive shortest paths (Bellman-Ford on the residual graph)"""
+        blooms = list(quotas)
+        types = sorted({t for (_, t) in self.cells})
+        cost = {cell: BASE_TIME_MINUTES.get(cell[1], 2.0) * BLOOM_TIME_MULTIPLIER.get(cell[0], 1.0)
+                for cell in self.cells}
+        allocation = {cell: 0 for cell in self.cells}
+        supply = dict(quotas)
+        type_used = {t: 0 for t in types}
+
+        for _ in range(sum(quotas.values())):
+            # Distances from the super-source: blooms with supply left start at 0
+            dist = {('b', b): (0.0 if supply[b] > 0 else float('inf')) for b in blooms}
+            dist.update({('t', t): float('inf') for t in types})
+            parent = {}
+            for _ in range(len(blooms) + len(types)):
+                updated = False
+                for (b, t), c in cost.items():
+                    if b not in supply:
+                        continue
+                    if allocation[(b, t)] < len(self.cells[(b, t)]) and dist[('b', b)] + c < dist[('t', t)]:
+                        dist[('t', t)] = dist[('b', b)] + c
+                        parent[('t', t)] = ('b', b)
+                        updated = True
+                    if allocation[(b, t)] > 0 and dist[('t', t)] - c < dist[('b', b)]:
+                        dist[('b', b)] = dist[('t', t)] - c
+                        parent[('b', b)] = ('t', t)
+                        updated = True
+                if not updated:
+                    break
+
+            sinks = [t for t in types if type_used[t] < type_cap and dist[('t', t)] < float('inf')]
+            if not sinks:
+                raise InfeasibleSelectionError(
+                    f"Cannot balance question types: at most {type_cap} of one type allowed"
+                )
+            node = ('t', min(sinks, key=lambda t: dist[('t', t)]))
+            type_used[node[1]] += 1
+            while node in parent:
+                prev = parent[node]
+                if prev[0] == 'b':
+                    allocation[(prev[1], node[1])] += 1
+                else:
+                    allocation[(node[1], prev[1])] -= 1
+                node = prev
+            supply[node[1]] -= 1
+        return allocation
+
+    def _allocation_time(self, allocation: Dict[Tuple[str, str], int]) -> float:
+        return sum(
+            placed * BASE_TIME_MINUTES.get(t, 2.0) * BLOOM_TIME_MULTIPLIER.get(b, 1.0)
+            for (b, t), placed in allocation.items()
+        )
+
+class LocalSearchRefiner:
+    """Polishes a near-valid selection by trying single-question swaps.
+
+    Uses the incremental rule API, so each attempted swap costs O(#rules)
+    instead of a full re-evaluation of the selection. It runs in the request
+    path, so the search tries at most `swaps_per_question` swaps per selected
+    question (never more than `max_swaps`) and stops after `time_budget`
+    seconds.
+    """
+    def __init__(self, rules: List[AssessmentRule], context: Dict = None, max_swaps: int = 20000,
+                 rng: random.Random = None, swaps_per_question: int = 100, time_budget: float = 0.05):
+        self.rules = rules
+        self.rng = rng or random.Random()
+        self.context = context or {}
+        self.max_swaps = max_swaps
+        self.swaps_per_question = swaps_per_question
+        self.time_budget = time_budget
+
+    def refine(self, selected: List[Dict], candidates: List[Dict]) -> Tuple[List[Dict], Dict]:
+        """Return the improved selection and search statistics"""
+        selected = list(selected)
+        rules = self.rules
+        for rule in rules:
+            rule.reset(selected, self.context)
+        current = sum(rule.penalty() for rule in rules)
+        in_selection = {id(q) for q in selected}
+
+        swaps = accepted = 0
+        budget = min(self.max_swaps, self.swaps_per_question * len(selected))
+        deadline = time.perf_counter() + self.time_budget
+        timed_out = False
+        if selected and candidates:
+            while current > 0 and swaps < budget:
+                # Checking the clock every swap would cost more than the swap itself
+                if swaps % 256 == 0 and swaps and time.perf_counter() > deadline:
+                    timed_out = True
+                    break
+                swaps += 1
+                position = self.rng.randrange(len(selected))
+                new = candidates[self.rng.randrange(len(candidates))]
+                if id(new) in in_selection:
+                    continue
+                old = selected[position]
+                for rule in rules:
+                    rule.swap(old, new, position)
+                penalty = sum(rule.penalty() for rule in rules)
+                if penalty <= current:
+                    # Sideways moves are accepted to walk across plateaus
+                    selected[position] = new
+                    in_selection.discard(id(old))
+                    in_selection.add(id(new))
+                    current = penalty
+                    accepted += 1
+                else:
+                    for rule in rules:
+                        rule.swap(new, old, position)
+
+        return selected, {
+            'swaps_tried': swaps,
+            'swaps_accepted': accepted,
+            'swap_budget': budget,
+            'timed_out': timed_out,
+            'penalty': round(current, 4),
+            'failed_rules': [rule.name for rule in rules if not rule.check()[0]]
+        }
+
+class QuestionBankCache:
+    """Process-wide question bank cache, reloaded only when a bank file changes"""
+    def __init__(self, base_path: str = None, check_interval: float = 1.0):
+        self.base_path = Path(base_path) if base_path else DEFAULT_QUESTION_BANK_PATH
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._snapshot: Tuple[Dict[str, List[Dict]], Dict[str, ChapterIndex]] = ({}, {})
+        self._last_check = None
+        self.counters = {
+            'requests': 0,
+            'checks': 0,
+            'loads': 0,
+            'reloads': 0,
+            'unchanged_content': 0,
+            'errors': 0
+        }
+
+    def get(self) -> Dict[str, List[Dict]]:
+        """Return the current question bank, re-checking the files at most once per interval"""
+        return self.snapshot()[0]
+
+    def get_index(self) -> Dict[str, ChapterIndex]:
+        """Return the per-chapter index of the current question bank"""
+        return self.snapshot()[1]
+
+    def snapshot(self) -> Tuple[Dict[str, List[Dict]], Dict[str, ChapterIndex]]:
+        """Return a consistent (bank, index) pair"""
+        self.counters['requests'] += 1
+        now = time.monotonic()
+        if self._last_check is None or now - self._last_check >= self.check_interval:
+            with self._lock:
+                if self._last_check is None or now - self._last_check >= self.check_interval:
+                    self._refresh()
+                    self._last_check = time.monotonic()
+        return self._snapshot
+
+    def invalidate(self):
+        """Force a file check on the next access"""
+        self._last_check = None
+
+    @property
+    def version(self) -> str:
+        """Combined content hash of every bank file"""
+        digest = hashlib.sha256()
+        for file_name in sorted(self._files):
+            digest.update(file_name.encode('utf-8'))
+            digest.update(self._files[file_name].get('sha256', '').encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    def stats(self) -> Dict[str, Any]:
+        """Report load and validation statistics"""
+        files = {}
+        for file_name, entry in self._files.items():
+            files[file_name] = {k: v for k, v in entry.items() if k != 'questions'}
+        return {
+            'base_path': str(self.base_path),
+            'version': self.version,
+            'counters': dict(self.counters),
+            'files': files
+        }
+
+    def _refresh(self):
+        self.counters['checks'] += 1
+        changed = False
+        for file_name, chapter_id in QUESTION_BANK_FILES.items():
+            if self._refresh_file(file_name, chapter_id):
+                changed = True
+        if changed or not self._snapshot[0]:
+            bank = {
+                chapter_id: self._files[file_name]['questions']
+                for file_name, chapter_id in QUESTION_BANK_FILES.items()
+            }
+            index = {
+                chapter_id: ChapterIndex(chapter_id, questions)
+                for chapter_id, questions in bank.items()
+            }
+            self._snapshot = (bank, index)
+
+    def _refresh_file(self, file_name: str, chapter_id: str) -> bool:
+        """Reload one file if its mtime or content hash changed; returns True when reloaded"""
+        file_path = self.base_path / file_name
+        entry = self._files.get(file_name)
+
+        try:
+            stat = file_path.stat()
+        except OSError:
+            if entry is not None and entry.get('error') == 'File not found':
+                return False
+            self.counters['errors'] += 1
+            self._files[file_name] = self._empty_entry(chapter_id, 'File not found')
+            return True
+
+        if entry is not None and entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('size') == stat.st_size:
+            return False
+
+        started = time.perf_counter()
+        try:
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+        except OSError as e:
+            self.counters['errors'] += 1
+            self._files[file_name] = self._empty_entry(chapter_id, str(e))
+            return True
+
+        content_hash = hashlib.sha256(raw).hexdigest()
+        if entry is not None and entry.get('sha256') == content_hash:
+            # Touched but not modified: keep the parsed questions
+            entry['mtime_ns'] = stat.st_mtime_ns
+            entry['size'] = stat.st_size
+            self.counters['unchanged_content'] += 1
+            return False
+
+        try:
+            questions = json.loads(raw.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            self.counters['errors'] += 1
+            if entry is not None and entry.get('questions'):
+                # Keep serving the last good version (e.g. file caught mid-write)
+                entry['mtime_ns'] = stat.st_mtime_ns
+                entry['size'] = stat.st_size
+                entry['error'] = f"Invalid JSON, serving previous version: {e}"
+                return False
+            self._files[file_name] = self._empty_entry(chapter_id, f"Invalid JSON: {e}")
+            return True
+
+        valid_questions = [
+            q for q in questions
+            if isinstance(q, dict)
+            and all(k in q for k in REQUIRED_QUESTION_FIELDS)
+            and str(q.get('question', '')).strip()
+        ]
+
+        self.counters['reloads' if entry is not None else 'loads'] += 1
+        self._files[file_name] = {
+            'chapter': chapter_id,
+            'path': str(file_path),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': content_hash,
+            'loaded_at': datetime.now().isoformat(),
+            'load_ms': round((time.perf_counter() - started) * 1000, 3),
+            'total_questions': len(questions),
+            'valid_questions': len(valid_questions),
+            'invalid_questions': len(questions) - len(valid_questions),
+            'error': None,
+            'questions': valid_questions
+        }
+        return True
+
+    def _empty_entry(self, chapter_id: str, error: str) -> Dict[str, Any]:
+        return {
+            'chapter': chapter_id,
+            'sha256': '',
+            'total_questions': 0,
+            'valid_questions': 0,
+            'invalid_questions': 0,
+            'error': error,
+            'questions': []
+        }
+
+_question_bank_caches: Dict[str, QuestionBankCache] = {}
+_question_bank_caches_lock = threading.Lock()
+
+def get_question_bank_cache(base_path: str = None) -> QuestionBankCache:
+    """Return the shared cache for a question bank directory"""
+    key = str(Path(base_path).resolve()) if base_path else str(DEFAULT_QUESTION_BANK_PATH)
+    cache = _question_bank_caches.get(key)
+    if cache is None:
+        with _question_bank_caches_lock:
+            cache = _question_bank_caches.get(key)
+            if cache is None:
+                cache = QuestionBankCache(key)
+                _question_bank_caches[key] = cache
+    return cache
+
 class SummativeAssessmentGenerator:
     """Rule-based system for generating ONE unified summative assessment"""
     
@@ -213,40 +1044,17 @@ class SummativeAssessmentGenerator:
         )
     }
     
-    def __init__(self, question_bank_path: str = None):
+    def __init__(self, question_bank_path: str = None, seed: Any = None):
+        self.seed = seed
+        self.rng = random.Random(seed)
         self.question_bank = {}
         self.load_question_bank(question_bank_path)
     
     def load_question_bank(self, base_path: str = None):
-        """Load all question bank files"""
-        if base_path is None:
-            base_path = r"c:\Users\domet\Desktop\comsmart\ComSmart\assets\question_bank"
-        
-        base_path = Path(base_path)
-        
-        # Map file names to chapter IDs
-        file_mapping = {
-            'chapter_1_Bloom.json': 'chapter1',
-            'chapter_2_Bloom.json': 'chapter2',
-            'chapter_3_Bloom.json': 'chapter3'
-        }
-        
-        files_found = 0
-        for file_name, chapter_id in file_mapping.items():
-            file_path = base_path / file_name
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    questions = json.load(f)
-                    valid_questions = [
-                        q for q in questions 
-                        if all(k in q for k in ['question', 'type', 'bloom', 'answer'])
-                        and q.get('question', '').strip()
-                    ]
-                    self.question_bank[chapter_id] = valid_questions
-                    files_found += 1
-            except (FileNotFoundError, json.JSONDecodeError):
-                self.question_bank[chapter_id] = []
-                
+        """Load all question bank files through the process-wide cache"""
+        cache = get_question_bank_cache(base_path)
+        self.question_bank, self.question_index = cache.snapshot()
+        self.bank_version = cache.version
 
     def _get_rules_for_assessment(self) -> List[AssessmentRule]:
         """Get rules for unified assessment"""
@@ -256,124 +1064,143 @@ class SummativeAssessmentGenerator:
             TimeFrameRule(150, margin=0.90),  
             DifficultyProgressionRule()
         ]
+
+    def _get_rules_for_chapter(self, config: ChapterConfig) -> List[AssessmentRule]:
+        """Get rules for one chapter's share of the assessment"""
+        return [
+            BloomDistributionRule(config.bloom_distribution),
+            NoDuplicateRule(),
+            QuestionTypeBalanceRule(min_variety=0.15),
+            TimeFrameRule(config.time_frame_hours, margin=0.90),
+            DifficultyProgressionRule()
+        ]
     
-    def select_questions_with_rules(self, chapter: str, config: ChapterConfig) -> Tuple[List[Dict], Dict]:
+    def select_questions_with_rules(self, chapter: str, config: ChapterConfig,
+                                    exclude_texts: set = None) -> Tuple[List[Dict], Dict]:
         """Select questions that satisfy rules for a specific chapter"""
-        available_questions = self.question_bank.get(chapter, [])
-        
-        if len(available_questions) < config.question_count:
-            return available_questions, {'warnings': f'Insufficient questions'}
+        selected_ids, info = self._select_chapter_ids(chapter, config, exclude_texts)
+        if not info['feasible']:
+            return [], info
+        return self.question_index[chapter].resolve(selected_ids), info
+
+    def _select_chapter_ids(self, chapter: str, config: ChapterConfig,
+                            exclude_texts: set = None) -> Tuple[List[int], Dict]:
+        index = self.question_index.get(chapter)
+        if index is None:
+            return [], {'feasible': False, 'reason': f'Unknown chapter {chapter}'}
         
-        rules = self._get_rules_for_assessment()
+        rules = self._get_rules_for_chapter(config)
         context = {'chapter': chapter, 'hours': config.time_frame_hours}
         
-        max_attempts = 100
-        best_selection = None
-        best_score = -1
+        selector = QuotaSelector(index, rules, exclude_texts, self.rng)
+        try:
+            selected_ids = selector.select(config.question_count, config.bloom_distribution)
+        except InfeasibleSelectionError as e:
+            return self._refine_chapter_ids(index, selector, config, rules, context, str(e))
         
-        for attempt in range(max_attempts):
-            selected = self._stratified_sample(
-                available_questions,
-                config.question_count,
-                config.bloom_distribution
-            )
-            
-            selected = sorted(selected, key=lambda x: self._bloom_difficulty(x.get('bloom', 'Knowledge')))
-            
-            violation_count = 0
-            for rule in rules:
-                passes, _ = rule.evaluate(selected, context)
-                if not passes:
-                    violation_count += 1
-            
-            score = -violation_count
-            if score > best_score:
-                best_score = score
-                best_selection = selected
-            
-            if violation_count == 0:
-                return selected, {'attempts': attempt + 1, 'violations': 0}
+        selection = IndexedSelection([(index, selected_ids)])
+        failed = [rule.name for rule in rules if not rule.evaluate_selection(selection, context)[0]]
         
-        return best_selection, {
-            'attempts': max_attempts,
-            'violations': -best_score
+        return selected_ids, {
+            'feasible': True,
+            'method': 'quota',
+            'violations': len(failed),
+            'failed_rules': failed,
+            'estimated_minutes': round(index.estimated_time(selected_ids), 2)
         }
-    
-    def _stratified_sample(self, questions: List[Dict], target_count: int, 
-                          bloom_distribution: Dict[str, float]) -> List[Dict]:
-        """Sample questions maintaining Bloom distribution"""
-        bloom_groups = {}
-        for q in questions:
-            bloom = q.get('bloom', 'Knowledge')
-            if bloom not in bloom_groups:
-                bloom_groups[bloom] = []
-            bloom_groups[bloom].append(q)
+
+    def _refine_chapter_ids(self, index: ChapterIndex, selector: QuotaSelector, config: ChapterConfig,
+                            rules: List[AssessmentRule], context: Dict, reason: str) -> Tuple[List[int], Dict]:
+        """Exact quotas are infeasible: search the rule tolerances with local swaps instead"""
+        candidate_ids = selector.candidate_ids()
+        if len(candidate_ids) < config.question_count:
+            return [], {'feasible': False, 'reason': reason}
         
-        selected = []
-        for bloom, target_ratio in bloom_distribution.items():
-            target_count_for_bloom = round(target_count * target_ratio)
-            available = bloom_groups.get(bloom, [])
-            
-            if available:
-                sampled = random.sample(
-                    available,
-                    min(target_count_for_bloom, len(available))
-                )
-                selected.extend(sampled)
+        position_of = {id(index.questions[i]): i for i in candidate_ids}
+        start = index.resolve(self.rng.sample(candidate_ids, config.question_count))
+        # The result is sorted by difficulty below, which settles the progression rule,
+        # so swaps only need to fix the order-independent rules
+        search_rules = [rule for rule in rules if not isinstance(rule, DifficultyProgressionRule)]
+        refiner = LocalSearchRefiner(search_rules, context, rng=self.rng)
+        refined, search = refiner.refine(start, index.resolve(candidate_ids))
+        selected_ids = index.sort_by_difficulty([position_of[id(q)] for q in refined])
         
-        if len(selected) < target_count:
-            remaining = [q for q in questions if q not in selected]
-            additional = random.sample(
-                remaining,
-                min(target_count - len(selected), len(remaining))
-            )
-            selected.extend(additional)
-        
-        return selected[:target_count]
-    
-    def _bloom_difficulty(self, bloom: str) -> int:
-        """Get difficulty order of Bloom level"""
-        order = {
-            'Knowledge': 0,
-            'Comprehension': 1,
-            'Application': 2,
-            'Analysis': 3,
-            'Synthesis': 4,
-            'Evaluation': 5
+        selection = IndexedSelection([(index, selected_ids)])
+        failed = [rule.name for rule in rules if not rule.evaluate_selection(selection, context)[0]]
+        info = {
+            'feasible': not failed,
+            'method': 'local_search',
+            'violations': len(failed),
+            'failed_rules': failed,
+            'search': search,
+            'estimated_minutes': round(index.estimated_time(selected_ids), 2)
         }
-        return order.get(bloom, 0)
+        if failed:
+            info['reason'] = reason
+        return selected_ids, info
     
-    def generate_unified_assessment(self) -> Dict[str, Any]:
-        """Generate ONE unified summative assessment with all chapters"""
-        all_questions = []
+    def generate_unified_assessment(self, mode: str = 'rules') -> Dict[str, Any]:
+        """Generate ONE unified summative assessment with all chapters.
+
+        mode='rules' fills each chapter's Bloom quotas under the chapter rules;
+        mode='shuffle' is the legacy random slice per chapter.
+        """
+        if mode not in GENERATION_MODES:
+            raise ValueError(f"mode must be one of {', '.join(GENERATION_MODES)}, got {mode!r}")
+        selection = IndexedSelection()
         chapter_selections = {}
         total_marks = 0
+        used_texts = set()
         
         for chapter, config in self.SUMMATIVE_CONFIG.items():
-            available_questions = self.question_bank.get(chapter, [])
+            index = self.question_index.get(chapter)
             
-            if not available_questions:
+            if not index:
                 continue
             
-            shuffled_questions = available_questions.copy()
-            random.shuffle(shuffled_questions)
-            selected_questions = shuffled_questions[:config.question_count]
+            selection_info = None
+            if mode == 'rules':
+                selected_ids, selection_info = self._select_chapter_ids(chapter, config, used_texts)
+                if not selected_ids:
+                    # Nothing that passes the chapter rules; leave the chapter out rather than
+                    # filling it with unchecked (possibly repeated) questions
+                    print(f"{chapter}: {selection_info['reason']}, chapter left out", file=sys.stderr)
+                    chapter_selections[chapter] = {'count': 0, 'selection': selection_info}
+                    continue
+                if not selection_info['feasible']:
+                    print(f"{chapter}: {selection_info['reason']}, using best-effort selection", file=sys.stderr)
+            else:
+                selected_ids = self.rng.sample(index.all_ids, min(config.question_count, len(index)))
             
-            if selected_questions:
-                all_questions.extend(selected_questions)
+            if selected_ids:
+                selection.extend(index, selected_ids)
+                used_texts.update(index.texts[i] for i in selected_ids)
                 chapter_selections[chapter] = {
-                    'count': len(selected_questions),
-                    'statistics': self._calculate_chapter_stats(selected_questions)
+                    'count': len(selected_ids),
+                    'statistics': index.statistics(selected_ids)
                 }
-                total_marks += len(selected_questions)
+                if selection_info is not None:
+                    chapter_selections[chapter]['selection'] = selection_info
+                total_marks += len(selected_ids)
         
-        all_questions = sorted(all_questions, key=lambda x: self._bloom_difficulty(x.get('bloom', 'Knowledge')))
+        selection.sort_by_difficulty()
+        all_questions = selection.questions()
         
-        overall_stats = self._calculate_statistics(all_questions)
+        overall_stats = selection.statistics()
+        overall_stats['rule_checks'] = {
+            rule.name: rule.evaluate_selection(selection, {'hours': 150})[0]
+            for rule in self._get_rules_for_assessment()
+        }
+        
+        if self.seed is None:
+            assessment_id = f"summative_assessment_{datetime.now().strftime('%Y%m%d_%H%M%S%f')}"
+        else:
+            # Reproducible exams get a reproducible id
+            assessment_id = f"summative_assessment_{seed_fingerprint(self.seed)}_{self.bank_version}"
         
         assessment = {
             'metadata': {
-                'id': f"summative_assessment_{datetime.now().strftime('%Y%m%d_%H%M%S%f')}",
+                'id': assessment_id,
                 'title': 'Comprehensive Summative Assessment',
                 'assessment_type': 'Unified',
                 'created_at': datetime.now().isoformat(),
@@ -381,7 +1208,10 @@ class SummativeAssessmentGenerator:
                 'total_marks': total_marks,
                 'timeframe_hours': 150,
                 'estimated_duration_hours': 2.5,
-                'chapters_included': list(self.SUMMATIVE_CONFIG.keys())
+                'chapters_included': list(self.SUMMATIVE_CONFIG.keys()),
+                'generation_mode': mode,
+                'seed': self.seed,
+                'bank_version': self.bank_version
             },
             'chapter_breakdown': chapter_selections,
             'questions': all_questions,
@@ -420,58 +1250,43 @@ class SummativeAssessmentGenerator:
         
         return "\n".join(report)
 
-    def _calculate_statistics(self, questions: List[Dict]) -> Dict[str, Any]:
-        """Calculate comprehensive assessment statistics"""
-        bloom_distribution = {}
-        type_distribution = {}
-        
-        time_rule = TimeFrameRule(150)
-        
-        for q in questions:
-            bloom = q.get('bloom', 'Unknown')
-            q_type = q.get('type', 'unknown')
-            
-            bloom_distribution[bloom] = bloom_distribution.get(bloom, 0) + 1
-            type_distribution[q_type] = type_distribution.get(q_type, 0) + 1
-        
-        estimated_time = time_rule._calculate_time(questions)
-        
-        total = len(questions)
-        bloom_percentage = {k: round((v/total)*100, 2) for k, v in bloom_distribution.items()} if total > 0 else {}
-        type_percentage = {k: round((v/total)*100, 2) for k, v in type_distribution.items()} if total > 0 else {}
-        
-        return {
-            'bloom_distribution': bloom_distribution,
-            'bloom_percentage': bloom_percentage,
-            'type_distribution': type_distribution,
-            'type_percentage': type_percentage,
-            'total_questions': total,
-            'estimated_duration_minutes': round(estimated_time, 2),
-            'estimated_duration_hours': round(estimated_time / 60, 2)
-        }
+# Seeds are echoed in the metadata, so they stay within JavaScript's safe integer range
+MAX_SEED = 2**53 - 1
 
-    def _calculate_chapter_stats(self, questions: List[Dict]) -> Dict:
-        """Calculate statistics for a chapter"""
-        bloom_dist = {}
-        type_dist = {}
-        
-        for q in questions:
-            bloom = q.get('bloom', 'Unknown')
-            q_type = q.get('type', 'unknown')
-            bloom_dist[bloom] = bloom_dist.get(bloom, 0) + 1
-            type_dist[q_type] = type_dist.get(q_type, 0) + 1
-        
-        total = len(questions)
-        return {
-            'bloom_distribution': bloom_dist,
-            'type_distribution': type_dist
-        }
+def seed_from_key(key: str) -> int:
+    """Derive a stable seed from a student/exam key"""
+    return int(hashlib.sha256(key.encode('utf-8')).hexdigest()[:16], 16) & MAX_SEED
+
+def seed_fingerprint(seed: Any) -> str:
+    return hashlib.sha256(repr(seed).encode('utf-8')).hexdigest()[:12]
+
+# Seeded assessments are deterministic, so identical requests can share one result.
+# Cached assessments are shared between callers and must be treated as read-only.
+seeded_assessment_cache = TTLCache(maxsize=2048, ttl=3600.0)
 
-def generate_summative_assessment() -> Dict[str, Any]:
-    """Standalone function to generate and return summative assessment"""
+def generate_summative_assessment(mode: str = 'rules', seed: Any = None, key: str = None) -> Dict[str, Any]:
+    """Standalone function to generate and return summative assessment.
+
+    Passing a `seed` (or a student/exam `key`) makes the result reproducible
+    and serves repeats from `seeded_assessment_cache`. An unknown `mode`
+    raises ValueError rather than returning an error assessment.
+    """
+    if mode not in GENERATION_MODES:
+        raise ValueError(f"mode must be one of {', '.join(GENERATION_MODES)}, got {mode!r}")
     try:
-        generator = SummativeAssessmentGenerator()
-        return generator.generate_unified_assessment()
+        if key is not None and seed is None:
+            seed = seed_from_key(key)
+        if seed is None:
+            return SummativeAssessmentGenerator().generate_unified_assessment(mode)
+        
+        bank_cache = get_question_bank_cache()
+        bank_cache.get()  # pick up bank changes before reading the version
+        assessment = seeded_assessment_cache.get((seed, mode, bank_cache.version))
+        if assessment is None:
+            generator = SummativeAssessmentGenerator(seed=seed)
+            assessment = generator.generate_unified_assessment(mode)
+            seeded_assessment_cache.set((seed, mode, generator.bank_version), assessment)
+        return assessment
     except Exception as e:
         return {
             'error': str(e),
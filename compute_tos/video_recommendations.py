@@ -0,0 +1,267 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from ttl_cache import TTLCache
+
+DEFAULT_VIDEO_INDEX_PATH = Path(__file__).resolve().parent / 'video_index.json'
+
+# A backend takes (query, limit) and returns a list of video dicts
+SearchBackend = Callable[[str, int], List[Dict]]
+
+def youtube_search(query: str, limit: int) -> List[Dict]:
+    """Search YouTube through yt_dlp without downloading anything"""
+    import yt_dlp
+
+    ydl_opts = {
+        "quiet": True,
+        "extract_flat": True,
+    }
+
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        result = ydl.extract_info(
+            f"ytsearch{limit}:{query}",
+            download=False
+        )
+
+    videos = []
+    for v in result.get("entries", []) or []:
+        videos.append({
+            "id": v.get("id"),
+            "title": v.get("title"),
+            "url": f"https://www.youtube.com/watch?v={v.get('id')}",
+            "channel": v.get("uploader"),
+        })
+    return videos
+
+def stub_search(query: str, limit: int) -> List[Dict]:
+    """Deterministic offline backend for tests and load tests"""
+    slug = re.sub(r'[^a-z0-9]+', '-', query.lower()).strip('-')[:40] or 'query'
+    return [
+        {
+            "id": f"stub-{slug}-{i}",
+            "title": f"{query} (part {i + 1})",
+            "url": f"https://www.youtube.com/watch?v=stub-{slug}-{i}",
+            "channel": "Stub Channel",
+        }
+        for i in range(limit)
+    ]
+
+BACKENDS: Dict[str, SearchBackend] = {
+    'youtube': youtube_search,
+    'stub': stub_search,
+}
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive cache key for a query"""
+    return ' '.join(query.lower().split())
+
+class VideoIndex:
+    """Precomputed recommendations for known lesson topics, built by build_video_index.py.
+
+    A query that isn't a topic itself is mapped to one through the question
+    texts it contains (the app asks with the wrong answers' questions joined
+    together): the topic most of them belong to answers it.
+
+    The file is re-checked at most once per `check_interval` seconds and
+    reloaded when its mtime or size changes, so a rebuilt index is picked up
+    without a restart.
+    """
+    def __init__(self, path: str = None, check_interval: float = 1.0):
+        self.path = Path(path) if path else DEFAULT_VIDEO_INDEX_PATH
+        self.check_interval = check_interval
+        self.built_at = None
+        self.backend = None
+        self.entries: Dict[str, Dict] = {}
+        self.questions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._last_check = time.monotonic()
+        self.counters = {
+            'hits': 0,
+            'topic_hits': 0,
+            'misses': 0,
+            'reloads': 0
+        }
+        self.load()
+
+    def load(self):
+        """(Re)load the index file; a missing file leaves the index empty"""
+        try:
+            stat = self.path.stat()
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            self._stamp = None
+            self.built_at, self.backend, self.entries, self.questions = None, None, {}, {}
+            return
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Could not load video index {self.path}: {e}", file=sys.stderr)
+            return
+        self._stamp = (stat.st_mtime_ns, stat.st_size)
+        self.built_at = data.get('built_at')
+        self.backend = data.get('backend')
+        self.entries = data.get('entries', {})
+        self.questions = data.get('questions', {})
+
+    def refresh(self):
+        """Reload the file if it changed, checking at most once per interval"""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        with self._lock:
+            if now - self._last_check < self.check_interval:
+                return
+            try:
+                stat = self.path.stat()
+                stamp = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                stamp = None
+            if stamp != self._stamp:
+                self.load()
+                self.counters['reloads'] += 1
+            self._last_check = time.monotonic()
+
+    def topic_for(self, query: str) -> Optional[str]:
+        """Topic most of the known questions inside `query` belong to (ties: first seen in the query)"""
+        query = normalize_query(query)
+        votes: Dict[str, Tuple[int, int]] = {}
+        for text, topic in self.questions.items():
+            position = query.find(text)
+            if position >= 0:
+                count, first = votes.get(topic, (0, position))
+                votes[topic] = (count + 1, min(first, position))
+        if not votes:
+            return None
+        return min(votes, key=lambda topic: (-votes[topic][0], votes[topic][1]))
+
+    def lookup(self, query: str, limit: int) -> Optional[List[Dict]]:
+        """Indexed videos for `query`, or None if the topic wasn't pre-fetched with enough results"""
+        self.refresh()
+        entry = self.entries.get(normalize_query(query))
+        counter = 'hits'
+        if entry is None:
+            topic = self.topic_for(query)
+            entry = self.entries.get(topic) if topic is not None else None
+            counter = 'topic_hits'
+        if entry is not None and (entry['limit'] >= limit or len(entry['videos']) >= limit):
+            self.counters[counter] += 1
+            return entry['videos'][:limit]
+        self.counters['misses'] += 1
+        return None
+
+    def stats(self, max_age_hours: float = 7 * 24) -> Dict:
+        now = time.time()
+        ages = [now - e['fetched_at'] for e in self.entries.values() if 'fetched_at' in e]
+        lookups = self.counters['hits'] + self.counters['topic_hits'] + self.counters['misses']
+        return {
+            'path': str(self.path),
+            'built_at': self.built_at,
+            'backend': self.backend,
+            'entries': len(self.entries),
+            'questions': len(self.questions),
+            'oldest_entry_hours': round(max(ages) / 3600, 2) if ages else None,
+            'newest_entry_hours': round(min(ages) / 3600, 2) if ages else None,
+            'stale_entries': sum(1 for a in ages if a > max_age_hours * 3600),
+            'hit_ratio': round((self.counters['hits'] + self.counters['topic_hits']) / lookups, 4) if lookups else None,
+            **self.counters
+        }
+
+class VideoRecommender:
+    """Video search answered from the offline index, then a TTL+LRU cache, then a live lookup.
+
+    Concurrent identical live lookups are coalesced and run on a bounded executor.
+    """
+    def __init__(self, backend: SearchBackend = youtube_search, max_workers: int = 4,
+                 cache_size: int = 512, ttl: float = 6 * 3600.0, index: VideoIndex = None):
+        self.backend = backend
+        self.index = index
+        self.cache = TTLCache(maxsize=cache_size, ttl=ttl)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='video-search')
+        self._in_flight: Dict[Tuple[str, int], Future] = {}
+        self._lock = threading.Lock()
+        self.counters = {
+            'lookups': 0,
+            'coalesced': 0,
+            'backend_calls': 0,
+            'backend_errors': 0,
+        }
+
+    def recommend(self, query: str, limit: int = 10, timeout: float = 30.0) -> List[Dict]:
+        """Return videos for `query`, waiting at most `timeout` seconds for a live search"""
+        return self.recommend_async(query, limit).result(timeout=timeout)
+
+    def recommend_async(self, query: str, limit: int = 10) -> Future:
+        """Return a future for the videos; concurrent identical queries share one lookup"""
+        key = (normalize_query(query), limit)
+        self.counters['lookups'] += 1
+
+        if self.index is not None:
+            indexed = self.index.lookup(query, limit)
+            if indexed is not None:
+                future = Future()
+                future.set_result(indexed)
+                return future
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is None:
+                # The search may have finished between the cache check and taking the lock
+                cached = self.cache.get(key)
+                if cached is not None:
+                    future = Future()
+                    future.set_result(cached)
+                    return future
+            else:
+                self.counters['coalesced'] += 1
+                return future
+            future = self._executor.submit(self._search, key, query)
+            self._in_flight[key] = future
+        return future
+
+    def _search(self, key: Tuple[str, int], query: str) -> List[Dict]:
+        self.counters['backend_calls'] += 1
+        try:
+            videos = self.backend(query, key[1])
+            self.cache.set(key, videos)
+            return videos
+        except Exception:
+            self.counters['backend_errors'] += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def stats(self) -> Dict:
+        return {
+            'backend': getattr(self.backend, '__name__', repr(self.backend)),
+            'in_flight': len(self._in_flight),
+            'index': self.index.stats() if self.index is not None else None,
+            'cache': self.cache.stats(),
+            **self.counters
+        }
+
+def create_recommender() -> VideoRecommender:
+    """Build the recommender from RECOMMENDATION_* environment settings"""
+    backend_name = os.environ.get('RECOMMENDATION_BACKEND', 'youtube')
+    if backend_name not in BACKENDS:
+        print(f"Unknown RECOMMENDATION_BACKEND {backend_name!r}, using youtube", file=sys.stderr)
+        backend_name = 'youtube'
+    return VideoRecommender(
+        backend=BACKENDS[backend_name],
+        max_workers=int(os.environ.get('RECOMMENDATION_WORKERS', 4)),
+        cache_size=int(os.environ.get('RECOMMENDATION_CACHE_SIZE', 512)),
+        ttl=float(os.environ.get('RECOMMENDATION_CACHE_TTL', 6 * 3600)),
+        index=VideoIndex(os.environ.get('VIDEO_INDEX_PATH')),
+    )
@@ -0,0 +1,153 @@
+"""Parse-time benchmark for the extractors on saved pages.
+
+    python bench_parse.py                            # the small fixtures in fixtures/
+    python pipeline.py --cache pages                 # or save every category's full pages once
+    python bench_parse.py --fixtures pages           # and benchmark those offline
+
+For every listing page it times the legacy path (the original per-category
+scripts' parsing, ported in legacy_rows.py) against the single-pass path (one
+strained parse shared by all extractors of the page) with each available
+parser, and checks that every mode extracts identical rows. Case rows are
+completed from their detail pages when those are saved too.
+
+fixtures/ holds a few items of every category, and fixtures/expected/ the CSV
+rows each extractor must produce from them; all modes are checked against
+those as well. Pages missing from --fixtures can be replaced by generated ones
+with --synthetic N.
+"""
+import argparse
+import csv
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Any
+
+import legacy_rows
+from extractors import EXTRACTORS, Extractor
+from http_cache import HttpCache
+from parsing import DEFAULT_PARSER
+from pipeline import extract_rows
+
+SCRAPER_DIR = Path(__file__).resolve().parent
+DEFAULT_FIXTURES = SCRAPER_DIR / 'fixtures'
+
+SPEC_ITEM = '''<li class="columns"><div class="column col-10 col-lg-8 col-sm-12">
+<a href="/us/product/part/{i}"><h5 class="name">Part {i} Model {i}X</h5>
+<div class="subtitle"><span class="socket">AM{s}</span> <span>Clock 3.{i} GHz</span> <span>Turbo 4.{i} GHz</span>
+<span class="cores">{c}</span><span class="series">Chipset {i}</span><span class="vram">8 GB GDDR6</span><span>{w} W</span>
+<span class="size">ATX</span><span class="watt">{w}0 W</span><span class="sockets">For socket AM4, AM5</span>
+<span class="d-hide"><span class="ramslots">4</span></span><span class="type">DDR5-6000</span><span>Kit of 2</span>
+<span class="radiator">240 mm</span></div></a></div>
+<div class="column col-1 col-lg-2 col-sm-4 text-right"><a href="/us/offer/{i}"><span class="price">USD 1,{i:03d}.99</span></a></div>
+</li>'''
+CHART_ITEM = '<li><a href="#"><span class="prdname">GPU {i}</span><span class="count">{i},{i:03d}</span></a></li>'
+CHROME = '<head>' + '<script>var x = 1;</script>' * 50 + '</head><nav>' + '<a href="#">link</a>' * 200 + '</nav>'
+
+def synthetic_page(extractor: Extractor, items: int) -> str:
+    if extractor.folder == 'passmark':
+        body = '<ul class="chartlist">' + ''.join(CHART_ITEM.format(i=i) for i in range(items)) + '</ul>'
+    else:
+        body = '<ul>' + ''.join(SPEC_ITEM.format(i=i, s=4 + i % 2, c=4 + i % 12, w=65 + i % 100)
+                                for i in range(items)) + '</ul>'
+    return f'<html>{CHROME}<body>{body}</body></html>'
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+def with_details(extractor: Extractor, rows: List, detail: Callable, cache: Optional[HttpCache]) -> List:
+    """Complete (partial_row, detail_url) rows from saved detail pages; rows without one stay partial"""
+    if extractor.detail is None:
+        return rows
+    complete = []
+    for partial, detail_url in rows:
+        html = cache.body(detail_url) if cache else None
+        complete.append((partial, detail_url) if html is None else partial + list(detail(detail_url, html)))
+    return complete
+
+def expected_rows(directory: Optional[Path], extractor: Extractor) -> Optional[List[List[str]]]:
+    path = directory / 'expected' / f'{extractor.name}.csv' if directory else None
+    if path is None or not path.exists():
+        return None
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))[1:]
+
+def bench_page(url: str, extractors: List[Extractor], html: str, repeat: int,
+               cache: HttpCache = None, expected: Dict[str, List[List[str]]] = None) -> Dict[str, Any]:
+    def legacy():
+        return {e.name: with_details(e, legacy_rows.legacy_parser(e.name)(html), legacy_rows.case_detail, cache)
+                for e in extractors}
+
+    def single_pass(parser: str):
+        rows = extract_rows(extractors, html, parser)
+        return {e.name: with_details(e, rows[e.name], e.detail, cache) for e in extractors}
+
+    modes = {
+        'legacy_html.parser': legacy,
+        'single_pass_html.parser': lambda: single_pass('html.parser'),
+    }
+    if DEFAULT_PARSER != 'html.parser':
+        modes[f'single_pass_{DEFAULT_PARSER}'] = lambda: single_pass(DEFAULT_PARSER)
+
+    reference = None
+    result = {'page': url, 'extractors': [e.name for e in extractors], 'kb': len(html) // 1024}
+    for mode, fn in modes.items():
+        rows = fn()
+        if reference is None:
+            reference = rows
+            result['rows'] = sum(len(r) for r in rows.values())
+        elif rows != reference:
+            result['mismatch'] = mode
+        for name, want in (expected or {}).items():
+            if [[str(v) for v in row] for row in rows[name]] != want:
+                result.setdefault('unexpected', []).append(f'{name} ({mode})')
+        result[mode + '_ms'] = round(best_of(fn, repeat) * 1000, 2)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark extractor parse time per page')
+    parser.add_argument('--fixtures', default=str(DEFAULT_FIXTURES), help='HTTP cache / snapshot directory with saved pages')
+    parser.add_argument('--synthetic', type=int, default=0, help='items per generated page for missing fixtures')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    cache = HttpCache(args.fixtures, read_only=True) if args.fixtures else None
+    directory = Path(args.fixtures) if args.fixtures else None
+    pages: Dict[str, List[Extractor]] = {}
+    for extractor in EXTRACTORS.values():
+        pages.setdefault(extractor.url, []).append(extractor)
+
+    results = []
+    for url, extractors in pages.items():
+        html = cache.body(url) if cache else None
+        if html is None:
+            if not args.synthetic:
+                print(f"No fixture for {url}, skipping", file=sys.stderr)
+                continue
+            html = synthetic_page(extractors[0], args.synthetic)
+        expected = {e.name: rows for e in extractors for rows in [expected_rows(directory, e)] if rows is not None}
+        results.append(bench_page(url, extractors, html, args.repeat, cache, expected))
+
+    if not results:
+        print("Nothing to benchmark: pass --fixtures DIR or --synthetic N", file=sys.stderr)
+        sys.exit(1)
+
+    columns = [key for key in results[0] if key.endswith('_ms')]
+    print(f"{'page':<28} {'kb':>6} {'rows':>6} " + ' '.join(f"{c[:-3]:>26}" for c in columns))
+    for r in results:
+        page = '/'.join(r['page'].rstrip('/').split('/')[-1:])
+        print(f"{page:<28} {r['kb']:>6} {r['rows']:>6} " + ' '.join(f"{r[c]:>26}" for c in columns)
+              + (f"  MISMATCH in {r['mismatch']}" if 'mismatch' in r else '')
+              + (f"  UNEXPECTED ROWS in {', '.join(r['unexpected'])}" if 'unexpected' in r else ''))
+    totals = {c: round(sum(r[c] for r in results), 1) for c in columns}
+    print(f"{'total':<41} " + ' '.join(f"{totals[c]:>26}" for c in columns))
+    if any('mismatch' in r or 'unexpected' in r for r in results):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
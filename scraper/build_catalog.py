@@ -0,0 +1,269 @@
+"""Build one indexed SQLite parts catalog from the scraped CSVs.
+
+    python build_catalog.py                      # -> catalog.db next to this script
+
+Specs, prices and PassMark GPU scores are joined once here, so consumers
+query `parts` by category, socket and price instead of re-joining 22 CSVs by
+name. Part IDs are the same stable IDs the incremental changelog uses.
+
+Price names and GPU chipsets are resolved against the spec and PassMark names
+with name_matching: exact matches first, fuzzy matches at or above
+--match-threshold otherwise. Per-join counts go into the summary, and the full
+report (unmatched names, weakest accepted matches) into meta.match_report and
+--match-report. Resolved mappings are cached in --match-cache between runs.
+
+    parts(part_id, category, name, price, benchmark, socket, form_factor,
+          wattage, tdp, specs)          -- specs: every scraped column as JSON
+    gpu_benchmarks(chipset, benchmark, tier)
+
+plus the compatibility index described in compatibility.py (part_sockets,
+part_form_factors, part_power), so "socket -> boards", "socket -> coolers" and
+"board form factor -> cases" are indexed lookups.
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Any
+
+from changes import keyed_rows
+from compatibility import (BASE_SYSTEM_WATTS, PSU_HEADROOM, canonical_sockets, gpu_watts_by_chipset,
+                           part_compatibility)
+from extractors import PASSMARK_TIERS, SPEC_CATEGORIES
+from name_matching import DEFAULT_THRESHOLD, MatchCache, match_key, resolve
+
+SCRAPER_DIR = Path(__file__).resolve().parent
+DEFAULT_CATALOG_PATH = SCRAPER_DIR / 'catalog.db'
+DEFAULT_MATCH_CACHE = SCRAPER_DIR / 'name_matches.json'
+CATEGORIES = list(SPEC_CATEGORIES) + ['case']
+
+SCHEMA = '''
+CREATE TABLE parts (
+    part_id TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    price REAL,
+    benchmark REAL,
+    socket TEXT,
+    form_factor TEXT,
+    wattage INTEGER,
+    tdp INTEGER,
+    specs TEXT NOT NULL
+);
+CREATE TABLE part_sockets (
+    part_id TEXT NOT NULL REFERENCES parts(part_id),
+    category TEXT NOT NULL,
+    socket TEXT NOT NULL
+);
+CREATE TABLE part_form_factors (
+    part_id TEXT NOT NULL REFERENCES parts(part_id),
+    category TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    form_factor TEXT NOT NULL
+);
+CREATE TABLE part_power (
+    part_id TEXT PRIMARY KEY REFERENCES parts(part_id),
+    category TEXT NOT NULL,
+    watts INTEGER NOT NULL,
+    estimated INTEGER NOT NULL
+);
+CREATE TABLE gpu_benchmarks (
+    chipset TEXT NOT NULL,
+    benchmark REAL NOT NULL,
+    tier TEXT NOT NULL
+);
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX parts_category ON parts(category);
+CREATE INDEX parts_category_price ON parts(category, price);
+CREATE INDEX parts_category_socket_price ON parts(category, socket, price);
+CREATE INDEX part_sockets_socket ON part_sockets(category, socket, part_id);
+CREATE INDEX part_form_factors_lookup ON part_form_factors(category, kind, form_factor, part_id);
+'''
+
+def read_table(path: Path) -> Tuple[List[str], List[List[str]]]:
+    """(header, rows) of a scraped CSV.
+
+    Some names contain unquoted commas (e.g. "..., semi-modular"); the surplus
+    leading fields are folded back into the name.
+    """
+    with open(path, 'r', newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        rows = []
+        for row in reader:
+            if not row:
+                continue
+            extra = len(row) - len(header)
+            if extra > 0:
+                row = [','.join(row[:extra + 1])] + row[extra + 1:]
+            rows.append(row + [''] * (len(header) - len(row)))
+    return header, rows
+
+def to_number(value: str, kind=float) -> Optional[Any]:
+    try:
+        return kind(float(value))
+    except (TypeError, ValueError):
+        return None
+
+def load_prices(scraper_dir: Path, category: str) -> Dict[str, float]:
+    path = scraper_dir / 'price' / f'scraped_prices_{category}.csv'
+    if not path.exists():
+        return {}
+    prices = {}
+    for name, price in read_table(path)[1]:
+        value = to_number(price)
+        if value is not None:
+            # First listing wins, matching the order pc-kombo ranks offers in
+            prices.setdefault(name, value)
+    return prices
+
+def load_benchmarks(scraper_dir: Path) -> List[Tuple[str, float, str]]:
+    rows = []
+    for tier in PASSMARK_TIERS:
+        path = scraper_dir / 'passmark' / f'scraped_gpu_score_{tier}.csv'
+        if not path.exists():
+            continue
+        for chipset, score in read_table(path)[1]:
+            value = to_number(score)
+            if chipset and value is not None:
+                rows.append((chipset, value, tier))
+    return rows
+
+def part_columns(category: str, spec: Dict[str, str]) -> Dict[str, Any]:
+    """The typed, indexed columns for one part; everything else stays in `specs`"""
+    return {
+        'socket': next(iter(canonical_sockets(spec.get('microarchitecture') if category == 'cpu'
+                                              else spec.get('socket'))), None),
+        'form_factor': spec.get('form_factor') or (spec.get('type') if category in ('case', 'psu') else None),
+        'wattage': to_number(spec.get('wattage'), int),
+        'tdp': to_number(spec.get('tdp'), int),
+    }
+
+def match_counts(report: Dict[str, Any]) -> Dict[str, int]:
+    counts = {key: report[key] for key in ('exact', 'fuzzy', 'cached')}
+    counts['unmatched'] = len(report['unmatched'])
+    return counts
+
+def build_catalog(output: Path = DEFAULT_CATALOG_PATH, scraper_dir: Path = SCRAPER_DIR,
+                  match_threshold: float = DEFAULT_THRESHOLD, match_cache: Optional[Path] = DEFAULT_MATCH_CACHE
+                  ) -> Dict[str, Any]:
+    started = time.perf_counter()
+    cache = MatchCache(match_cache)
+    match_report = {}
+    benchmarks = load_benchmarks(scraper_dir)
+    # Highest score wins when a chipset appears in more than one tier
+    benchmark_by_chipset: Dict[str, float] = {}
+    for chipset, score, _ in benchmarks:
+        benchmark_by_chipset[chipset] = max(score, benchmark_by_chipset.get(chipset, score))
+
+    tmp = output.with_name(f"{output.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    db = sqlite3.connect(tmp)
+    db.executescript(SCHEMA)
+
+    summary = {}
+    for category in CATEGORIES:
+        path = scraper_dir / 'pc-kombo' / f'scraped_{category}.csv'
+        if not path.exists():
+            print(f"Skipping {category}: {path} not found", file=sys.stderr)
+            continue
+        header, rows = read_table(path)
+        names = [row[0] for row in rows]
+
+        # price name -> spec name; the first listing resolved to a part prices it (and its
+        # spelling variants, which share a normalized key)
+        listings = load_prices(scraper_dir, category)
+        matches, match_report[category] = resolve(f'price:{category}', listings, names, match_threshold, cache)
+        prices: Dict[str, float] = {}
+        for listing, price in listings.items():
+            if listing in matches:
+                prices.setdefault(match_key(matches[listing][0]), price)
+
+        chipsets, chipset_watts = {}, None
+        if category == 'gpu':
+            chipset_watts = gpu_watts_by_chipset(dict(zip(header, row)) for row in rows)
+            spec_chipsets = [row[header.index('chipset')] for row in rows]
+            chipsets, match_report['gpu_chipset'] = resolve('passmark', spec_chipsets, benchmark_by_chipset,
+                                                            match_threshold, cache)
+
+        parts, sockets, form_factors, power = [], [], [], []
+        priced = benchmarked = 0
+        for part_id, row in keyed_rows(category, header, rows).items():
+            spec = dict(zip(header, row))
+            price = prices.get(match_key(spec['name']))
+            benchmark = None
+            if spec.get('chipset') in chipsets:
+                benchmark = benchmark_by_chipset[chipsets[spec['chipset']][0]]
+            columns = part_columns(category, spec)
+            parts.append((part_id, category, spec['name'], price, benchmark, columns['socket'],
+                          columns['form_factor'], columns['wattage'], columns['tdp'],
+                          json.dumps(spec, ensure_ascii=False)))
+            compat = part_compatibility(category, spec, chipset_watts)
+            sockets.extend((part_id, category, socket) for socket in compat['sockets'])
+            form_factors.extend((part_id, category, kind, form_factor)
+                                for kind in ('board', 'psu') for form_factor in compat[kind])
+            if compat['watts'] is not None:
+                power.append((part_id, category, compat['watts'], int(compat['estimated'])))
+            priced += price is not None
+            benchmarked += benchmark is not None
+
+        db.executemany('INSERT INTO parts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', parts)
+        db.executemany('INSERT INTO part_sockets VALUES (?, ?, ?)', sockets)
+        db.executemany('INSERT INTO part_form_factors VALUES (?, ?, ?, ?)', form_factors)
+        db.executemany('INSERT INTO part_power VALUES (?, ?, ?, ?)', power)
+        summary[category] = {'parts': len(parts), 'priced': priced, 'price_matches': match_counts(match_report[category])}
+        if category == 'gpu':
+            summary[category]['benchmarked'] = benchmarked
+            summary[category]['benchmark_matches'] = match_counts(match_report['gpu_chipset'])
+
+    db.executemany('INSERT INTO gpu_benchmarks VALUES (?, ?, ?)', benchmarks)
+    db.executemany('INSERT INTO meta VALUES (?, ?)', [
+        ('built_at', str(time.time())),
+        ('summary', json.dumps(summary)),
+        ('match_threshold', str(match_threshold)),
+        ('psu_formula', json.dumps({'base_watts': BASE_SYSTEM_WATTS, 'headroom': PSU_HEADROOM})),
+        ('match_report', json.dumps(match_report, ensure_ascii=False)),
+    ])
+    db.commit()
+    db.execute('ANALYZE')
+    db.close()
+    tmp.replace(output)
+    cache.save()
+
+    return {
+        'output': str(output),
+        'categories': summary,
+        'gpu_benchmarks': len(benchmarks),
+        'match_report': match_report,
+        'seconds': round(time.perf_counter() - started, 3)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the SQLite parts catalog from the scraped CSVs')
+    parser.add_argument('--output', default=str(DEFAULT_CATALOG_PATH))
+    parser.add_argument('--scraper-dir', default=str(SCRAPER_DIR), help='root holding pc-kombo/, price/, passmark/')
+    parser.add_argument('--match-threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='minimum confidence (0..1) for a fuzzy name match')
+    parser.add_argument('--match-cache', default=str(DEFAULT_MATCH_CACHE), help="resolved name mappings; '' disables")
+    parser.add_argument('--match-report', default=None, help='write the full name matching report to this JSON file')
+    args = parser.parse_args()
+
+    result = build_catalog(Path(args.output), Path(args.scraper_dir), args.match_threshold,
+                           Path(args.match_cache) if args.match_cache else None)
+    report = result.pop('match_report')
+    if args.match_report:
+        Path(args.match_report).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+    for kind, entry in report.items():
+        for unmatched in entry['unmatched']:
+            print(f"[{kind}] unmatched: {unmatched}", file=sys.stderr)
+    print(json.dumps(result, indent=2))
+
+if __name__ == '__main__':
+    main()
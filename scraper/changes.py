@@ -0,0 +1,115 @@
+"""Change detection for incremental catalog refreshes.
+
+Every row gets a stable part ID derived from its category, normalized name
+and the spec columns that tell same-named parts apart (IDENTITY_COLUMNS), and
+a content hash of all its columns. Comparing a fresh scrape with the CSV
+already on disk yields the inserts, updates and deletions, which are appended
+to a JSON Lines changelog:
+
+    {"run": "...", "extractor": "price_cpu", "op": "update", "part_id": "cpu-3f2a...",
+     "row": {"name": "...", "price": "129.99"}, "changed": {"price": ["139.99", "129.99"]}}
+"""
+import csv
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Spec columns that separate parts listed under one name, e.g. a RAM model sold
+# in several kit sizes and speeds; columns missing from a header are skipped
+IDENTITY_COLUMNS = {
+    'cpu': ('microarchitecture', 'boost_clock', 'cores'),
+    'fan': ('supported_socket', 'type'),
+    'gpu': ('chipset', 'vram'),
+    'hdd': ('capacity', 'unit'),
+    'motherboard': ('form_factor', 'socket'),
+    'psu': ('type', 'wattage'),
+    'ram': ('speed', 'size', 'stick'),
+    'ssd': ('capacity', 'unit', 'form_factor'),
+}
+
+def normalize_name(name: str) -> str:
+    return ' '.join(name.lower().split())
+
+def part_id(category: str, name: str, specs: Sequence[str] = ()) -> str:
+    key = '\x1f'.join([normalize_name(name), *(spec.strip().lower() for spec in specs)])
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+    return f"{category}-{digest}"
+
+def row_hash(row: List[str]) -> str:
+    return hashlib.sha1('\x1f'.join(row).encode('utf-8')).hexdigest()
+
+def keyed_rows(category: str, header: List[str], rows: List[List[Any]]) -> Dict[str, List[str]]:
+    """Rows by part ID.
+
+    Rows that still share an ID get '#2', '#3'... in the order of their
+    contents rather than the listing's, so a reordered listing keeps its IDs.
+    """
+    columns = [header.index(column) for column in IDENTITY_COLUMNS.get(category, ()) if column in header]
+    groups: Dict[str, List[List[str]]] = {}
+    for row in rows:
+        row = [str(value) for value in row]
+        specs = [row[i] if i < len(row) else '' for i in columns]
+        groups.setdefault(part_id(category, row[0], specs), []).append(row)
+    keyed = {}
+    for base, group in groups.items():
+        for n, row in enumerate(sorted(group), 1):
+            keyed[base if n == 1 else f"{base}#{n}"] = row
+    return keyed
+
+def read_rows(path: Path) -> Optional[Tuple[List[str], List[List[str]]]]:
+    """(header, rows) of an existing CSV, or None if there isn't one"""
+    try:
+        with open(path, 'r', newline='', encoding='utf-8') as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            return header, [row for row in reader if row]
+    except FileNotFoundError:
+        return None
+
+def diff(category: str, header: List[str], old_rows: List[List[str]],
+         new_rows: List[List[Any]]) -> List[Dict[str, Any]]:
+    old = keyed_rows(category, header, old_rows)
+    new = keyed_rows(category, header, new_rows)
+    changes = []
+    for key, row in new.items():
+        previous = old.get(key)
+        if previous is None:
+            changes.append({'op': 'insert', 'part_id': key, 'row': dict(zip(header, row))})
+        elif row_hash(previous) != row_hash(row):
+            changed = {
+                column: [before, after]
+                for column, before, after in zip(header, previous + [''] * len(header), row)
+                if before != after
+            }
+            changes.append({'op': 'update', 'part_id': key, 'row': dict(zip(header, row)), 'changed': changed})
+    for key, row in old.items():
+        if key not in new:
+            changes.append({'op': 'delete', 'part_id': key, 'row': dict(zip(header, row))})
+    return changes
+
+class Changelog:
+    """Append-only JSON Lines changelog shared by every extractor in a run"""
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.run = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self._lock = threading.Lock()
+
+    def append(self, extractor: str, changes: List[Dict[str, Any]]):
+        if not changes:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lines = ''.join(
+            json.dumps({'run': self.run, 'extractor': extractor, **change}, ensure_ascii=False) + '\n'
+            for change in changes
+        )
+        with self._lock, open(self.path, 'a', encoding='utf-8') as file:
+            file.write(lines)
+
+def summarize(changes: List[Dict[str, Any]]) -> Dict[str, int]:
+    counts = {'inserts': 0, 'updates': 0, 'deletes': 0}
+    for change in changes:
+        counts[change['op'] + 's'] += 1
+    return counts
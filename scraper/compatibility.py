@@ -0,0 +1,135 @@
+"""Compatibility rules for the parts catalog.
+
+build_catalog.py runs every part through part_compatibility() once and stores
+the result as lookup tables, so recommenders never re-parse socket lists or
+form factors per query:
+
+    part_sockets(part_id, category, socket)              -- CPUs, boards, coolers
+    part_form_factors(part_id, category, kind, form_factor)
+        kind 'board': a board's form factor / every board form factor a case fits
+        kind 'psu':   a PSU's form factor / every PSU form factor a case fits
+    part_power(part_id, category, watts, estimated)      -- CPU (estimated) and GPU draw
+        GPUs without a listed TDP get the highest TDP listed for their chipset,
+        or DEFAULT_GPU_WATTS, and are marked estimated
+
+Sockets and form factors are canonicalized: the scraped spellings vary
+("2011-3", "2011-v3", "2011-V3"; "AM3(+)"; "ITX" vs "Mini-ITX").
+"""
+import math
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+SOCKET_ALIASES = {
+    '2011-3': '2011-V3',
+    '2011-0': '2011',
+    '2011-V1': '2011',
+    'STR4': 'TR4',
+    'STRX4': 'TRX40',
+    'SWRX80': 'SWRX8',
+    '115X': '1150, 1151, 1155, 1156',
+}
+NOT_A_SOCKET = {'', 'FOR SOCKET', 'ILM', 'SOC'}
+
+# Board form factors by size; a case fits its own size and everything smaller
+BOARD_SIZES = ['Mini-ITX', 'Micro-ATX', 'ATX', 'E-ATX']
+BOARD_FORM_FACTORS = {
+    'MINI-ITX': 'Mini-ITX', 'ITX': 'Mini-ITX', 'THIN-MINI-ITX': 'Mini-ITX', 'MINI-DTX': 'Mini-ITX',
+    'MINI-STX': 'Mini-ITX',
+    'MICRO-ATX': 'Micro-ATX', 'MATX': 'Micro-ATX',
+    'ATX': 'ATX',
+    'E-ATX': 'E-ATX', 'EEB': 'E-ATX', 'CEB': 'E-ATX', 'XL-ATX': 'E-ATX', 'SSI': 'E-ATX',
+}
+PSU_FORM_FACTORS = {'ATX': 'ATX', 'ATX PS/2': 'ATX', 'SFX': 'SFX', 'SFX-L': 'SFX-L', 'TFX': 'TFX',
+                    'FLEX-ATX': 'Flex-ATX'}
+
+# Board, RAM, drives and fans
+BASE_SYSTEM_WATTS = 75
+PSU_HEADROOM = 1.2
+# Unlisted GPU draw with no other card of the chipset to go by; errs towards a bigger PSU
+DEFAULT_GPU_WATTS = 300
+
+def canonical_sockets(value: Optional[str]) -> List[str]:
+    """Canonical socket names in a scraped socket (list) string"""
+    sockets = []
+    for raw in re.split(r'[,/]', value or ''):
+        socket = raw.strip().upper()
+        socket = SOCKET_ALIASES.get(socket, socket)
+        expanded = re.match(r'^(.*)\(\+\)$', socket)
+        candidates = [expanded.group(1), expanded.group(1) + '+'] if expanded else socket.split(', ')
+        for candidate in candidates:
+            if candidate not in NOT_A_SOCKET and candidate not in sockets:
+                sockets.append(candidate)
+    return sockets
+
+def board_form_factor(value: Optional[str]) -> Optional[str]:
+    """Canonical board form factor; the largest one when several are listed"""
+    found = [BOARD_FORM_FACTORS[v.strip().upper()] for v in (value or '').split(',')
+             if v.strip().upper() in BOARD_FORM_FACTORS]
+    return max(found, key=BOARD_SIZES.index) if found else None
+
+def case_board_form_factors(value: Optional[str]) -> List[str]:
+    """Board form factors a case of this type fits"""
+    largest = board_form_factor(value)
+    if largest is None:
+        return []
+    return BOARD_SIZES[:BOARD_SIZES.index(largest) + 1]
+
+def psu_form_factors(value: Optional[str]) -> List[str]:
+    found = []
+    for v in (value or '').split(','):
+        form_factor = PSU_FORM_FACTORS.get(v.strip().upper())
+        if form_factor and form_factor not in found:
+            found.append(form_factor)
+    return found
+
+def estimate_cpu_watts(cores: Any) -> int:
+    """Rough package power from the core count; the scraped CPUs have no TDP"""
+    try:
+        cores = float(cores)
+    except (TypeError, ValueError):
+        cores = 4
+    return int(min(280, 35 + 10 * cores))
+
+def listed_watts(value: Any) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+def gpu_watts_by_chipset(specs: Iterable[Dict[str, str]]) -> Dict[str, int]:
+    """Highest listed TDP per GPU chipset, to estimate cards that list none"""
+    known: Dict[str, int] = {}
+    for spec in specs:
+        watts = listed_watts(spec.get('tdp'))
+        if watts is not None:
+            known[spec.get('chipset')] = max(watts, known.get(spec.get('chipset'), 0))
+    return known
+
+def minimum_psu_wattage(cpu_watts: float, gpu_watts: float) -> int:
+    return int(math.ceil(((cpu_watts or 0) + (gpu_watts or 0) + BASE_SYSTEM_WATTS) * PSU_HEADROOM))
+
+def part_compatibility(category: str, spec: Dict[str, str],
+                       chipset_watts: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """Sockets, form factors and power draw of one scraped part"""
+    result: Dict[str, Any] = {'sockets': [], 'board': [], 'psu': [], 'watts': None, 'estimated': False}
+    if category == 'cpu':
+        result['sockets'] = canonical_sockets(spec.get('microarchitecture'))
+        result['watts'], result['estimated'] = estimate_cpu_watts(spec.get('cores')), True
+    elif category == 'motherboard':
+        result['sockets'] = canonical_sockets(spec.get('socket'))
+        # Unlisted form factors are assumed to be ATX, the most common size
+        result['board'] = [board_form_factor(spec.get('form_factor')) or 'ATX']
+    elif category == 'fan':
+        result['sockets'] = canonical_sockets(spec.get('supported_socket'))
+    elif category == 'case':
+        result['board'] = case_board_form_factors(spec.get('type'))
+        # Cases that don't say take a standard ATX PSU
+        result['psu'] = psu_form_factors(spec.get('psu_type')) or ['ATX']
+    elif category == 'psu':
+        result['psu'] = psu_form_factors(spec.get('type'))
+    elif category == 'gpu':
+        result['watts'] = listed_watts(spec.get('tdp'))
+        if result['watts'] is None:
+            result['watts'] = (chipset_watts or {}).get(spec.get('chipset'), DEFAULT_GPU_WATTS)
+            result['estimated'] = True
+    return result
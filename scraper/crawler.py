@@ -0,0 +1,246 @@
+"""Shared fetcher for the scrapers.
+
+Pages are fetched on a bounded thread pool over one pooled keep-alive
+session. Every request first waits for its host's rate limiter, so a crawl
+is paced by the per-host politeness budget rather than by round trips.
+Connection errors, timeouts, 429 and 5xx responses are retried with
+exponential backoff (honouring Retry-After).
+
+With a `cache_dir` every page is kept in an HttpCache and revalidated with
+conditional requests (see http_cache.py); with `replay=True` pages are read
+back from that directory instead of the network, which is never written to.
+"""
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from http_cache import HttpCache
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                  "AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/119.0.0.0 Safari/537.36"
+}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class Page:
+    """A fetched page; `changed` is False when the server confirmed the cached copy"""
+    def __init__(self, url: str, text: str, changed: bool = True):
+        self.url = url
+        self.text = text
+        self.changed = changed
+
+class HostRateLimiter:
+    """Spaces requests to each host at least 1/rate seconds apart"""
+    def __init__(self, requests_per_second: float = 4.0):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str):
+        # Reserve the next slot under the lock, sleep outside it
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def defer(self, host: str, seconds: float):
+        """Push the host's next slot back, e.g. after a 429"""
+        with self._lock:
+            self._next_slot[host] = max(self._next_slot.get(host, 0.0), time.monotonic() + seconds)
+
+class Crawler:
+    def __init__(self, max_workers: int = 8, requests_per_second: float = 4.0, max_retries: int = 4,
+                 backoff: float = 0.5, timeout: float = 20.0, headers: Dict[str, str] = None,
+                 cache_dir: str = None, replay: bool = False):
+        self.max_workers = max_workers
+        self.cache = HttpCache(cache_dir, read_only=replay) if cache_dir else None
+        self.replay = replay
+        if replay and self.cache is None:
+            raise ValueError("replay needs a cache_dir")
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.limiter = HostRateLimiter(requests_per_second)
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='crawler')
+        self._stats_lock = threading.Lock()
+        self.counters = {
+            'requests': 0,
+            'retries': 0,
+            'failures': 0,
+            'bytes': 0,
+            'not_modified': 0,
+            'parses_skipped': 0
+        }
+
+    def _count(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self.counters[key] += n
+
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return float(retry_after)
+        return self.backoff * (2 ** attempt) * (0.5 + random.random())
+
+    def get(self, url: str, headers: Dict[str, str] = None, stream: bool = False) -> requests.Response:
+        """Fetch one URL, rate limited and retried; raises after the last failed attempt.
+
+        With `stream` the body is left unread for the caller to iterate.
+        """
+        host = urlsplit(url).netloc
+        for attempt in range(self.max_retries + 1):
+            self.limiter.wait(host)
+            self._count('requests')
+            response = None
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout, stream=stream)
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    if not stream:
+                        self._count('bytes', len(response.content))
+                    return response
+                response.close()
+                error = requests.HTTPError(f"{response.status_code} for {url}", response=response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            if attempt == self.max_retries:
+                self._count('failures')
+                raise error
+            delay = self._retry_delay(attempt, response)
+            if response is not None and response.status_code == 429:
+                self.limiter.defer(host, delay)
+            self._count('retries')
+            time.sleep(delay)
+
+    def fetch_page(self, url: str) -> Page:
+        if self.replay:
+            text = self.cache.body(url)
+            if text is None:
+                raise FileNotFoundError(f"{url} is not in the cache")
+            return Page(url, text)
+        if self.cache is None:
+            return Page(url, self.get(url).text)
+
+        response = self.get(url, headers=self.cache.validators(url))
+        if response.status_code == 304:
+            self._count('not_modified')
+            self.cache.touch(url)
+            return Page(url, self.cache.body(url), changed=False)
+        self.cache.store(url, response.text, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return Page(url, response.text)
+
+    def fetch(self, url: str) -> str:
+        return self.fetch_page(url).text
+
+    def stream(self, url: str, chunk_size: int = 64 * 1024) -> Iterator[str]:
+        """Page text in chunks as it arrives, teed into the cache when there is one"""
+        if self.replay:
+            yield from self.cache.iter_body(url, chunk_size)
+            return
+
+        response = self.get(url, headers=self.cache.validators(url) if self.cache else None, stream=True)
+        with response:
+            if response.status_code == 304:
+                self._count('not_modified')
+                self.cache.touch(url)
+                yield from self.cache.iter_body(url, chunk_size)
+                return
+
+            response.encoding = response.encoding or 'utf-8'
+            body = self.cache.open_body(url) if self.cache else None
+            try:
+                for chunk in response.iter_content(chunk_size, decode_unicode=True):
+                    self._count('bytes', len(chunk))
+                    if body is not None:
+                        body.write(chunk)
+                    yield chunk
+            except BaseException:
+                if body is not None:
+                    body.close()
+                    os.remove(body.name)
+                raise
+            if body is not None:
+                self.cache.commit_body(url, body, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+
+    def fetch_parsed(self, url: str, key: str, parse: Callable[[str, str], Any]) -> Any:
+        """parse(url, html), reusing the cached result when the page is unchanged.
+
+        Cached results go through JSON, so tuples come back as lists.
+        """
+        page = self.fetch_page(url)
+        if self.cache is None:
+            return parse(url, page.text)
+        if not page.changed:
+            result = self.cache.parsed(url, key)
+            if result is not None:
+                self._count('parses_skipped')
+                return result
+        result = parse(url, page.text)
+        if not self.replay:
+            self.cache.store_parsed(url, key, result)
+        return result
+
+    def map(self, parse: Callable[[str, str], Any], urls: Iterable[str]) -> Iterator[Tuple[str, Any, Optional[Exception]]]:
+        """Fetch `urls` concurrently and yield (url, parse(url, html), error) in input order"""
+        def task(url: str):
+            try:
+                return url, self.fetch_parsed(url, parse.__qualname__, parse), None
+            except Exception as e:
+                return url, None, e
+
+        return self._executor.map(task, urls)
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return dict(self.counters)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def add_arguments(parser):
+    """Common politeness options for scraper scripts"""
+    parser.add_argument('--workers', type=int, default=8, help='concurrent requests')
+    parser.add_argument('--rate', type=float, default=4.0, help='max requests per second per host')
+    parser.add_argument('--retries', type=int, default=4)
+    parser.add_argument('--cache', '--snapshot', dest='cache', default=None,
+                        help='HTTP cache directory; pages are revalidated with conditional requests')
+    parser.add_argument('--replay', action='store_true',
+                        help='re-run the parsers on the pages in --cache with no network access')
+
+def from_args(args) -> Crawler:
+    if args.replay and not args.cache:
+        raise SystemExit("--replay needs --cache DIR")
+    return Crawler(max_workers=args.workers, requests_per_second=args.rate, max_retries=args.retries,
+                   cache_dir=args.cache, replay=args.replay)
+
+def report(crawler: Crawler, started: float):
+    stats = crawler.stats()
+    print(f"{stats['requests']} requests ({stats['not_modified']} not modified), {stats['retries']} retries, "
+          f"{stats['failures']} failures, {stats['parses_skipped']} parses skipped "
+          f"in {time.perf_counter() - started:.1f}s", file=sys.stderr)
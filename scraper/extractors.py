@@ -0,0 +1,313 @@
+"""Per-category extractor definitions for the scraping pipeline.
+
+Each Extractor names the listing page to fetch, how to find the item nodes on
+it and how to turn one item into a CSV row. Row functions may raise; the
+pipeline logs the error and skips the item, as the old scripts did.
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from bs4 import SoupStrainer
+from parsing import CASE_DETAIL_ONLY, PASSMARK_LISTING_ONLY, PC_KOMBO_LISTING_ONLY, make_soup
+
+PC_KOMBO = "https://www.pc-kombo.com"
+PC_KOMBO_LISTING = PC_KOMBO + "/us/components/{}"
+PASSMARK_LISTING = "https://www.videocardbenchmark.net/{}.html"
+
+@dataclass
+class Extractor:
+    name: str
+    url: str
+    folder: str
+    filename: str
+    header: List[str]
+    items: Callable[[Any], Iterable]
+    row: Callable[[Any], Optional[List]]
+    # For categories needing a detail page, `row` returns (partial_row, detail_url)
+    # and `detail(url, html)` returns the remaining columns
+    detail: Optional[Callable[[str, str], Tuple]] = None
+    # The item node inside one pc-kombo `li.columns` entry, for single-pass extraction
+    within: Optional[Callable[[Any], Any]] = None
+    # Part category shared by a part's spec and price rows; prefixes its part ID
+    category: str = ''
+    # Only these nodes need to be built when parsing the page
+    parse_only: Optional[SoupStrainer] = None
+
+def subtitles(soup):
+    return soup.find_all('div', class_='subtitle')
+
+def listing_columns(soup):
+    return soup.find_all('li', class_='columns')
+
+def subtitle_in(listing_item):
+    return listing_item.find('div', class_='subtitle')
+
+def case_link_in(listing_item):
+    for a in listing_item.find_all('a', href=True):
+        if a.find('h5', class_='name'):
+            return a
+    return None
+
+def listing_item_itself(listing_item):
+    return listing_item
+
+def chartlist(soup):
+    gpu_list = soup.find('ul', class_='chartlist')
+    return gpu_list.find_all('li') if gpu_list else []
+
+def text_of(tag, default: str = '') -> str:
+    return tag.text.strip() if tag else default
+
+def name_tag(item):
+    """The h5.name heading of an item; on pc-kombo it directly precedes the subtitle"""
+    tag = item.find_previous_sibling('h5', class_='name')
+    return tag if tag is not None else item.find_previous('h5', class_='name')
+
+def item_name(item) -> str:
+    return name_tag(item).text.strip()
+
+# pc-kombo spec rows
+
+def cpu_row(cpu):
+    socket = cpu.find('span', class_='socket').text.strip()
+
+    # First strings mentioning Clock and Turbo, found in one walk; remove "GHz" and trim
+    clock = turbo = None
+    for text in cpu.strings:
+        if clock is None and "Clock" in text:
+            clock = text
+        if turbo is None and "Turbo" in text:
+            turbo = text
+        if clock is not None and turbo is not None:
+            break
+    clock = clock.strip().replace('Clock', '').replace('GHz', '').strip() if clock else ''
+    turbo = turbo.strip().replace('Turbo', '').replace('GHz', '').strip() if turbo else ''
+
+    cores = text_of(cpu.find('span', class_='cores'))
+    return [item_name(cpu), socket, clock, turbo, cores]
+
+def fan_row(cooler):
+    name = text_of(name_tag(cooler), 'N/A')
+
+    socket_tag = cooler.find('span', class_='sockets')
+    supported_socket = socket_tag.text.strip().replace("For socket ", "") if socket_tag else 'N/A'
+
+    # AIO coolers list a radiator size
+    cooler_type = 'AIO' if cooler.select_one('.radiator') else 'Air'
+    return [name, supported_socket, cooler_type]
+
+def gpu_row(gpu):
+    chipset = text_of(gpu.find('span', class_='series'))
+
+    # VRAM (e.g., "8 GB GDDR6")
+    vram_text = gpu.find('span', class_='vram')
+    vram = vram_text.text.strip().split(' ')[0] if vram_text else ''
+
+    # TDP (match any span containing digits + 'W')
+    tdp = ''
+    for span in gpu.find_all('span'):
+        text = span.text.strip()
+        if re.match(r'^\d+\s*W$', text):
+            tdp = text.replace('W', '').strip()
+            break
+    return [item_name(gpu), chipset, vram, tdp]
+
+def hdd_row(hdd):
+    # Numeric capacity from <span class="size">, always in TB
+    size_span = hdd.find('span', class_='size')
+    capacity = ''
+    if size_span:
+        match = re.search(r'(\d+)', size_span.text)
+        if match:
+            capacity = match.group(1)
+    return [item_name(hdd), capacity, 'HDD', 'TB', '3.5']
+
+def motherboard_row(board):
+    form_factor = text_of(board.find('span', class_='size'))
+    socket = text_of(board.find('span', class_='socket'))
+
+    # ram_slots sits inside the hidden d-hide span
+    ram_slots = ''
+    d_hide = board.find('span', class_='d-hide')
+    if d_hide:
+        ram_slots = text_of(d_hide.find('span', class_='ramslots'))
+    return [item_name(board), form_factor, socket, ram_slots]
+
+def psu_row(psu):
+    psu_type = text_of(psu.find('span', class_='size'))
+    watt_span = psu.find('span', class_='watt')
+    wattage = watt_span.text.strip().replace('W', '').strip() if watt_span else ''
+    return [text_of(name_tag(psu)), psu_type, wattage]
+
+def ram_row(ram):
+    speed = text_of(ram.find('span', class_='type'))
+    size = ram.find('span', class_='size')
+    size = size.text.strip().replace('GB', '').strip() if size else ''
+
+    # "Kit of #" can be in any span
+    stick = ''
+    for span in ram.find_all('span'):
+        if 'Kit of' in span.text:
+            match = re.search(r'Kit of (\d+)', span.text)
+            if match:
+                stick = match.group(1)
+                break
+    return [item_name(ram), speed, size, stick]
+
+def ssd_row(ssd):
+    size_span = ssd.find('span', class_='size')
+    raw_capacity = 0
+    unit = 'GB'
+    if size_span:
+        match = re.search(r'(\d+)', size_span.text.replace(',', ''))
+        if match:
+            raw_capacity = int(match.group(1))
+            if raw_capacity >= 1000:
+                raw_capacity = raw_capacity // 1000
+                unit = 'TB'
+
+    form_factor = '2.5'
+    full_text = ssd.text.lower()
+    if 'nvm' in full_text or 'm.2' in full_text:
+        form_factor = 'm.2'
+    return [item_name(ssd), str(raw_capacity), 'SSD', unit, form_factor]
+
+# Cases need their detail page for dimensions, PSU type and drive bays
+
+def case_links(soup):
+    return [a for a in soup.find_all('a', href=True) if a.find('h5', class_='name')]
+
+def case_row(a_tag):
+    name = a_tag.find('h5', class_='name').text.strip()
+    detail_url = a_tag['href'].strip().replace(" ", "%20")
+    if not detail_url.startswith("http"):
+        detail_url = PC_KOMBO + detail_url
+    case_type = text_of(a_tag.find('span', class_='size'))
+    return [name, case_type], detail_url
+
+def spec_table(section) -> Dict[str, str]:
+    card_body = section.find('div', class_='card-body')
+    dl = card_body.find('dl') if card_body else None
+    if not dl:
+        return {}
+    return {
+        dt.text.strip().lower(): dd.text.strip()
+        for dt, dd in zip(dl.find_all('dt'), dl.find_all('dd'))
+    }
+
+def case_detail(url: str, html: str):
+    """(dimensions, psu_type, drive_bays_total) from a case detail page"""
+    dimensions = psu_type = ''
+    drive_bays_total = 0
+    spec_sections = make_soup(html, CASE_DETAIL_ONLY).select('section.card.column.col-3.col-md-12')
+
+    # Dimensions and PSU are in the 2nd section
+    if len(spec_sections) >= 2:
+        specs = spec_table(spec_sections[1])
+        w = specs.get('width', '').strip()
+        h = specs.get('height', '').strip()
+        d = specs.get('depth', '').strip()
+        if w and h and d:
+            dimensions = f"{w} x {h} x {d}"
+        psu_type = specs.get('psu', '').strip() or specs.get('power supply', '').strip()
+
+    # Drive bays are in the 4th section
+    if len(spec_sections) >= 4:
+        specs = spec_table(spec_sections[3])
+        for key in ['2.5"', '3.5"', '2.5"/3.5"']:
+            val = specs.get(key, '0').split()[0]
+            drive_bays_total += int(val) if val.isdigit() else 0
+
+    return dimensions, psu_type, drive_bays_total
+
+# Price rows share one layout across categories
+
+PRICE_NAME_COLUMN = {'col-10', 'col-lg-8', 'col-sm-12'}
+PRICE_COLUMN = {'col-1', 'col-lg-2', 'col-sm-4', 'text-right'}
+
+def column_tag(item, classes):
+    """First div.column carrying all `classes`; cheaper than a CSS selector per item"""
+    for div in item.find_all('div', class_='column'):
+        if classes.issubset(div.get('class', ())):
+            return div
+    return None
+
+def linked_tag(column, name: str, class_: str):
+    """First <name class=class_> inside a link in `column` (CSS: `column a name.class_`)"""
+    if column is None:
+        return None
+    for tag in column.find_all(name, class_=class_):
+        if tag.find_parent('a') is not None:
+            return tag
+    return None
+
+def price_row(item):
+    name_tag = linked_tag(column_tag(item, PRICE_NAME_COLUMN), 'h5', 'name')
+    if not name_tag:
+        return None
+    price_tag = linked_tag(column_tag(item, PRICE_COLUMN), 'span', 'price')
+    if not price_tag:
+        return None  # skip no price
+    price = price_tag.text.strip().replace('USD ', '').replace(',', '')
+    return [name_tag.text.strip(), float(price)]
+
+def passmark_row(gpu):
+    chipset = text_of(gpu.find('span', class_='prdname'))
+    score_span = gpu.find('span', class_='count')
+    score = score_span.text.strip().replace(',', '') if score_span else ''
+    return [chipset, score]
+
+SPEC_CATEGORIES = {
+    # name: (listing slug, header, row)
+    'cpu': ('cpus', ['name', 'microarchitecture', 'core_clock', 'boost_clock', 'cores'], cpu_row),
+    'fan': ('cpucoolers', ['name', 'supported_socket', 'type'], fan_row),
+    'gpu': ('gpus', ['name', 'chipset', 'vram', 'tdp'], gpu_row),
+    'hdd': ('hdds', ['name', 'capacity', 'type', 'unit', 'form_factor'], hdd_row),
+    'motherboard': ('motherboards', ['name', 'form_factor', 'socket', 'ram_slots'], motherboard_row),
+    'psu': ('psus', ['name', 'type', 'wattage'], psu_row),
+    'ram': ('rams', ['name', 'speed', 'size', 'stick'], ram_row),
+    'ssd': ('ssds', ['name', 'capacity', 'type', 'unit', 'form_factor'], ssd_row),
+}
+
+PRICE_SLUGS = {
+    'case': 'cases',
+    'cpu': 'cpus',
+    'fan': 'cpucoolers',
+    'gpu': 'gpus',
+    'hdd': 'hdds',
+    'motherboard': 'motherboards',
+    'psu': 'psus',
+    'ram': 'rams',
+    'ssd': 'ssds',
+}
+
+PASSMARK_TIERS = {
+    'high': 'high_end_gpus',
+    'mid': 'mid_range_gpus',
+    'midlow': 'midlow_range_gpus',
+    'low': 'low_end_gpus',
+}
+
+def build_extractors() -> Dict[str, Extractor]:
+    extractors = {}
+    for name, (slug, header, row) in SPEC_CATEGORIES.items():
+        extractors[name] = Extractor(name, PC_KOMBO_LISTING.format(slug), 'pc-kombo',
+                                     f'scraped_{name}.csv', header, subtitles, row, within=subtitle_in,
+                                     category=name, parse_only=PC_KOMBO_LISTING_ONLY)
+    extractors['case'] = Extractor('case', PC_KOMBO_LISTING.format('cases'), 'pc-kombo', 'scraped_case.csv',
+                                   ['name', 'type', 'dimensions', 'psu_type', 'bays'],
+                                   case_links, case_row, detail=case_detail, within=case_link_in,
+                                   category='case', parse_only=PC_KOMBO_LISTING_ONLY)
+    for name, slug in PRICE_SLUGS.items():
+        extractors[f'price_{name}'] = Extractor(f'price_{name}', PC_KOMBO_LISTING.format(slug), 'price',
+                                                f'scraped_prices_{name}.csv', ['name', 'price'],
+                                                listing_columns, price_row, within=listing_item_itself,
+                                                category=name, parse_only=PC_KOMBO_LISTING_ONLY)
+    for tier, page in PASSMARK_TIERS.items():
+        extractors[f'gpu_score_{tier}'] = Extractor(f'gpu_score_{tier}', PASSMARK_LISTING.format(page), 'passmark',
+                                                    f'scraped_gpu_score_{tier}.csv', ['chipset', 'benchmark'],
+                                                    chartlist, passmark_row, category='gpu_chipset',
+                                                    parse_only=PASSMARK_LISTING_ONLY)
+    return extractors
+
+EXTRACTORS = build_extractors()
@@ -0,0 +1,122 @@
+"""On-disk HTTP cache for the scrapers.
+
+Each URL maps to <slug>.html (the last body) and <slug>.json (ETag,
+Last-Modified, fetch time and any parse results stored for that body). The
+crawler uses the validators for conditional requests; on a 304 the stored
+parse results are reused, so unchanged pages are neither downloaded nor
+parsed. The same directory can be replayed offline; a `read_only` cache
+(replay, the parse benchmark's fixtures) never writes to it.
+"""
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, TextIO
+from urllib.parse import urlsplit
+
+def url_slug(url: str) -> str:
+    parts = urlsplit(url)
+    slug = re.sub(r'[^A-Za-z0-9.-]+', '_', parts.netloc + parts.path + ('?' + parts.query if parts.query else ''))
+    return slug.strip('_')
+
+def _write_atomic(path: Path, text: str):
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(text, encoding='utf-8')
+    tmp.replace(path)
+
+class HttpCache:
+    def __init__(self, directory: str, read_only: bool = False):
+        self.directory = Path(directory)
+        self.read_only = read_only
+        if not read_only:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def body_path(self, url: str) -> Path:
+        return self.directory / f"{url_slug(url)}.html"
+
+    def meta_path(self, url: str) -> Path:
+        return self.directory / f"{url_slug(url)}.json"
+
+    def meta(self, url: str) -> Dict[str, Any]:
+        try:
+            with open(self.meta_path(url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def body(self, url: str) -> Optional[str]:
+        try:
+            return self.body_path(url).read_text(encoding='utf-8')
+        except OSError:
+            return None
+
+    def iter_body(self, url: str, chunk_size: int = 64 * 1024) -> Iterator[str]:
+        with open(self.body_path(url), 'r', encoding='utf-8') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for the cached copy, if there is one"""
+        if not self.body_path(url).exists():
+            return {}
+        meta = self.meta(url)
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def store(self, url: str, text: str, etag: str = None, last_modified: str = None):
+        """Save a new body; parse results of the previous body are dropped"""
+        self._check_writable()
+        _write_atomic(self.body_path(url), text)
+        self._store_meta(url, etag, last_modified)
+
+    def open_body(self, url: str) -> TextIO:
+        """Temporary file for a body that is streamed in; finish with commit_body"""
+        self._check_writable()
+        path = self.body_path(url)
+        return open(path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"), 'w', encoding='utf-8')
+
+    def commit_body(self, url: str, file: TextIO, etag: str = None, last_modified: str = None):
+        file.close()
+        Path(file.name).replace(self.body_path(url))
+        self._store_meta(url, etag, last_modified)
+
+    def _store_meta(self, url: str, etag: str, last_modified: str):
+        self._write_meta(url, {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.time(),
+            'parsed': {}
+        })
+
+    def touch(self, url: str):
+        """Record a successful revalidation (304)"""
+        meta = self.meta(url)
+        meta['validated_at'] = time.time()
+        self._write_meta(url, meta)
+
+    def parsed(self, url: str, key: str) -> Any:
+        return self.meta(url).get('parsed', {}).get(key)
+
+    def store_parsed(self, url: str, key: str, value: Any):
+        meta = self.meta(url)
+        meta.setdefault('url', url)
+        meta.setdefault('parsed', {})[key] = value
+        self._write_meta(url, meta)
+
+    def _check_writable(self):
+        if self.read_only:
+            raise PermissionError(f"{self.directory} is a read-only cache")
+
+    def _write_meta(self, url: str, meta: Dict[str, Any]):
+        self._check_writable()
+        _write_atomic(self.meta_path(url), json.dumps(meta, ensure_ascii=False))
@@ -0,0 +1,264 @@
+"""The original per-category scripts' parsing, kept as the benchmark baseline.
+
+Each row function is the loop body of the pc-kombo/, price/ or passmark/
+script it is named after, unchanged except that it returns the row instead of
+writing it. bench_parse.py times these against the extractors and checks both
+produce the same rows.
+"""
+import re
+from typing import Any, Callable, List, Tuple
+from bs4 import BeautifulSoup
+
+def subtitle_rows(row: Callable[[Any], List]) -> Callable[[str], List[List]]:
+    """The pc-kombo spec scripts' loop: one row per div.subtitle, failing items skipped"""
+    def rows(html: str) -> List[List]:
+        soup = BeautifulSoup(html, 'html.parser')
+        result = []
+        for item in soup.find_all('div', class_='subtitle'):
+            try:
+                result.append(row(item))
+            except Exception:
+                pass
+        return result
+    return rows
+
+def cpu_row(cpu):
+    name = cpu.find_previous('h5', class_='name').text.strip()
+    socket = cpu.find('span', class_='socket').text.strip()
+
+    clock = cpu.find(string=lambda s: "Clock" in s)
+    clock = clock.strip().replace('Clock', '').replace('GHz', '').strip() if clock else ''
+
+    turbo = cpu.find(string=lambda s: "Turbo" in s)
+    turbo = turbo.strip().replace('Turbo', '').replace('GHz', '').strip() if turbo else ''
+
+    cores = cpu.find('span', class_='cores')
+    cores = cores.text.strip() if cores else ''
+    return [name, socket, clock, turbo, cores]
+
+def fan_row(cooler):
+    name_tag = cooler.find_previous('h5', class_='name')
+    name = name_tag.text.strip() if name_tag else 'N/A'
+
+    socket_tag = cooler.find('span', class_='sockets')
+    supported_socket = socket_tag.text.strip().replace("For socket ", "") if socket_tag else 'N/A'
+
+    radiator = cooler.select_one('.radiator')
+    cooler_type = 'AIO' if radiator else 'Air'
+    return [name, supported_socket, cooler_type]
+
+def gpu_row(gpu):
+    name = gpu.find_previous('h5', class_='name').text.strip()
+    chipset = gpu.find('span', class_='series')
+    chipset = chipset.text.strip() if chipset else ''
+
+    vram_text = gpu.find('span', class_='vram')
+    vram = vram_text.text.strip().split(' ')[0] if vram_text else ''
+
+    tdp = ''
+    for span in gpu.find_all('span'):
+        text = span.text.strip()
+        if re.match(r'^\d+\s*W$', text):
+            tdp = text.replace('W', '').strip()
+            break
+    return [name, chipset, vram, tdp]
+
+def hdd_row(hdd):
+    name = hdd.find_previous('h5', class_='name').text.strip()
+
+    size_span = hdd.find('span', class_='size')
+    capacity = ''
+    if size_span:
+        match = re.search(r'(\d+)', size_span.text)
+        if match:
+            capacity = match.group(1)
+    return [name, capacity, 'HDD', 'TB', '3.5']
+
+def motherboard_row(board):
+    name = board.find_previous('h5', class_='name').text.strip()
+
+    form_factor = board.find('span', class_='size')
+    form_factor = form_factor.text.strip() if form_factor else ''
+
+    socket = board.find('span', class_='socket')
+    socket = socket.text.strip() if socket else ''
+
+    ram_slots = ''
+    d_hide = board.find('span', class_='d-hide')
+    if d_hide:
+        ram_span = d_hide.find('span', class_='ramslots')
+        ram_slots = ram_span.text.strip() if ram_span else ''
+    return [name, form_factor, socket, ram_slots]
+
+def psu_row(psu):
+    name_tag = psu.find_previous('h5', class_='name')
+    name = name_tag.text.strip() if name_tag else ''
+
+    type_span = psu.find('span', class_='size')
+    psu_type = type_span.text.strip() if type_span else ''
+
+    watt_span = psu.find('span', class_='watt')
+    wattage = watt_span.text.strip().replace('W', '').strip() if watt_span else ''
+    return [name, psu_type, wattage]
+
+def ram_row(ram):
+    name = ram.find_previous('h5', class_='name').text.strip()
+
+    speed = ram.find('span', class_='type')
+    speed = speed.text.strip() if speed else ''
+
+    size = ram.find('span', class_='size')
+    size = size.text.strip().replace('GB', '').strip() if size else ''
+
+    stick = ''
+    for span in ram.find_all('span'):
+        if 'Kit of' in span.text:
+            match = re.search(r'Kit of (\d+)', span.text)
+            if match:
+                stick = match.group(1)
+                break
+    return [name, speed, size, stick]
+
+def ssd_row(ssd):
+    name = ssd.find_previous('h5', class_='name').text.strip()
+
+    size_span = ssd.find('span', class_='size')
+    raw_capacity = 0
+    unit = 'GB'
+    if size_span:
+        match = re.search(r'(\d+)', size_span.text.replace(',', ''))
+        if match:
+            raw_capacity = int(match.group(1))
+            if raw_capacity >= 1000:
+                raw_capacity = raw_capacity // 1000
+                unit = 'TB'
+
+    form_factor = '2.5'
+    full_text = ssd.text.lower()
+    if 'nvm' in full_text or 'm.2' in full_text:
+        form_factor = 'm.2'
+    return [name, str(raw_capacity), 'SSD', unit, form_factor]
+
+def case_rows(html: str) -> List[Tuple[List, str]]:
+    """scrape_case.py's listing loop; the detail page part is case_detail"""
+    soup = BeautifulSoup(html, 'html.parser')
+    result = []
+    for a_tag in soup.find_all('a', href=True):
+        name_tag = a_tag.find('h5', class_='name')
+        if not name_tag:
+            continue
+        try:
+            name = name_tag.text.strip()
+            detail_url = a_tag['href'].strip().replace(" ", "%20")
+            if not detail_url.startswith("http"):
+                detail_url = "https://www.pc-kombo.com" + detail_url
+
+            type_span = a_tag.find('span', class_='size')
+            case_type = type_span.text.strip() if type_span else ''
+            result.append(([name, case_type], detail_url))
+        except Exception:
+            pass
+    return result
+
+def case_detail(url: str, html: str) -> Tuple[str, str, int]:
+    dimensions = psu_type = ''
+    drive_bays_total = 0
+
+    detail_soup = BeautifulSoup(html, 'html.parser')
+    spec_sections = detail_soup.select('section.card.column.col-3.col-md-12')
+
+    if len(spec_sections) >= 2:
+        section2 = spec_sections[1]
+        card_body2 = section2.find('div', class_='card-body')
+        if card_body2:
+            dl = card_body2.find('dl')
+            if dl:
+                specs = {
+                    dt.text.strip().lower(): dd.text.strip()
+                    for dt, dd in zip(dl.find_all('dt'), dl.find_all('dd'))
+                }
+
+                w = specs.get('width', '').strip()
+                h = specs.get('height', '').strip()
+                d = specs.get('depth', '').strip()
+                if w and h and d:
+                    dimensions = f"{w} x {h} x {d}"
+                psu_type = specs.get('psu', '').strip() or specs.get('power supply', '').strip()
+
+    if len(spec_sections) >= 4:
+        section4 = spec_sections[3]
+        card_body4 = section4.find('div', class_='card-body')
+        if card_body4:
+            dl = card_body4.find('dl')
+            if dl:
+                specs = {
+                    dt.text.strip().lower(): dd.text.strip()
+                    for dt, dd in zip(dl.find_all('dt'), dl.find_all('dd'))
+                }
+                for key in ['2.5"', '3.5"', '2.5"/3.5"']:
+                    val = specs.get(key, '0').split()[0]
+                    drive_bays_total += int(val) if val.isdigit() else 0
+
+    return dimensions, psu_type, drive_bays_total
+
+def price_rows(html: str) -> List[List]:
+    """The price/scrape_price_*.py loop, the same for every category"""
+    soup = BeautifulSoup(html, 'html.parser')
+    result = []
+    for gpu in soup.find_all('li', class_='columns'):
+        try:
+            name_tag = gpu.select_one('div.column.col-10.col-lg-8.col-sm-12 a h5.name')
+            if not name_tag:
+                continue
+            name = name_tag.text.strip()
+
+            price_tag = gpu.select_one('div.column.col-1.col-lg-2.col-sm-4.text-right a span.price')
+            if not price_tag:
+                continue
+
+            price = price_tag.text.strip()
+            price = price.replace('USD ', '').replace(',', '')
+            result.append([name, float(price)])
+        except Exception:
+            pass
+    return result
+
+def passmark_rows(html: str) -> List[List]:
+    """passmark/scrape_gpu_score.py's loop, the same for every tier"""
+    soup = BeautifulSoup(html, 'html.parser')
+    gpu_list = soup.find('ul', class_='chartlist')
+    result = []
+    for gpu in gpu_list.find_all('li'):
+        try:
+            chipset_span = gpu.find('span', class_='prdname')
+            chipset = chipset_span.text.strip() if chipset_span else ''
+
+            score_span = gpu.find('span', class_='count')
+            score = score_span.text.strip().replace(',', '') if score_span else ''
+            result.append([chipset, score])
+        except Exception:
+            pass
+    return result
+
+SPEC_ROWS = {
+    'cpu': cpu_row,
+    'fan': fan_row,
+    'gpu': gpu_row,
+    'hdd': hdd_row,
+    'motherboard': motherboard_row,
+    'psu': psu_row,
+    'ram': ram_row,
+    'ssd': ssd_row,
+}
+
+def legacy_parser(extractor_name: str) -> Callable[[str], List]:
+    """Rows of one extractor's page, the way its original script parsed it"""
+    if extractor_name in SPEC_ROWS:
+        return subtitle_rows(SPEC_ROWS[extractor_name])
+    if extractor_name == 'case':
+        return case_rows
+    if extractor_name.startswith('price_'):
+        return price_rows
+    if extractor_name.startswith('gpu_score_'):
+        return passmark_rows
+    raise KeyError(extractor_name)
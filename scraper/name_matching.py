@@ -0,0 +1,173 @@
+"""Fuzzy name matching between scraped sources.
+
+Price listings and spec listings don't always spell a product the same way
+("be quiet! Pure Loop 2 FX 240mm" vs "be quiet! Pure Loop 2 FX"), and pc-kombo
+chipsets carry memory suffixes PassMark lacks ("Radeon RX 570 (4GB)" vs
+"Radeon RX 470/570"). NameIndex resolves these without comparing every pair:
+
+- names are normalized into tokens ("(16GB)" -> "16gb", "470/570" -> "470", "570")
+- an inverted index maps each token to the candidates containing it
+- a query only scores candidates sharing one of its rarer tokens, using an
+  IDF-weighted Dice coefficient as the confidence
+- model numbers (tokens with digits, other than sizes like "16gb" or "240mm")
+  in the query must all appear in the candidate, so "RTX 4060" never matches
+  "RTX 4070"
+- variant words ("Ti", "Super", "XT", "XTX", "X3D", ...) must be the same on
+  both sides, so "RTX 4060" never matches "RTX 4060 Ti" and "RX 7900 XT"
+  never matches "RX 7900 XTX"
+
+Exact normalized matches skip the index entirely, and resolved mappings are
+cached on disk per candidate set and MATCHER_VERSION.
+"""
+import hashlib
+import json
+import math
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Any
+
+TOKEN = re.compile(r'[a-z0-9]+(?:\.[0-9]+)?')
+SIZE = re.compile(r'^\d+(gb|mb|tb|mm|w)$')
+# Tokens this common only narrow the search when nothing rarer is present
+MAX_POSTING_FRACTION = 0.2
+DEFAULT_THRESHOLD = 0.6
+# Words that name a different product of the same model number
+VARIANT_WORDS = frozenset({'ti', 'super', 'xt', 'xtx', 'gre', 'x3d', 'ks', 'kf'})
+# Bump when matching rules change, so cached mappings are recomputed
+MATCHER_VERSION = 2
+
+def tokens(name: str) -> List[str]:
+    text = name.lower()
+    # "16 GB" -> "16gb", "240 mm" -> "240mm" so sizes are one token
+    text = re.sub(r'(\d+)\s+(gb|mb|tb|mm|w)\b', r'\1\2', text)
+    return TOKEN.findall(text)
+
+def match_key(name: str) -> str:
+    """Normalized form two names share when they match exactly"""
+    return ' '.join(tokens(name))
+
+def is_model_number(token: str) -> bool:
+    return any(c.isdigit() for c in token) and not SIZE.match(token)
+
+class NameIndex:
+    def __init__(self, candidates: Iterable[str]):
+        self.candidates: List[str] = list(dict.fromkeys(candidates))
+        self._exact: Dict[str, str] = {}
+        self._tokens: List[Set[str]] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for i, name in enumerate(self.candidates):
+            toks = set(tokens(name))
+            self._tokens.append(toks)
+            self._exact.setdefault(match_key(name), name)
+            for token in toks:
+                self._postings[token].append(i)
+        n = max(1, len(self.candidates))
+        self._idf = {token: math.log(1 + n / len(ids)) for token, ids in self._postings.items()}
+        self._common = max(1, int(n * MAX_POSTING_FRACTION))
+        self._missing_idf = math.log(1 + n)
+
+    def weight(self, toks: Iterable[str]) -> float:
+        return sum(self._idf.get(token, self._missing_idf) for token in toks)
+
+    def match(self, query: str) -> Optional[Tuple[str, float]]:
+        """(candidate, confidence in 0..1) for the best match, or None"""
+        exact = self._exact.get(match_key(query))
+        if exact is not None:
+            return exact, 1.0
+
+        toks = set(tokens(query))
+        if not toks:
+            return None
+        known = [token for token in toks if token in self._postings]
+        rare = [token for token in known if len(self._postings[token]) <= self._common] or known
+        ids = {i for token in rare for i in self._postings[token]}
+
+        models = {token for token in toks if is_model_number(token)}
+        variants = toks & VARIANT_WORDS
+        query_weight = self.weight(toks)
+        best, best_score = None, 0.0
+        for i in ids:
+            candidate_tokens = self._tokens[i]
+            if not models.issubset(candidate_tokens) or candidate_tokens & VARIANT_WORDS != variants:
+                continue
+            shared = self.weight(toks & candidate_tokens)
+            score = 2 * shared / (query_weight + self.weight(candidate_tokens))
+            if score > best_score or (score == best_score and best is not None and i < best):
+                best, best_score = i, score
+        if best is None:
+            return None
+        return self.candidates[best], round(best_score, 4)
+
+def fingerprint(names: Iterable[str]) -> str:
+    text = '\n'.join([f'matcher:{MATCHER_VERSION}'] + sorted(set(names)))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+class MatchCache:
+    """Resolved mappings per kind, reused while the candidate set is unchanged"""
+    def __init__(self, path: Optional[Path]):
+        self.path = Path(path) if path else None
+        self.data: Dict[str, Dict[str, Any]] = {}
+        if self.path and self.path.exists():
+            try:
+                self.data = json.loads(self.path.read_text(encoding='utf-8'))
+            except (OSError, json.JSONDecodeError):
+                self.data = {}
+
+    def get(self, kind: str, candidates_fingerprint: str) -> Dict[str, Any]:
+        entry = self.data.get(kind)
+        if entry is None or entry.get('fingerprint') != candidates_fingerprint:
+            return {}
+        return entry['matches']
+
+    def put(self, kind: str, candidates_fingerprint: str, matches: Dict[str, Any]):
+        self.data[kind] = {'fingerprint': candidates_fingerprint, 'matches': matches}
+
+    def save(self):
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + '.tmp')
+        tmp.write_text(json.dumps(self.data, ensure_ascii=False, sort_keys=True), encoding='utf-8')
+        tmp.replace(self.path)
+
+def resolve(kind: str, queries: Iterable[str], candidates: Iterable[str], threshold: float = DEFAULT_THRESHOLD,
+            cache: MatchCache = None) -> Tuple[Dict[str, Tuple[str, float]], Dict[str, Any]]:
+    """Map each query to a candidate; returns (matches, report).
+
+    The report counts exact, fuzzy, cached and unmatched queries and lists the
+    unmatched ones and the lowest-confidence accepted matches for review.
+    """
+    candidates = list(candidates)
+    candidates_fingerprint = fingerprint(candidates)
+    cached = cache.get(kind, candidates_fingerprint) if cache else {}
+    index = None
+
+    matches: Dict[str, Tuple[str, float]] = {}
+    resolved: Dict[str, Any] = {}
+    report = {'queries': 0, 'exact': 0, 'fuzzy': 0, 'cached': 0, 'unmatched': []}
+    for query in dict.fromkeys(queries):
+        report['queries'] += 1
+        if query in cached:
+            result = cached[query]
+            report['cached'] += 1
+        else:
+            if index is None:
+                index = NameIndex(candidates)
+            result = index.match(query)
+        resolved[query] = result
+        if result is None or result[1] < threshold:
+            report['unmatched'].append(query if result is None else {'query': query, 'best': result[0],
+                                                                     'confidence': result[1]})
+            continue
+        matches[query] = (result[0], result[1])
+        if query not in cached:
+            report['exact' if result[1] == 1.0 else 'fuzzy'] += 1
+
+    if cache is not None:
+        cache.put(kind, candidates_fingerprint, resolved)
+    report['lowest_confidence'] = sorted(
+        ({'query': q, 'match': m, 'confidence': c} for q, (m, c) in matches.items() if c < 1.0),
+        key=lambda item: item['confidence']
+    )[:10]
+    return matches, report
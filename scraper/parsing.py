@@ -0,0 +1,30 @@
+"""HTML parser selection for the extractors.
+
+lxml builds BeautifulSoup trees several times faster than the stdlib
+html.parser and is used when installed. Listing pages can also be parsed
+with a SoupStrainer so only the item containers are built into the tree.
+"""
+from typing import Any, Callable, Optional
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_PARSER = 'html.parser'
+
+def make_soup(html: str, parse_only: Optional[SoupStrainer] = None, parser: str = None) -> BeautifulSoup:
+    return BeautifulSoup(html, parser or DEFAULT_PARSER, parse_only=parse_only)
+
+def has_class(name: str) -> Callable[[Any], bool]:
+    """class_ matcher for strainers, which see the raw attribute ("card column col-3"), not the class list"""
+    def match(value) -> bool:
+        if not value:
+            return False
+        return name in (value.split() if isinstance(value, str) else value)
+    return match
+
+# Everything the pc-kombo extractors read sits inside these containers
+PC_KOMBO_LISTING_ONLY = SoupStrainer('li', class_=has_class('columns'))
+PASSMARK_LISTING_ONLY = SoupStrainer('ul', class_=has_class('chartlist'))
+CASE_DETAIL_ONLY = SoupStrainer('section', class_=has_class('card'))
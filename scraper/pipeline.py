@@ -0,0 +1,274 @@
+"""One-command catalog refresh.
+
+    python pipeline.py                      # every category
+    python pipeline.py cpu gpu price_gpu    # a subset
+
+All categories run concurrently through a single Crawler, so requests to the
+same host share one connection pool and one politeness budget, and a full
+refresh takes about as long as the slowest category. Categories reading the
+same page (a pc-kombo listing carries both specs and prices) share one
+download and one parse. Each CSV is written to <output-dir>/<folder>/<file>,
+the same layout the per-category scripts used.
+
+    python pipeline.py --cache .http_cache             # conditional requests, unchanged pages aren't re-parsed
+    python pipeline.py --cache .http_cache --replay    # re-run the parsers on cached pages, no network
+    python pipeline.py --incremental                   # rewrite only changed CSVs, log row deltas
+    python pipeline.py --stream                        # extract while downloading, flat memory
+
+In incremental mode each fresh scrape is compared with the CSV on disk;
+inserts, updates and deletions keyed by stable part ID are appended to
+<output-dir>/changelog.jsonl (see changes.py) and unchanged CSVs are left alone.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple, Any
+
+import changes
+import crawler
+import streaming
+from extractors import EXTRACTORS, Extractor, listing_columns
+from parsing import make_soup
+
+SCRAPER_DIR = Path(__file__).resolve().parent
+
+def parse_item(extractor: Extractor, item, rows: List[List[Any]]):
+    try:
+        row = extractor.row(item)
+    except Exception as e:
+        print(f"[{extractor.name}] Error parsing item:", e, file=sys.stderr)
+        return
+    if row is not None:
+        rows.append(row)
+
+def fetch_details(client: crawler.Crawler, extractor: Extractor, rows: List) -> List[List[Any]]:
+    details = client.map(extractor.detail, [detail_url for _, detail_url in rows])
+    complete = []
+    for (partial, _), (detail_url, detail, error) in zip(rows, details):
+        if error is not None:
+            print(f"[{extractor.name}] Error parsing {detail_url}:", error, file=sys.stderr)
+            continue
+        complete.append(partial + list(detail))
+    return complete
+
+def extract_rows(extractors: List[Extractor], html: str, parser: str = None,
+                 strain: bool = True) -> Dict[str, List[List[Any]]]:
+    """Rows for every extractor reading this page, from a single parse of it.
+
+    When several extractors share a pc-kombo listing (specs and prices) the
+    `li.columns` entries are walked once and each entry feeds all of them.
+    If they agree on a `parse_only` strainer, only those nodes are built.
+    """
+    strainers = {id(e.parse_only): e.parse_only for e in extractors}
+    parse_only = next(iter(strainers.values())) if strain and len(strainers) == 1 else None
+    soup = make_soup(html, parse_only, parser)
+    rows = {e.name: [] for e in extractors}
+
+    listing = listing_columns(soup) if len(extractors) > 1 and all(e.within for e in extractors) else []
+    if listing:
+        for entry in listing:
+            for extractor in extractors:
+                item = extractor.within(entry)
+                if item is not None:
+                    parse_item(extractor, item, rows[extractor.name])
+    else:
+        for extractor in extractors:
+            for item in extractor.items(soup):
+                parse_item(extractor, item, rows[extractor.name])
+    return rows
+
+class CsvSink:
+    """Writes rows to a temporary CSV as they arrive; `commit` moves it into place"""
+    def __init__(self, path: Path, header: List[str]):
+        self.path = path
+        self.tmp = path.with_suffix(path.suffix + '.tmp')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.tmp, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(header)
+        self.rows = 0
+
+    def write(self, row: List[Any]):
+        self._writer.writerow(row)
+        self.rows += 1
+
+    def close(self):
+        self._file.close()
+
+    def commit(self):
+        self.close()
+        self.tmp.replace(self.path)
+
+    def discard(self):
+        self.close()
+        self.tmp.unlink(missing_ok=True)
+
+def write_csv(path: Path, header: List[str], rows: List[List[Any]]):
+    sink = CsvSink(path, header)
+    for row in rows:
+        sink.write(row)
+    sink.commit()
+
+def write_incremental(extractor: Extractor, output: Path, rows: List[List[Any]],
+                      changelog: changes.Changelog) -> Dict[str, Any]:
+    """Log row deltas against the existing CSV and rewrite it only if something changed"""
+    previous = changes.read_rows(output)
+    old_rows = previous[1] if previous else []
+    if not rows and old_rows:
+        # An empty scrape is far more likely a markup change than a wiped catalog
+        raise RuntimeError(f"no rows extracted; keeping the {len(old_rows)} existing rows")
+    delta = changes.diff(extractor.category or extractor.name, extractor.header, old_rows, rows)
+    if delta or previous is None:
+        write_csv(output, extractor.header, rows)
+    changelog.append(extractor.name, delta)
+    return changes.summarize(delta)
+
+def run_page(client: crawler.Crawler, url: str, jobs: List[Tuple[Extractor, Path]],
+             changelog: changes.Changelog = None) -> List[Dict[str, Any]]:
+    """Fetch one page and write the CSV of every extractor that reads it"""
+    started = time.perf_counter()
+    try:
+        extractors = [extractor for extractor, _ in jobs]
+        key = 'rows:' + ','.join(extractor.name for extractor in extractors)
+        rows = client.fetch_parsed(url, key, lambda _, html: extract_rows(extractors, html))
+        for extractor in extractors:
+            if extractor.detail is not None:
+                rows[extractor.name] = fetch_details(client, extractor, rows[extractor.name])
+    except Exception as e:
+        print(f"[{url}] Failed: {e}", file=sys.stderr)
+        return [{'name': extractor.name, 'rows': 0, 'error': str(e)} for extractor, _ in jobs]
+
+    results = []
+    for extractor, output in jobs:
+        result = {
+            'name': extractor.name,
+            'rows': len(rows[extractor.name]),
+            'output': str(output),
+            'seconds': round(time.perf_counter() - started, 2)
+        }
+        if changelog is None:
+            write_csv(output, extractor.header, rows[extractor.name])
+        else:
+            try:
+                result.update(write_incremental(extractor, output, rows[extractor.name], changelog))
+            except Exception as e:
+                print(f"[{extractor.name}] Failed: {e}", file=sys.stderr)
+                result['error'] = str(e)
+        results.append(result)
+    return results
+
+def stream_page(client: crawler.Crawler, url: str, jobs: List[Tuple[Extractor, Path]],
+                changelog: changes.Changelog = None) -> List[Dict[str, Any]]:
+    """Like run_page, but rows go to their CSV while the page is still downloading.
+
+    Only detail-page categories hold their (small) partial rows until the
+    listing is done.
+    """
+    started = time.perf_counter()
+    extractors = [extractor for extractor, _ in jobs]
+    sinks = {extractor.name: CsvSink(output, extractor.header) for extractor, output in jobs}
+    pending: Dict[str, List] = {extractor.name: [] for extractor in extractors if extractor.detail is not None}
+    try:
+        for extractor, row in streaming.stream_rows(url, client.stream(url), extractors):
+            if extractor.name in pending:
+                pending[extractor.name].append(row)
+            else:
+                sinks[extractor.name].write(row)
+        for extractor in extractors:
+            if extractor.detail is not None:
+                for row in fetch_details(client, extractor, pending.pop(extractor.name)):
+                    sinks[extractor.name].write(row)
+    except Exception as e:
+        for sink in sinks.values():
+            sink.discard()
+        print(f"[{url}] Failed: {e}", file=sys.stderr)
+        return [{'name': extractor.name, 'rows': 0, 'error': str(e)} for extractor in extractors]
+
+    results = []
+    for extractor, output in jobs:
+        sink = sinks[extractor.name]
+        result = {
+            'name': extractor.name,
+            'rows': sink.rows,
+            'output': str(output),
+            'seconds': round(time.perf_counter() - started, 2)
+        }
+        if changelog is None:
+            sink.commit()
+        else:
+            sink.close()
+            rows = changes.read_rows(sink.tmp)[1]
+            sink.discard()
+            try:
+                result.update(write_incremental(extractor, output, rows, changelog))
+            except Exception as e:
+                print(f"[{extractor.name}] Failed: {e}", file=sys.stderr)
+                result['error'] = str(e)
+        results.append(result)
+    return results
+
+def run(names: List[str], client: crawler.Crawler, output_dir: Path = SCRAPER_DIR,
+        flat: bool = False, changelog: changes.Changelog = None, stream: bool = False) -> List[Dict[str, Any]]:
+    """Run the named extractors concurrently; `flat` writes every CSV directly into output_dir.
+
+    With a changelog, CSVs are updated incrementally (see write_incremental).
+    With `stream`, pages with a streaming split are extracted as they download.
+    """
+    pages: Dict[str, List[Tuple[Extractor, Path]]] = {}
+    for name in names:
+        extractor = EXTRACTORS[name]
+        output = output_dir / extractor.filename if flat else output_dir / extractor.folder / extractor.filename
+        pages.setdefault(extractor.url, []).append((extractor, output))
+
+    # Page jobs get their own threads; detail fetches go through the crawler's pool
+    with ThreadPoolExecutor(max_workers=len(pages) or 1, thread_name_prefix='page') as executor:
+        def run_one(page):
+            url, jobs = page
+            if stream and streaming.splitter_for(url) is not None:
+                return stream_page(client, url, jobs, changelog)
+            return run_page(client, url, jobs, changelog)
+        results = executor.map(run_one, pages.items())
+        return [result for page_results in results for result in page_results]
+
+def main(argv: List[str] = None, flat: bool = False):
+    parser = argparse.ArgumentParser(description='Scrape the part catalog')
+    parser.add_argument('categories', nargs='*', help=f"default: all of {', '.join(EXTRACTORS)}")
+    parser.add_argument('--output-dir', default=None,
+                        help='root for <folder>/<file>.csv outputs (default: the scraper directory)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='only rewrite changed CSVs and append row deltas to the changelog')
+    parser.add_argument('--changelog', default=None, help='default: <output-dir>/changelog.jsonl')
+    parser.add_argument('--stream', action='store_true',
+                        help='extract listing pages while they download, keeping memory flat')
+    crawler.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    names = args.categories or list(EXTRACTORS)
+    unknown = [name for name in names if name not in EXTRACTORS]
+    if unknown:
+        parser.error(f"unknown categories: {', '.join(unknown)}")
+    output_dir = Path(args.output_dir) if args.output_dir else (Path(os.getcwd()) if flat else SCRAPER_DIR)
+
+    changelog = None
+    if args.incremental:
+        changelog = changes.Changelog(Path(args.changelog) if args.changelog else output_dir / 'changelog.jsonl')
+
+    started = time.perf_counter()
+    with crawler.from_args(args) as client:
+        results = run(names, client, output_dir, flat, changelog, args.stream)
+        crawler.report(client, started)
+    print(json.dumps(results, indent=2))
+    if any('error' in r for r in results):
+        sys.exit(1)
+
+def run_standalone(*names: str):
+    """Entry point for the per-category scripts: CSVs go to the working directory"""
+    main(list(names) + sys.argv[1:], flat=True)
+
+if __name__ == '__main__':
+    main()
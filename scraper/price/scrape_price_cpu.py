@@ -1,38 +1,9 @@
-from bs4 import BeautifulSoup
-import requests
-import csv
+import os
+import sys
 
-url = "https://www.pc-kombo.com/us/components/cpus"
-page = requests.get(url)
-soup = BeautifulSoup(page.text, 'html.parser')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline import run_standalone
 
-with open('scraped_prices_cpu.csv', 'w', newline='', encoding='utf-8') as file:
-    writer = csv.writer(file)
-    writer.writerow(['name', 'price'])
-    
-    gpu_items = soup.find_all('li', class_='columns')
-
-    for gpu in gpu_items:
-        try:
-            name_tag = gpu.select_one(
-                'div.column.col-10.col-lg-8.col-sm-12 a h5.name'
-            )
-            if not name_tag:
-                continue
-            name = name_tag.text.strip()
-
-            price_tag = gpu.select_one(
-                'div.column.col-1.col-lg-2.col-sm-4.text-right a span.price'
-            )
-            if not price_tag:
-                continue  # skip no price
-
-            price = price_tag.text.strip()
-            price = price.replace('USD ', '').replace(',', '')
-            price = float(price)
-
-            writer.writerow([name, price])
-            print(f"{name} - {price}")
-
-        except Exception as e:
-            print("Error parsing item:", e)
+# Extractor definitions live in ../extractors.py; run ../pipeline.py to refresh every category at once
+if __name__ == '__main__':
+    run_standalone('price_cpu')
@@ -0,0 +1,137 @@
+"""Streaming extraction for listing pages.
+
+ListingSplitter is an event-based HTMLParser that is fed the response in
+chunks and cuts out one item container at a time (a pc-kombo `li.columns`, a
+PassMark chartlist `li`). Each fragment is parsed on its own and turned into
+rows immediately, so memory is bounded by one item rather than by the page:
+neither the full text nor the full tree is ever held.
+
+It assumes item containers are closed explicitly, which both sites do.
+"""
+import sys
+from html.parser import HTMLParser
+from typing import Iterable, Iterator, List, Optional, Tuple, Any
+from urllib.parse import urlsplit
+
+from extractors import Extractor
+from parsing import make_soup
+
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+                 'param', 'source', 'track', 'wbr'}
+
+# (container, item) per site; each is (tag, class or None)
+SPLITS = {
+    'www.pc-kombo.com': (None, ('li', 'columns')),
+    'www.videocardbenchmark.net': (('ul', 'chartlist'), ('li', None)),
+}
+
+def _matches(spec: Tuple[str, Optional[str]], tag: str, attrs: List[Tuple[str, str]]) -> bool:
+    name, class_ = spec
+    if tag != name:
+        return False
+    if class_ is None:
+        return True
+    classes = next((value or '' for key, value in attrs if key == 'class'), '')
+    return class_ in classes.split()
+
+class ListingSplitter(HTMLParser):
+    def __init__(self, item: Tuple[str, Optional[str]], container: Tuple[str, Optional[str]] = None):
+        super().__init__(convert_charrefs=False)
+        self.item = item
+        self.container = container
+        self._container_depth = 0 if container else None
+        self._parts: List[str] = []
+        self._depth = 0
+        self._done: List[str] = []
+
+    def feed(self, data: str) -> List[str]:
+        """Feed a chunk and return the item fragments completed by it"""
+        super().feed(data)
+        done, self._done = self._done, []
+        return done
+
+    def close(self) -> List[str]:
+        """Flush buffered input and return any fragments it completed"""
+        super().close()
+        done, self._done = self._done, []
+        return done
+
+    def _in_container(self) -> bool:
+        return self._container_depth is None or self._container_depth > 0
+
+    def handle_starttag(self, tag, attrs):
+        if self._depth:
+            self._parts.append(self.get_starttag_text())
+            if tag not in VOID_ELEMENTS:
+                self._depth += 1
+            return
+        if self.container is not None:
+            if self._container_depth == 0 and _matches(self.container, tag, attrs):
+                self._container_depth = 1
+                return
+            if self._container_depth and tag == self.container[0]:
+                self._container_depth += 1
+        if self._in_container() and _matches(self.item, tag, attrs):
+            self._parts = [self.get_starttag_text()]
+            self._depth = 1
+
+    def handle_startendtag(self, tag, attrs):
+        if self._depth:
+            self._parts.append(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        if self._depth:
+            self._parts.append(f'</{tag}>')
+            self._depth -= 1
+            if self._depth == 0:
+                self._done.append(''.join(self._parts))
+                self._parts = []
+        elif self._container_depth and tag == self.container[0]:
+            self._container_depth -= 1
+
+    def handle_data(self, data):
+        if self._depth:
+            self._parts.append(data)
+
+    def handle_entityref(self, name):
+        if self._depth:
+            self._parts.append(f'&{name};')
+
+    def handle_charref(self, name):
+        if self._depth:
+            self._parts.append(f'&#{name};')
+
+def splitter_for(url: str) -> Optional[ListingSplitter]:
+    split = SPLITS.get(urlsplit(url).netloc)
+    if split is None:
+        return None
+    container, item = split
+    return ListingSplitter(item, container)
+
+def fragments(splitter: ListingSplitter, chunks: Iterable[str]) -> Iterator[str]:
+    for chunk in chunks:
+        yield from splitter.feed(chunk)
+    yield from splitter.close()
+
+def stream_rows(url: str, chunks: Iterable[str], extractors: List[Extractor],
+                parser: str = None) -> Iterator[Tuple[Extractor, Any]]:
+    """(extractor, row) pairs in page order as the chunks arrive"""
+    splitter = splitter_for(url)
+    if splitter is None:
+        raise ValueError(f"no streaming split defined for {url}")
+    tag = splitter.item[0]
+    for fragment in fragments(splitter, chunks):
+        entry = make_soup(fragment, parser=parser).find(tag)
+        if entry is None:
+            continue
+        for extractor in extractors:
+            item = extractor.within(entry) if extractor.within else entry
+            if item is None:
+                continue
+            try:
+                row = extractor.row(item)
+            except Exception as e:
+                print(f"[{extractor.name}] Error parsing item:", e, file=sys.stderr)
+                continue
+            if row is not None:
+                yield extractor, row
@@ -0,0 +1,38 @@
+import csv
+import random
+from pathlib import Path
+
+from changes import diff, keyed_rows, summarize
+
+RAM = Path(__file__).parent / 'pc-kombo' / 'scraped_ram.csv'
+
+def ram_rows():
+    with open(RAM, newline='', encoding='utf-8') as file:
+        header, *rows = csv.reader(file)
+    return header, [row for row in rows if row]
+
+def test_reordered_listing_keeps_part_ids():
+    header, rows = ram_rows()
+    shuffled = rows[:]
+    random.Random(0).shuffle(shuffled)
+    assert diff('ram', header, rows, shuffled) == []
+    assert keyed_rows('ram', header, rows) == keyed_rows('ram', header, shuffled)
+
+def test_kit_sizes_of_one_model_get_their_own_ids():
+    header = ['name', 'speed', 'size', 'stick']
+    small = ['Corsair Vengeance LPX', 'DDR4-3200', '16', '2']
+    large = ['Corsair Vengeance LPX', 'DDR4-3200', '32', '2']
+    before = keyed_rows('ram', header, [small, large])
+    after = keyed_rows('ram', header, [large])
+    assert len(before) == 2
+    assert after.items() <= before.items()
+
+def test_diff_reports_inserts_updates_and_deletes():
+    header = ['name', 'price']
+    old = [['Ryzen 5 7600', '199.99'], ['Core i5-13400', '189.99']]
+    new = [['Ryzen 5 7600', '179.99'], ['Ryzen 7 7700', '299.99']]
+    changes = diff('cpu', header, old, new)
+    assert summarize(changes) == {'inserts': 1, 'updates': 1, 'deletes': 1}
+    update = next(change for change in changes if change['op'] == 'update')
+    assert update['changed'] == {'price': ['199.99', '179.99']}
+    assert next(c for c in changes if c['op'] == 'delete')['row']['name'] == 'Core i5-13400'
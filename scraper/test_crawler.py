@@ -0,0 +1,15 @@
+import shutil
+from pathlib import Path
+
+from crawler import Crawler
+from extractors import EXTRACTORS
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+def test_replay_leaves_the_cache_untouched(tmp_path):
+    cache_dir = tmp_path / 'cache'
+    shutil.copytree(FIXTURES, cache_dir)
+    before = sorted(cache_dir.rglob('*'))
+    with Crawler(cache_dir=str(cache_dir), replay=True) as crawler:
+        assert crawler.fetch_parsed(EXTRACTORS['cpu'].url, 'rows', lambda url, html: len(html)) > 0
+    assert sorted(cache_dir.rglob('*')) == before